@@ -0,0 +1,3 @@
+from arbitrage.engine import PriceTable, SpreadEngine
+
+__all__ = ["PriceTable", "SpreadEngine"]
@@ -0,0 +1,148 @@
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from config import ARBITRAGE_THRESHOLD
+
+PRICE_FIELDS = ("yes_bid", "yes_ask", "no_bid", "no_ask")
+YES_BID, YES_ASK, NO_BID, NO_ASK = range(len(PRICE_FIELDS))
+
+
+class PriceTable:
+    """Latest quote per market of one exchange, as rows of a (n, 4) float array.
+
+    Missing prices are NaN so they never produce an opportunity. A quote is a full
+    top-of-book: a side it leaves None (book side emptied) is cleared, not kept.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.slots: Dict[str, int] = {}
+        self.prices = np.full((capacity, len(PRICE_FIELDS)), np.nan)
+
+    def slot(self, market_id: str) -> int:
+        slot = self.slots.get(market_id)
+        if slot is None:
+            slot = len(self.slots)
+            if slot >= len(self.prices):
+                grown = np.full((len(self.prices) * 2, len(PRICE_FIELDS)), np.nan)
+                grown[: len(self.prices)] = self.prices
+                self.prices = grown
+            self.slots[market_id] = slot
+        return slot
+
+    def update(self, market_id: str, quote: Dict) -> int:
+        slot = self.slot(market_id)
+        row = self.prices[slot]
+        for col, field in enumerate(PRICE_FIELDS):
+            value = quote.get(field)
+            row[col] = np.nan if value is None else value
+        return slot
+
+
+class SpreadEngine:
+    """Cross-exchange spreads for every matched (Polymarket, Kalshi) pair.
+
+    Buying YES on one exchange and NO on the other pays out 1 whatever happens,
+    so the locked-in spread is ``1 - (yes_ask_a + no_ask_b)``. Both directions are
+    evaluated for all pairs at once with NumPy; pairs at or above the threshold are
+    returned in the opportunity format the notifiers expect.
+    """
+
+    def __init__(self, threshold: float = ARBITRAGE_THRESHOLD):
+        self.threshold = threshold
+        self.tables: Dict[str, PriceTable] = {"Polymarket": PriceTable(), "Kalshi": PriceTable()}
+        self._pairs: List[Dict] = []
+        self._poly_slots = np.zeros(0, dtype=np.int64)
+        self._kalshi_slots = np.zeros(0, dtype=np.int64)
+        self._pairs_by_market: Dict[tuple, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def load_pairs(self, matches: Iterable[Dict]) -> None:
+        """Replace the tracked pairs with market_matches rows."""
+        poly_table, kalshi_table = self.tables["Polymarket"], self.tables["Kalshi"]
+        pairs, poly_slots, kalshi_slots = [], [], []
+        by_market: Dict[tuple, List[int]] = {}
+        for row in matches:
+            slug, ticker = row["polymarket_slug"], row["kalshi_ticker"]
+            idx = len(pairs)
+            pairs.append(
+                {
+                    "event": row.get("polymarket_event") or row.get("kalshi_event", ""),
+                    "polymarket_slug": slug,
+                    "kalshi_ticker": ticker,
+                    "url1": f"https://polymarket.com/event/{slug}",
+                    "url2": f"https://kalshi.com/markets/{ticker}",
+                }
+            )
+            poly_slots.append(poly_table.slot(slug))
+            kalshi_slots.append(kalshi_table.slot(ticker))
+            by_market.setdefault(("Polymarket", slug), []).append(idx)
+            by_market.setdefault(("Kalshi", ticker), []).append(idx)
+        self._pairs = pairs
+        self._poly_slots = np.asarray(poly_slots, dtype=np.int64)
+        self._kalshi_slots = np.asarray(kalshi_slots, dtype=np.int64)
+        self._pairs_by_market = by_market
+
+    def market_ids(self, exchange: str) -> List[str]:
+        """Ids of the markets on one exchange that belong to a tracked pair."""
+        return sorted({market for exch, market in self._pairs_by_market if exch == exchange})
+
+    def update_prices(self, exchange: str, quotes: Dict[str, Dict]) -> np.ndarray:
+        """Apply {market_id: quote} and return the indices of the pairs it touches."""
+        table = self.tables[exchange]
+        touched: List[int] = []
+        for market_id, quote in quotes.items():
+            table.update(market_id, quote)
+            touched.extend(self._pairs_by_market.get((exchange, market_id), ()))
+        return np.unique(np.asarray(touched, dtype=np.int64))
+
+    def compute(self, pair_indices: Optional[np.ndarray] = None) -> List[Dict]:
+        """Opportunities at or above the threshold, best spread first.
+
+        Pass the indices returned by update_prices to only re-check the pairs a price
+        tick touched.
+        """
+        if not self._pairs:
+            return []
+        poly_slots, kalshi_slots = self._poly_slots, self._kalshi_slots
+        if pair_indices is not None:
+            if len(pair_indices) == 0:
+                return []
+            poly_slots, kalshi_slots = poly_slots[pair_indices], kalshi_slots[pair_indices]
+        else:
+            pair_indices = np.arange(len(self._pairs))
+
+        poly = self.tables["Polymarket"].prices[poly_slots]
+        kalshi = self.tables["Kalshi"].prices[kalshi_slots]
+        # a: buy YES on Polymarket, buy NO on Kalshi; b: buy YES on Kalshi, buy NO on Polymarket
+        spread_a = 1.0 - (poly[:, YES_ASK] + kalshi[:, NO_ASK])
+        spread_b = 1.0 - (kalshi[:, YES_ASK] + poly[:, NO_ASK])
+        with np.errstate(invalid="ignore"):
+            best = np.fmax(spread_a, spread_b)
+            hits = np.nonzero(best >= self.threshold)[0]
+        hits = hits[np.argsort(-best[hits], kind="stable")]
+
+        opportunities = []
+        for i in hits.tolist():
+            pair = self._pairs[int(pair_indices[i])]
+            if np.isnan(spread_b[i]) or spread_a[i] >= spread_b[i]:
+                price1, price2 = poly[i, YES_ASK], 1.0 - kalshi[i, NO_ASK]
+            else:
+                price1, price2 = 1.0 - poly[i, NO_ASK], kalshi[i, YES_ASK]
+            opportunities.append(
+                {
+                    "event": pair["event"],
+                    "source1": "Polymarket",
+                    "price1": float(price1),
+                    "source2": "Kalshi",
+                    "price2": float(price2),
+                    "spread": float(best[i]),
+                    "url1": pair["url1"],
+                    "url2": pair["url2"],
+                    "polymarket_slug": pair["polymarket_slug"],
+                    "kalshi_ticker": pair["kalshi_ticker"],
+                }
+            )
+        return opportunities
@@ -0,0 +1,83 @@
+"""Exact vector search: NumPy backend versus the faiss flat index.
+
+Uses random unit vectors so no embedding model is needed; the timings depend
+only on corpus size, dimension and query count.
+
+Usage:
+    uv run python -m benchmarks.bench_backends --size 100000 --queries 5000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from matcher.numpy_index import NumpyFlatIndex
+from matcher.retrieval import QUANTIZATION_MODES
+
+
+def _unit_vectors(rng: np.random.Generator, n: int, d: int) -> np.ndarray:
+    vecs = rng.standard_normal((n, d)).astype(np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    return vecs
+
+
+def _recall(reference: np.ndarray, other: np.ndarray) -> float:
+    hits = sum(len(set(a) & set(b)) for a, b in zip(reference.tolist(), other.tolist()))
+    return hits / reference.size
+
+
+def _time_index(index, corpus: np.ndarray, queries: np.ndarray, k: int, batch: int):
+    t0 = time.perf_counter()
+    if not index.is_trained:
+        index.train(corpus)
+    index.add(corpus)
+    build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    found = [index.search(queries[s : s + batch], k)[1] for s in range(0, len(queries), batch)]
+    return build, time.perf_counter() - t0, np.concatenate(found)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=1024, help="queries per search call")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    corpus = _unit_vectors(rng, args.size, args.dim)
+    queries = _unit_vectors(rng, args.queries, args.dim)
+
+    rows = []
+    reference = None
+    try:
+        import faiss
+
+        index = faiss.IndexFlatIP(args.dim)
+        build, search, reference = _time_index(index, corpus, queries, args.k, args.batch)
+        rows.append(("faiss", "float32", build, search, 1.0))
+    except ImportError:
+        print("faiss not installed; recall is reported against NumPy float32")
+
+    for mode in QUANTIZATION_MODES:
+        index = NumpyFlatIndex(args.dim, mode)
+        build, search, found = _time_index(index, corpus, queries, args.k, args.batch)
+        if reference is None:
+            reference = found
+        rows.append(("numpy", mode, build, search, _recall(reference, found)))
+
+    print(f"Corpus: {args.size:,} x {args.dim}, queries: {args.queries:,}, k={args.k}")
+    print(
+        f"{'backend':<8} {'storage':<8} {'build (s)':>10} {'search (s)':>11} "
+        f"{'q/sec':>9} {'recall':>7}"
+    )
+    for backend, mode, build, search, recall in rows:
+        qps = args.queries / search if search > 0 else 0.0
+        print(f"{backend:<8} {mode:<8} {build:>10.3f} {search:>11.3f} {qps:>9,.0f} {recall:>7.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""End-to-end matching pipeline benchmark on synthetic markets.
+
+For each size it times Retriever.index/search per backend, the candidate filter
+stage, find_matches with a stubbed LLM (verdicts come from the generator's
+ground truth) and MatchDatabase write throughput; --events N adds flat vs
+hierarchical find_matches on N multi-outcome events. Results are written to
+benchmarks/results/ as JSON; --compare reports changes against an earlier run.
+
+Usage:
+    uv run python -m benchmarks.bench_pipeline --sizes 1000,10000
+    uv run python -m benchmarks.bench_pipeline --sizes 1000 \\
+        --compare benchmarks/results/<earlier run>.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from benchmarks.synthetic import HashingEmbedder, generate_event_markets, generate_markets
+from database import MatchDatabase
+from matcher.matcher import (
+    CANDIDATE_FILTERS,
+    MarketMatcher,
+    _normalize_kalshi_item,
+    _normalize_poly_item,
+    market_id,
+    snapshot_rows,
+)
+from matcher.retrieval import Retriever, load_embedder
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+class _OracleMatcher(MarketMatcher):
+    """MarketMatcher whose LLM verdicts come from the synthetic ground truth."""
+
+    def __init__(self, truth: Set[Tuple[str, str]], latency: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.truth = truth
+        self.latency = latency
+        self.llm_calls = 0
+
+    def _verify_match_with_llm(self, poly: Dict, kalshi: Dict) -> Tuple[float, str]:
+        self.llm_calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if (market_id(poly), market_id(kalshi)) in self.truth:
+            return 0.95, "oracle: same event"
+        return 0.1, "oracle: different event"
+
+
+def _embedder(kind: str):
+    if kind == "hash":
+        return HashingEmbedder()
+    try:
+        return load_embedder()
+    except Exception as e:
+        print(f"No embedding model available ({e}); using the hashing embedder")
+        return HashingEmbedder()
+
+
+def _recall(found: Set[Tuple[str, str]], truth: Set[Tuple[str, str]]) -> float:
+    return len(found & truth) / len(truth) if truth else 1.0
+
+
+def bench_retrieval(poly, kalshi, truth, backends, embedder, k: int) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    for backend in backends:
+        retriever = Retriever(top_k=k, backend=backend, embedder=embedder)
+        if retriever.backend != backend:
+            print(f"  {backend}: unavailable, skipped")
+            continue
+        t0 = time.perf_counter()
+        retriever.index(kalshi)
+        index_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        found = retriever.search(poly, k=k)
+        search_s = time.perf_counter() - t0
+        pairs = {
+            (market_id(poly[row]), market_id(kalshi[idx]))
+            for row, indices in enumerate(found.indices)
+            for idx in indices
+            if idx != -1
+        }
+        results[f"retrieval.{backend}.index_s"] = index_s
+        results[f"retrieval.{backend}.search_s"] = search_s
+        results[f"retrieval.{backend}.queries_per_sec"] = len(poly) / max(search_s, 1e-9)
+        results[f"retrieval.{backend}.recall_at_k"] = _recall(pairs, truth)
+    return results
+
+
+def bench_filters(poly, kalshi, truth, embedder, k: int) -> Dict[str, float]:
+    matcher = MarketMatcher(top_k=k)
+    retriever = Retriever(top_k=k, embedder=embedder)
+    retriever.index(kalshi)
+    forward, reverse = retriever.search_mutual(poly, k=k)
+    results: Dict[str, float] = {}
+    for name in CANDIDATE_FILTERS:
+        t0 = time.perf_counter()
+        candidates = matcher._build_candidates(
+            forward, None if name == "none" else reverse, len(kalshi), name
+        )
+        results[f"filter.{name}.build_s"] = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        kept = [
+            (p, q)
+            for score, p, q in candidates
+            if matcher._should_consider_match(poly[p], kalshi[q], score)
+        ]
+        results[f"filter.{name}.field_filter_s"] = time.perf_counter() - t0
+        results[f"filter.{name}.candidates"] = len(candidates)
+        results[f"filter.{name}.field_filter_kept"] = len(kept)
+        pairs = {(market_id(poly[p]), market_id(kalshi[q])) for p, q in kept}
+        results[f"filter.{name}.recall"] = _recall(pairs, truth)
+    return results
+
+
+def bench_find_matches(
+    poly_raw,
+    kalshi_raw,
+    truth,
+    backend,
+    embedder,
+    latency: float,
+    verbose: bool,
+    hierarchical: bool = False,
+    event_truth: Set[Tuple[str, str]] = frozenset(),
+    prefix: str = "find_matches",
+) -> Dict[str, float]:
+    matcher = _OracleMatcher(
+        truth | event_truth,
+        latency=latency,
+        vector_backend=backend,
+        embedder=embedder,
+        hierarchical=hierarchical,
+    )
+    # find_matches prints a line per verified candidate; keep the report readable
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    t0 = time.perf_counter()
+    with output:
+        matches = matcher.find_matches(poly_raw, kalshi_raw)
+    seconds = time.perf_counter() - t0
+    found = {(market_id(p), market_id(k)) for p, k, _ in matches}
+    return {
+        f"{prefix}.seconds_s": seconds,
+        f"{prefix}.markets_per_sec": (len(poly_raw) + len(kalshi_raw)) / max(seconds, 1e-9),
+        f"{prefix}.llm_calls": matcher.llm_calls,
+        f"{prefix}.matches": len(matches),
+        f"{prefix}.recall": _recall(found, truth),
+        f"{prefix}.precision": len(found & truth) / len(found) if found else 1.0,
+    }
+
+
+def bench_events(n_events: int, args, backend: str, embedder) -> Dict[str, float]:
+    """Flat vs hierarchical find_matches on multi-outcome events."""
+    data = generate_event_markets(n_events, args.match_rate, args.near_miss_rate, args.seed)
+    print(
+        f"\n== {n_events:,} events per exchange ({len(data.poly):,} / {len(data.kalshi):,} "
+        f"markets, {len(data.event_truth):,} true event matches) =="
+    )
+    results: Dict[str, float] = {}
+    for hierarchical, prefix in ((False, "events.flat"), (True, "events.hierarchical")):
+        results.update(
+            bench_find_matches(
+                data.poly,
+                data.kalshi,
+                data.truth,
+                backend,
+                embedder,
+                args.llm_latency_ms / 1000,
+                args.verbose,
+                hierarchical=hierarchical,
+                event_truth=data.event_truth,
+                prefix=prefix,
+            )
+        )
+    return results
+
+
+def bench_database(poly, kalshi, batch_size: int) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = MatchDatabase(os.path.join(tmp, "bench.db"))
+        pairs = [(p, q, 0.9) for p, q in zip(poly, kalshi)]
+        t0 = time.perf_counter()
+        for start in range(0, len(pairs), batch_size):
+            db.save_matches(pairs[start : start + batch_size])
+        save_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        db.upsert_markets("Polymarket", snapshot_rows(poly))
+        db.upsert_markets("Kalshi", snapshot_rows(kalshi))
+        upsert_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        read = sum(1 for _ in db.iter_matches())
+        read_s = time.perf_counter() - t0
+        db.close()
+    return {
+        "db.save_matches_rows_per_sec": len(pairs) / max(save_s, 1e-9),
+        "db.upsert_markets_rows_per_sec": (len(poly) + len(kalshi)) / max(upsert_s, 1e-9),
+        "db.iter_matches_rows_per_sec": read / max(read_s, 1e-9),
+    }
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Print metric changes; return the names that regressed by more than ``tolerance``.
+
+    Durations (``_s``) should go down; rates (``_per_sec``), recall and precision
+    should go up. Counts are shown but never flagged.
+    """
+    regressions = []
+    print(f"\n{'metric':<52} {'baseline':>12} {'current':>12} {'change':>8}")
+    for size, metrics in current["results"].items():
+        for name, value in metrics.items():
+            old = baseline.get("results", {}).get(size, {}).get(name)
+            if old is None:
+                continue
+            change = (value - old) / old if old else 0.0
+            if name.endswith("_s"):
+                worse = change > tolerance
+            elif name.endswith(("_per_sec", "recall", "recall_at_k", "precision")):
+                worse = change < -tolerance
+            else:
+                worse = False
+            flag = "  REGRESSION" if worse else ""
+            label = f"{size}:{name}"
+            print(f"{label:<52} {old:>12.4g} {value:>12.4g} {change:>+8.1%}{flag}")
+            if worse:
+                regressions.append(label)
+    return regressions
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000", help="markets per exchange, comma list")
+    parser.add_argument("--match-rate", type=float, default=0.3)
+    parser.add_argument("--near-miss-rate", type=float, default=0.2)
+    # The pure-Python token backend takes minutes from ~10k markets; add it for small runs
+    parser.add_argument("--backends", default="numpy,faiss", help="of tokens,numpy,faiss")
+    parser.add_argument("--embedder", choices=["auto", "hash"], default="auto")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="stub LLM delay")
+    parser.add_argument("--db-batch", type=int, default=1000, help="rows per save_matches call")
+    parser.add_argument("--skip-e2e", action="store_true", help="skip find_matches")
+    parser.add_argument(
+        "--events", type=int, default=0, help="also compare flat vs hierarchical on N events"
+    )
+    parser.add_argument("--verbose", action="store_true", help="show find_matches output")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="regression threshold")
+    args = parser.parse_args()
+
+    embedder = _embedder(args.embedder)
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    report: Dict = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "embedder": type(embedder).__name__,
+            "args": vars(args),
+        },
+        "results": {},
+    }
+
+    for size in [int(s) for s in args.sizes.split(",")]:
+        data = generate_markets(size, size, args.match_rate, args.near_miss_rate, args.seed)
+        poly = [_normalize_poly_item(it) for it in data.poly]
+        kalshi = [_normalize_kalshi_item(it) for it in data.kalshi]
+        print(
+            f"\n== {size:,} markets per exchange "
+            f"({len(data.truth):,} true matches, {data.near_misses:,} near misses) =="
+        )
+        results: Dict[str, float] = {}
+        results.update(bench_retrieval(poly, kalshi, data.truth, backends, embedder, args.k))
+        results.update(bench_filters(poly, kalshi, data.truth, embedder, args.k))
+        if not args.skip_e2e:
+            backend = next((b for b in backends if b != "tokens"), "tokens")
+            results.update(
+                bench_find_matches(
+                    data.poly,
+                    data.kalshi,
+                    data.truth,
+                    backend,
+                    embedder,
+                    args.llm_latency_ms / 1000,
+                    args.verbose,
+                )
+            )
+        results.update(bench_database(poly, kalshi, args.db_batch))
+        for name, value in results.items():
+            print(f"  {name:<48} {value:>14,.4f}")
+        report["results"][str(size)] = results
+
+    if args.events:
+        backend = next((b for b in backends if b != "tokens"), "tokens")
+        results = bench_events(args.events, args, backend, embedder)
+        for name, value in results.items():
+            print(f"  {name:<48} {value:>14,.4f}")
+        report["results"][f"events_{args.events}"] = results
+
+    out = args.out or os.path.join(
+        RESULTS_DIR, f"pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            raise SystemExit(f"{len(regressions)} metric(s) regressed beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Memory / recall benchmark for quantized embedding storage.
+
+Usage:
+    uv run python -m benchmarks.bench_quantization
+    uv run python -m benchmarks.bench_quantization \\
+        --poly runtime/polymarket_runtime_X.json --kalshi runtime/kalshi_runtime_X.json
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.synthetic import generate_markets
+from matcher.matcher import _normalize_kalshi_item, _normalize_poly_item
+from matcher.retrieval import QUANTIZATION_MODES, Retriever, load_embedder
+
+
+def _load(path: str, normalize) -> List[Dict]:
+    with open(path) as f:
+        return [normalize(it) for it in json.load(f)]
+
+
+def _recall(reference: List[List[int]], other: List[List[int]], k: int) -> float:
+    if not reference:
+        return 1.0
+    hits = 0
+    for ref_row, row in zip(reference, other):
+        hits += len({i for i in ref_row if i != -1} & {i for i in row if i != -1})
+    return hits / (len(reference) * k)
+
+
+def run(poly: List[Dict], kalshi: List[Dict], k: int) -> List[Tuple[str, float, float, float]]:
+    embedder = load_embedder()
+    reference = None
+    rows = []
+    for mode in QUANTIZATION_MODES:
+        retriever = Retriever(top_k=k, quantization=mode, embedder=embedder)
+        t0 = time.perf_counter()
+        retriever.index(kalshi)
+        retriever_result = retriever.search(poly, k=k)
+        elapsed = time.perf_counter() - t0
+        if reference is None:
+            reference = retriever_result.indices
+        per_market = retriever.memory_bytes() / max(1, len(kalshi))
+        rows.append((mode, per_market, _recall(reference, retriever_result.indices, k), elapsed))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--poly", help="Polymarket runtime dump (JSON list)")
+    parser.add_argument("--kalshi", help="Kalshi runtime dump (JSON list)")
+    parser.add_argument("--size", type=int, default=5000, help="synthetic corpus size")
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.poly and args.kalshi:
+        poly = _load(args.poly, _normalize_poly_item)
+        kalshi = _load(args.kalshi, _normalize_kalshi_item)
+    else:
+        data = generate_markets(max(1, args.size // 5), args.size, seed=1)
+        poly = [_normalize_poly_item(it) for it in data.poly]
+        kalshi = [_normalize_kalshi_item(it) for it in data.kalshi]
+
+    print(f"Corpus: {len(kalshi):,} markets, queries: {len(poly):,}, k={args.k}")
+    print(f"{'mode':<8} {'bytes/market':>13} {'recall@k':>9} {'recall loss':>12} {'time (s)':>9}")
+    for mode, per_market, recall, elapsed in run(poly, kalshi, args.k):
+        print(f"{mode:<8} {per_market:>13.0f} {recall:>9.4f} {1 - recall:>12.4f} {elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
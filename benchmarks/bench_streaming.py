@@ -0,0 +1,99 @@
+"""Streaming price ingestion against the local fake exchange websocket.
+
+Streams N matched pairs from fakes.exchange_ws through PriceStream into the
+SpreadEngine and reports message throughput and send -> spread-computed latency.
+
+Usage:
+    uv run python -m benchmarks.bench_streaming --pairs 2000 --rate 2000 --seconds 10
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from typing import Dict, List
+
+from arbitrage.engine import SpreadEngine
+from fakes.exchange_ws import FakeExchangeServer
+from streaming import KalshiFeed, PolymarketFeed, PriceStream
+
+
+class _TimedFeed:
+    """Wraps a feed to remember the fake server's send timestamp of the last message."""
+
+    def __init__(self, feed):
+        self._feed = feed
+        self.last_ts = None
+
+    def __getattr__(self, name):
+        return getattr(self._feed, name)
+
+    def handle(self, message, books):
+        items = message if isinstance(message, list) else [message]
+        self.last_ts = items[-1].get("ts") if items else None
+        return self._feed.handle(message, books)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=1000.0, help="updates/sec per exchange")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--disconnect-after", type=int, default=None)
+    args = parser.parse_args()
+
+    server = FakeExchangeServer(
+        updates_per_second=args.rate, disconnect_after=args.disconnect_after
+    )
+    base_url = server.start()
+
+    engine = SpreadEngine()
+    slugs = [f"poly-{i}" for i in range(args.pairs)]
+    tickers = [f"KX-{i}" for i in range(args.pairs)]
+    engine.load_pairs(
+        {"polymarket_slug": s, "kalshi_ticker": t, "polymarket_event": s}
+        for s, t in zip(slugs, tickers)
+    )
+
+    lock = threading.Lock()
+    latencies: List[float] = []
+    opportunities = [0]
+    feeds: Dict[str, _TimedFeed] = {}
+
+    def on_update(exchange: str, quotes: Dict[str, Dict]) -> None:
+        with lock:
+            opportunities[0] += len(engine.compute(engine.update_prices(exchange, quotes)))
+            sent = feeds[exchange].last_ts
+            if sent is not None:
+                latencies.append(time.time() - sent)
+
+    poly_feed = PolymarketFeed(url=f"{base_url}/polymarket")
+    poly_feed.set_token_ids({s: s for s in slugs})
+    feeds["Polymarket"] = _TimedFeed(poly_feed)
+    feeds["Kalshi"] = _TimedFeed(KalshiFeed(url=f"{base_url}/kalshi"))
+    streams = [PriceStream(feed, on_update, reconnect_delay=0.1) for feed in feeds.values()]
+    for stream, ids in zip(streams, (slugs, tickers)):
+        stream.set_markets(ids)
+        stream.start()
+
+    time.sleep(args.seconds)
+    for stream in streams:
+        stream.stop()
+    server.stop()
+
+    messages = sum(s.messages for s in streams)
+    print(f"Pairs: {args.pairs:,}, target rate: {args.rate:,.0f}/s per exchange")
+    print(f"Messages received: {messages:,} ({messages / args.seconds:,.0f}/s)")
+    print(f"Reconnects: {sum(s.reconnects for s in streams)}")
+    print(f"Opportunities emitted: {opportunities[0]:,}")
+    if latencies:
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(
+            f"Latency send -> spread computed: p50 {statistics.median(latencies) * 1000:.2f} ms, "
+            f"p99 {p99 * 1000:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
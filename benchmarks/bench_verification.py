@@ -0,0 +1,173 @@
+"""LLM verification throughput against the local fake Ollama server.
+
+Starts fakes.ollama.FakeOllamaServer with the given latency / concurrency /
+fault settings and pushes synthetic candidate pairs (true matches and near
+misses) through MarketMatcher._verify_match_with_llm from ``--workers`` client
+threads. Reports calls/sec, latency percentiles, timeouts, how often the
+fallback chain was used and verdict accuracy against the generator's truth.
+With ``--hosts N`` the requests are balanced over N fake servers through one
+shared OllamaPool; ``--down-hosts K`` stops K of them first to exercise ejection.
+
+Usage:
+    uv run python -m benchmarks.bench_verification --pairs 200 --latency-ms 300 \\
+        --concurrency 2 --workers 4 --error-rate 0.05
+    uv run python -m benchmarks.bench_verification --hosts 3 --down-hosts 1 --workers 6
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import random
+import statistics
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.synthetic import generate_markets
+from fakes.ollama import LATENCY_DISTRIBUTIONS, FakeOllamaServer
+from matcher.matcher import (
+    MarketMatcher,
+    _normalize_kalshi_item,
+    _normalize_poly_item,
+)
+from matcher.ollama_pool import OllamaPool
+
+
+def _pairs(n: int, seed: int) -> List[Tuple[Dict, Dict, bool]]:
+    """Half true matches, half near misses / unrelated pairs."""
+    data = generate_markets(n, n, match_rate=0.5, near_miss_rate=0.5, seed=seed)
+    poly = {it["slug"]: _normalize_poly_item(it) for it in data.poly}
+    kalshi = {it["ticker"]: _normalize_kalshi_item(it) for it in data.kalshi}
+    matched = {slug for slug, _ in data.truth}
+    pairs = [(poly[slug], kalshi[ticker], True) for slug, ticker in sorted(data.truth)]
+    rng = random.Random(seed)
+    tickers = sorted(kalshi)
+    for slug in sorted(set(poly) - matched):
+        pairs.append((poly[slug], kalshi[rng.choice(tickers)], False))
+    rng.shuffle(pairs)
+    return pairs[:n]
+
+
+def _worker(pool: OllamaPool, timeout: float, jobs, results, lock) -> None:
+    matcher = MarketMatcher(ollama_pool=pool, llm_timeout=timeout)
+    # Keep measuring after repeated failures instead of switching the LLM off
+    matcher._llm_error_limit = float("inf")
+    while True:
+        with lock:
+            if not jobs:
+                return
+            poly, kalshi, truth = jobs.pop()
+        t0 = time.perf_counter()
+        confidence, _ = matcher._verify_match_with_llm(poly, kalshi)
+        elapsed = time.perf_counter() - t0
+        with lock:
+            results.append((elapsed, confidence >= 0.7, truth, matcher._last_llm_failed))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=1, help="client threads")
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--concurrency", type=int, default=1, help="server-side parallel slots")
+    parser.add_argument("--hosts", type=int, default=1, help="fake servers behind the pool")
+    parser.add_argument("--down-hosts", type=int, default=0, help="of which stopped up front")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--invalid-json-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=5.0, help="client timeout per request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="show matcher/LLM error output")
+    args = parser.parse_args()
+
+    servers = [
+        FakeOllamaServer(
+            latency_ms=args.latency_ms,
+            latency_distribution=args.latency_dist,
+            jitter_ms=args.jitter_ms,
+            concurrency=args.concurrency,
+            error_rate=args.error_rate,
+            hang_rate=args.hang_rate,
+            hang_seconds=args.timeout * 2,
+            invalid_json_rate=args.invalid_json_rate,
+            seed=args.seed + i,
+        )
+        for i in range(args.hosts)
+    ]
+    urls = [server.start() for server in servers]
+    for server in servers[: args.down_hosts]:
+        server.stop()
+    servers = servers[args.down_hosts :]
+    pool = OllamaPool(urls, failure_penalty=args.timeout, probe_interval=3600)
+    if not args.verbose:
+        logging.getLogger("arbitrage_finder").setLevel(logging.CRITICAL)
+
+    jobs = _pairs(args.pairs, args.seed)
+    n = len(jobs)
+    results: List[Tuple[float, bool, bool, bool]] = []
+    lock = threading.Lock()
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    t0 = time.perf_counter()
+    with output:
+        threads = [
+            threading.Thread(target=_worker, args=(pool, args.timeout, jobs, results, lock))
+            for _ in range(args.workers)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    wall = time.perf_counter() - t0
+    for server in servers:
+        server.stop()
+
+    latencies = sorted(r[0] for r in results)
+    correct = sum(1 for _, verdict, truth, failed in results if not failed and verdict == truth)
+    failed = sum(1 for r in results if r[3])
+    stats = {
+        name: sum(server.stats[name] for server in servers)
+        for name in ("requests", "busy_seconds", "errors", "hangs", "invalid_json")
+    }
+    stats["max_in_flight"] = max((server.stats["max_in_flight"] for server in servers), default=0)
+    # One verification = one request unless the fallback chain had to try more endpoints
+    # Requests that reached a live server beyond one per verification: fallback endpoints
+    fallback_requests = stats["requests"] - n
+    slots = args.concurrency * max(1, len(servers))
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+
+    print(
+        f"Pairs: {n:,}  workers: {args.workers}  hosts: {args.hosts} "
+        f"({args.down_hosts} down)  slots per host: {args.concurrency}  "
+        f"latency: {args.latency_dist} {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms"
+    )
+    print(f"  verifications/sec      {n / wall:>10.2f}")
+    print(
+        f"  latency p50 / p95 / p99 {quantiles[49]:>8.3f} / {quantiles[94]:.3f} / "
+        f"{quantiles[98]:.3f} s"
+    )
+    print(f"  server utilisation     {stats['busy_seconds'] / (wall * slots):>10.1%}")
+    print(f"  max in flight          {stats['max_in_flight']:>10.0f}")
+    print(f"  extra fallback requests{fallback_requests:>10.0f}")
+    print(
+        f"  injected errors / hangs / bad JSON  {stats['errors']:.0f} / {stats['hangs']:.0f} / "
+        f"{stats['invalid_json']:.0f}"
+    )
+    print(f"  failed verifications   {failed:>10,}")
+    print(f"  verdict accuracy       {correct / max(1, n - failed):>10.1%} (of answered)")
+    unmatched = [r for r in results if r[2] and not r[1] and not r[3]]
+    if unmatched:
+        print(f"  missed true matches    {len(unmatched):>10,}")
+    if args.hosts > 1:
+        for host in pool.summary():
+            latency = f"{host['latency']:.3f}s" if host["latency"] is not None else "-"
+            print(
+                f"  {host['url']:<24} {'up' if host['healthy'] else 'ejected':<8} "
+                f"requests {host['requests']:>6,}  errors {host['errors']:>4,}  latency {latency}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""Synthetic Polymarket / Kalshi market sets for benchmarks.
+
+Markets come out in the raw API shapes the scrapers return, so they go through
+the matcher's normalizers. Each side gets:
+
+- true matches: the same event phrased the Polymarket way and the Kalshi way
+- near misses: a Kalshi market that differs from a Polymarket one only in a
+  threshold, date or year (the pairs retrieval ranks high but must be rejected)
+- unrelated markets filling up the rest
+
+Usage:
+    uv run python -m benchmarks.synthetic --size 1000 --out runtime/synthetic
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+MONTHS = [
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+]
+ASSETS = ["Bitcoin", "Ethereum", "Solana", "XRP", "Dogecoin", "Tesla", "Nvidia", "Apple", "Gold"]
+PEOPLE = ["Trump", "Harris", "Vance", "Newsom", "DeSantis", "Shapiro", "Whitmer", "Ocasio-Cortez"]
+OFFICES = ["presidential", "senate", "governor", "mayoral", "primary"]
+BANKS = ["the Fed", "the ECB", "the Bank of England", "the Bank of Japan", "the SNB"]
+COMPANIES = ["Google", "Meta", "Amazon", "Microsoft", "OpenAI", "Intel", "Boeing", "Disney"]
+TEAMS = ["the Lakers", "the Celtics", "the Chiefs", "the Eagles", "the Yankees", "the Dodgers"]
+LEAGUES = ["NBA", "NFL", "MLB", "NHL"]
+STATES = ["Texas", "Ohio", "Georgia", "Arizona", "Nevada", "Florida", "Michigan", "Maine"]
+PRODUCTS = ["a new phone", "GPT-6", "a self-driving taxi", "a foldable tablet", "AR glasses"]
+
+# (subjects, Polymarket phrasing, Kalshi phrasing, parameters)
+TEMPLATES = [
+    (ASSETS, "Will {s} be above {n} on {date}?", "{s} above {n} on {date}", ("n", "date")),
+    (
+        PEOPLE,
+        "Will {s} win the {year} {state} {office} election?",
+        "{s} wins {year} {state} {office} race",
+        ("year", "state", "office"),
+    ),
+    (
+        BANKS,
+        "Will {s} cut interest rates by {bps} bps in {month} {year}?",
+        "{s} {bps} bps rate cut in {month} {year}",
+        ("bps", "month", "year"),
+    ),
+    (
+        ASSETS,
+        "Will {s} reach a new all-time high by {date}?",
+        "{s} all-time high by {date}",
+        ("date",),
+    ),
+    (
+        COMPANIES,
+        "Will {s} announce more than {n} layoffs in {year}?",
+        "{s} layoffs above {n} in {year}",
+        ("n", "year"),
+    ),
+    (
+        TEAMS,
+        "Will {s} win the {year} {league} championship?",
+        "{s} win {year} {league} title",
+        ("year", "league"),
+    ),
+    (
+        COMPANIES,
+        "Will {s} release {product} before {date}?",
+        "{s} releases {product} by {date}",
+        ("product", "date"),
+    ),
+]
+
+
+@dataclass
+class SyntheticMarkets:
+    poly: List[Dict]
+    kalshi: List[Dict]
+    # (polymarket slug, kalshi ticker) of every true match
+    truth: Set[Tuple[str, str]] = field(default_factory=set)
+    near_misses: int = 0
+    # (polymarket event id, kalshi event ticker) of every true event match
+    event_truth: Set[Tuple[str, str]] = field(default_factory=set)
+
+
+def _params(rng: random.Random) -> Dict:
+    year = rng.randrange(2025, 2035)
+    month = rng.choice(MONTHS)
+    return {
+        "n": f"{rng.randrange(1, 500) * 1000:,}",
+        "year": year,
+        "month": month,
+        "date": f"{month} {rng.randrange(1, 29)}, {year}",
+        "office": rng.choice(OFFICES),
+        "state": rng.choice(STATES),
+        "bps": rng.choice([25, 50, 75, 100]),
+        "league": rng.choice(LEAGUES),
+        "product": rng.choice(PRODUCTS),
+    }
+
+
+def _perturb(params: Dict, names: Tuple[str, ...], rng: random.Random) -> Dict:
+    """Change exactly one parameter the phrasing depends on."""
+    other = dict(params)
+    name = rng.choice(names)
+    fresh = _params(rng)
+    while str(fresh[name]) == str(params[name]):
+        fresh = _params(rng)
+    other[name] = fresh[name]
+    return other
+
+
+def _poly_raw(text: str, idx: int, year: int) -> Dict:
+    slug = f"{re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')[:60]}-{idx}"
+    return {
+        "question": text,
+        "slug": slug,
+        "description": f"This market will resolve to Yes if the following happens: {text}",
+        "events": [{"title": text, "end_date": f"{year}-12-31T00:00:00Z"}],
+    }
+
+
+def _kalshi_raw(text: str, idx: int, year: int) -> Dict:
+    return {
+        "title": text,
+        "ticker": f"KXSYN-{idx:07d}",
+        "rules_primary": f"If {text}, then the market resolves to Yes.",
+        "close_time": f"{year}-12-31T00:00:00Z",
+    }
+
+
+def generate_markets(
+    n_poly: int,
+    n_kalshi: int,
+    match_rate: float = 0.3,
+    near_miss_rate: float = 0.2,
+    seed: int = 0,
+) -> SyntheticMarkets:
+    """Generate ``n_poly`` Polymarket and ``n_kalshi`` Kalshi markets.
+
+    ``match_rate`` is the fraction of the smaller side that has a true match on
+    the other side; ``near_miss_rate`` the fraction of Kalshi markets that are
+    one-parameter variants of a Polymarket market.
+    """
+    rng = random.Random(seed)
+    seen: Set[Tuple] = set()
+
+    def new_event():
+        while True:
+            t = rng.randrange(len(TEMPLATES))
+            subjects, _, _, names = TEMPLATES[t]
+            params = _params(rng)
+            subject = rng.choice(subjects)
+            key = (t, subject, *(str(params[n]) for n in names))
+            if key not in seen:
+                seen.add(key)
+                return t, subject, params
+
+    def render(event, side: int) -> str:
+        t, subject, params = event
+        text = TEMPLATES[t][side].format(s=subject, **params)
+        return text[0].upper() + text[1:]
+
+    n_matches = int(min(n_poly, n_kalshi) * match_rate)
+    n_near = min(int(n_kalshi * near_miss_rate), n_kalshi - n_matches)
+    poly_events = [new_event() for _ in range(n_poly)]
+    kalshi_events = poly_events[:n_matches]
+    while len(kalshi_events) < n_matches + n_near:
+        # Small templates can run out of unused variants; then just try another source
+        t, subject, params = poly_events[rng.randrange(n_poly)]
+        for _ in range(10):
+            variant = _perturb(params, TEMPLATES[t][3], rng)
+            key = (t, subject, *(str(variant[n]) for n in TEMPLATES[t][3]))
+            if key not in seen:
+                seen.add(key)
+                kalshi_events.append((t, subject, variant))
+                break
+    kalshi_events += [new_event() for _ in range(n_kalshi - len(kalshi_events))]
+
+    poly = [_poly_raw(render(ev, 1), i, ev[2]["year"]) for i, ev in enumerate(poly_events)]
+    kalshi = [_kalshi_raw(render(ev, 2), i, ev[2]["year"]) for i, ev in enumerate(kalshi_events)]
+    truth = {(poly[i]["slug"], kalshi[i]["ticker"]) for i in range(n_matches)}
+
+    # Scrapers return markets in API order, not grouped by match status
+    rng.shuffle(poly)
+    rng.shuffle(kalshi)
+    return SyntheticMarkets(poly=poly, kalshi=kalshi, truth=truth, near_misses=n_near)
+
+
+def _event_outcomes(kind: str, rng: random.Random) -> List:
+    if kind == "election":
+        return rng.sample(PEOPLE, rng.randrange(3, len(PEOPLE) + 1))
+    step = rng.choice([500, 1000, 5000])
+    base = rng.randrange(1, 100) * step
+    return [base + i * step for i in range(rng.randrange(4, 12))]
+
+
+def _event_raw(kind: str, params: Dict, outcomes: List, idx: int) -> Tuple[List[Dict], List[Dict]]:
+    """One event as (Polymarket markets, Kalshi markets), all outcomes on both sides."""
+    year = params["year"]
+    event_id, event_ticker = str(900000 + idx), f"KXEVT-{idx:05d}"
+    poly, kalshi = [], []
+    if kind == "election":
+        race = f"{year} {params['state']} {params['office']}"
+        poly_title, kalshi_title = f"Who will win the {race} election?", f"{race} election winner"
+    else:
+        poly_title = f"{params['asset']} price on {params['date']}?"
+        kalshi_title = f"{params['asset']} price on {params['date']}"
+    for outcome in outcomes:
+        if kind == "election":
+            question = f"Will {outcome} win the {race} election?"
+            label, sub_title, strike = outcome, outcome, {}
+            rules = f"If {outcome} wins the {race} race, then the market resolves to Yes."
+        else:
+            question = f"Will {params['asset']} be above {outcome:,} on {params['date']}?"
+            label, sub_title = f"↑ {outcome:,}", f"{outcome:,} or above"
+            strike = {"strike_type": "greater", "floor_strike": outcome}
+            rules = f"If {params['asset']} is above {outcome:,} on {params['date']}, Yes."
+        suffix = re.sub(r"[^a-z0-9]+", "-", str(outcome).lower())
+        poly.append(
+            {
+                "question": question,
+                "slug": f"event-{idx}-{suffix}",
+                "description": f"This market will resolve to Yes if: {question}",
+                "events": [
+                    {"id": event_id, "title": poly_title, "end_date": f"{year}-12-31T00:00:00Z"}
+                ],
+                "group_item_title": label,
+            }
+        )
+        kalshi.append(
+            {
+                "title": kalshi_title,
+                "ticker": f"{event_ticker}-{suffix.upper()}",
+                "event_ticker": event_ticker,
+                "yes_sub_title": sub_title,
+                "rules_primary": rules,
+                "close_time": f"{year}-12-31T00:00:00Z",
+                **strike,
+            }
+        )
+    return poly, kalshi
+
+
+def _event_key(kind: str, params: Dict) -> Tuple:
+    if kind == "election":
+        return kind, params["year"], params["state"], params["office"]
+    return kind, params["asset"], params["date"]
+
+
+def generate_event_markets(
+    n_events: int, match_rate: float = 0.3, near_miss_rate: float = 0.2, seed: int = 0
+) -> SyntheticMarkets:
+    """Multi-outcome events (elections by candidate, price ladders by strike) with
+    ``n_events`` events per exchange, in the scrapers' event-aware shapes.
+
+    Kalshi lists only some of the outcomes of a matched event; near-miss events differ
+    from a Polymarket event only in year or date. No two events share a title otherwise.
+    """
+    rng = random.Random(seed)
+    poly: List[Dict] = []
+    kalshi: List[Dict] = []
+    data = SyntheticMarkets(poly=poly, kalshi=kalshi)
+    n_matches = int(n_events * match_rate)
+    n_near = int(n_events * near_miss_rate)
+    seen: Set[Tuple] = set()
+
+    def fresh(kind: str) -> Tuple[str, Dict]:
+        # There are only a few hundred elections; past them every new event is a ladder
+        for attempt in range(1000):
+            params = _params(rng)
+            params["asset"] = rng.choice(ASSETS)
+            if _event_key(kind, params) not in seen:
+                seen.add(_event_key(kind, params))
+                return kind, params
+            if attempt == 20:
+                kind = "ladder"
+        raise ValueError(f"Cannot generate {n_events:,} distinct events")
+
+    for idx in range(n_events):
+        kind, params = fresh(rng.choice(["election", "ladder"]))
+        outcomes = _event_outcomes(kind, rng)
+        p_markets, _ = _event_raw(kind, params, outcomes, idx)
+        poly.extend(p_markets)
+        if idx < n_matches:
+            kept = [o for o in outcomes if rng.random() > 0.2] or outcomes[:1]
+            k_markets = _event_raw(kind, params, kept, idx)[1]
+            data.event_truth.add((p_markets[0]["events"][0]["id"], k_markets[0]["event_ticker"]))
+            for outcome in kept:
+                i = outcomes.index(outcome)
+                data.truth.add((p_markets[i]["slug"], k_markets[kept.index(outcome)]["ticker"]))
+        elif idx < n_matches + n_near:
+            changed = ("year",) if kind == "election" else ("date",)
+            for _ in range(100):
+                moved = _perturb(params, changed, rng)
+                if _event_key(kind, moved) not in seen:
+                    break
+            seen.add(_event_key(kind, moved))
+            k_markets = _event_raw(kind, moved, outcomes, n_events + idx)[1]
+            data.near_misses += 1
+        else:
+            kind, other = fresh(kind)
+            k_markets = _event_raw(kind, other, _event_outcomes(kind, rng), n_events + idx)[1]
+        kalshi.extend(k_markets)
+    rng.shuffle(poly)
+    rng.shuffle(kalshi)
+    return data
+
+
+class HashingEmbedder:
+    """Model-free stand-in for a sentence-transformers model (hashed unigrams + bigrams).
+
+    Lets the vector backends be benchmarked where no embedding model is installed;
+    similarities are lexical, so recall numbers are not comparable with a real model.
+    """
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        out = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = re.findall(r"[a-z0-9]+", text.lower())
+            for gram in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+                out[row, zlib.crc32(gram.encode("utf-8")) % self.dimension] += 1.0
+        return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000, help="markets per exchange")
+    parser.add_argument("--match-rate", type=float, default=0.3)
+    parser.add_argument("--near-miss-rate", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="runtime/synthetic", help="output directory")
+    args = parser.parse_args()
+
+    data = generate_markets(args.size, args.size, args.match_rate, args.near_miss_rate, args.seed)
+    os.makedirs(args.out, exist_ok=True)
+    for name, payload in [
+        ("polymarket.json", data.poly),
+        ("kalshi.json", data.kalshi),
+        ("truth.json", sorted(data.truth)),
+    ]:
+        with open(os.path.join(args.out, name), "w") as f:
+            json.dump(payload, f, indent=2)
+    print(
+        f"Wrote {len(data.poly):,} Polymarket / {len(data.kalshi):,} Kalshi markets "
+        f"({len(data.truth):,} true matches, {data.near_misses:,} near misses) to {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
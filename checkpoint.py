@@ -0,0 +1,61 @@
+import json
+import os
+import time
+import zipfile
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from logger import error_logger
+
+CHECKPOINT_VERSION = 1
+
+
+class Checkpoint:
+    """Single-file snapshot of the bot's working state for warm restarts.
+
+    The state is a JSON-serializable dict plus named NumPy arrays, stored together in
+    one ``.npz`` (no pickling). ``save`` writes a temporary file, fsyncs it and renames
+    it over the previous checkpoint, so a crash mid-write leaves the old one intact.
+    ``load`` ignores checkpoints older than ``max_age_seconds`` (0 = no limit) or
+    written by another version.
+    """
+
+    def __init__(self, path: str, max_age_seconds: float = 0):
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+
+    def save(self, state: Dict, arrays: Optional[Dict[str, np.ndarray]] = None) -> bool:
+        meta = {"version": CHECKPOINT_VERSION, "saved_at": time.time(), "state": state}
+        tmp = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp, "wb") as f:
+                np.savez(f, _meta=np.array(json.dumps(meta)), **(arrays or {}))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            error_logger.log_error(e, context="writing checkpoint", stage="checkpoint")
+            return False
+
+    def load(self) -> Optional[Tuple[Dict, Dict[str, np.ndarray], float]]:
+        """(state, arrays, age in seconds), or None when missing, stale or unreadable."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                meta = json.loads(str(data["_meta"]))
+                arrays = {name: data[name] for name in data.files if name != "_meta"}
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            error_logger.log_error(e, context="reading checkpoint", stage="checkpoint")
+            return None
+        age = time.time() - meta.get("saved_at", 0)
+        if meta.get("version") != CHECKPOINT_VERSION:
+            print(f"Ignoring checkpoint {self.path}: version {meta.get('version')}")
+            return None
+        if self.max_age_seconds and age > self.max_age_seconds:
+            print(f"Ignoring checkpoint {self.path}: {age:.0f}s old")
+            return None
+        return meta["state"], arrays, age
@@ -1,7 +1,22 @@
 # config.py
+import os
+
 ARBITRAGE_THRESHOLD = 0.04
 
-FETCH_INTERVAL_SECONDS = 60
+# Slow cadence: scrape every market and run matching to discover new pairs
+DISCOVERY_INTERVAL_SECONDS = 600
+# Fast cadence: re-poll prices of already-matched markets only
+PRICE_POLL_INTERVAL_SECONDS = 5
+# Ids per targeted price request (Kalshi ?tickers=, Polymarket ?slug=)
+PRICE_POLL_BATCH_SIZE = 50
+# Price source for matched markets: "poll" (fast REST loop) or "stream" (websockets)
+PRICE_SOURCE = "poll"
+KALSHI_WS_URL = "wss://api.elections.kalshi.com/trade-api/ws/v2"
+POLYMARKET_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+# Kalshi API key for the signed websocket handshake (the stream needs one): the key id and
+# the path of its RSA private key (PEM), both overridable from the environment
+KALSHI_API_KEY_ID = os.environ.get("KALSHI_API_KEY_ID", "")
+KALSHI_PRIVATE_KEY_PATH = os.environ.get("KALSHI_PRIVATE_KEY_PATH", "")
 
 TARGET_MARKETS_PER_EXCHANGE = 500
 
@@ -13,14 +28,138 @@ KALSHI_API_URL = (
 TOP_K_CANDIDATES = 2
 MIN_SIMILARITY = 0.35
 
+# Candidate filtering after Polymarket -> Kalshi retrieval:
+#   "none"            keep every top-k pair
+#   "mutual"          also retrieve Kalshi -> Polymarket and keep only mutual top-k pairs
+#   "reciprocal_rank" keep every pair, ordered by 1/rank_fwd + 1/rank_rev
+CANDIDATE_FILTER = "none"
+
+# Retrieve / verify markets with identical text once and fan the verdict out to all of them
+DEDUPLICATE_TEXTS = True
+
+# Incremental matching: keep a snapshot of every market in the DB and only check pairs
+# that involve a new or changed market (cost follows churn, not total market count)
+INCREMENTAL_MATCHING = False
+
+# Two-level matching (pairs mode): match Polymarket events to Kalshi events first, then
+# pair markets only inside matched events, by outcome name / strike where both sides
+# have one and by retrieval + verification otherwise. Replaces the flat (and incremental)
+# pass; shrinks the candidate space for big multi-outcome events.
+HIERARCHICAL_MATCHING = False
+
+# How discovery relates markets across exchanges:
+#   "pairs"    match Polymarket against Kalshi directly (two exchanges only)
+#   "clusters" place the markets of every scraper into shared canonical event clusters;
+#              each new market is checked once against the clusters, so adding an
+#              exchange adds its markets' work instead of one more pairwise run
+MATCHING_MODE = "pairs"
+
+# Retrieval backend: "auto" (faiss, else NumPy), "faiss", "numpy" or "tokens" (no embeddings)
+VECTOR_BACKEND = "auto"
+
+# Storage for corpus embeddings: "float32" (exact), "float16" or "int8" (scalar-quantized).
+# float16 halves and int8 quarters the index memory for a small recall loss.
+EMBEDDING_QUANTIZATION = "float32"
+
+# Embedding encode / search batching; keeps peak memory bounded as market counts grow
+EMBEDDING_BATCH_SIZE = 64  # texts per forward pass of the embedding model
+EMBEDDING_CHUNK_SIZE = 4096  # corpus texts encoded and added to the index per chunk
+SEARCH_BATCH_SIZE = 1024  # queries encoded and searched per chunk
+EMBEDDING_THREADS = 0  # torch / faiss / BLAS threads; 0 keeps the library default
+
+# LLM verification: "inline" asks the LLM from the discovery cycle; "queue" writes the
+# candidate pairs to the verification_jobs table, where `uv run python verifier.py`
+# worker processes (on the machine holding the SQLite DB; WAL does not work over network
+# filesystems) lease, verify and answer them. The cycle waits up to VERIFY_WAIT_SECONDS
+# for verdicts; later ones are used by the next cycle. Leases expire after
+# VERIFY_LEASE_SECONDS (crashed worker), and failed jobs are retried VERIFY_MAX_ATTEMPTS
+# times with exponential backoff.
+VERIFICATION_MODE = "inline"
+VERIFY_WAIT_SECONDS = 120
+VERIFY_LEASE_SECONDS = 300
+VERIFY_MAX_ATTEMPTS = 3
+VERIFY_RETRY_BACKOFF_SECONDS = 30
+VERIFIER_WORKERS = 2  # processes started by verifier.py
+VERIFIER_BATCH_SIZE = 4  # jobs leased at a time per process
+
 AUTO_ACCEPT_THRESHOLD = 0.88
 AUTO_REJECT_THRESHOLD = 0.60
 JACCARD_MIN_FOR_AUTO_ACCEPT = 0.30
 
-# Ollama settings
-OLLAMA_URL = "http://57.131.25.126"
+# Cross-encoder reranking (needs sentence-transformers): candidate pairs that pass the
+# filters above are scored jointly on the CPU in batches. Pairs scoring at least
+# RERANK_ACCEPT_THRESHOLD are accepted (if their titles' numbers and word overlap agree
+# too) and pairs below RERANK_REJECT_THRESHOLD rejected without the LLM; everything else
+# is verified by it. "" picks the first available model of
+# matcher.rerank.CROSS_ENCODER_MODEL_CANDIDATES.
+CROSS_ENCODER_RERANK = False
+CROSS_ENCODER_MODEL = ""
+RERANK_ACCEPT_THRESHOLD = 0.90
+RERANK_REJECT_THRESHOLD = 0.20
+RERANK_BATCH_SIZE = 64
+
+# Notifications (NotificationDispatcher)
+NOTIFY_COALESCE_SECONDS = 2.0  # bursts within this window go out as one message
+NOTIFY_COOLDOWN_SECONDS = 300  # re-alert a pair only after this long...
+NOTIFY_MIN_SPREAD_IMPROVEMENT = 0.01  # ...or if its spread improved by this much
+NOTIFY_QUEUE_SIZE = 1000  # per-channel backlog; beyond it alerts are dropped
+DISCORD_WEBHOOK_URL = ""
+TELEGRAM_BOT_TOKEN = ""
+TELEGRAM_CHAT_ID = ""
+
+# Metrics: Prometheus text on http://127.0.0.1:<port>/metrics and the last cycle summaries
+# as JSON on /summary (0 disables the endpoint). Discovery cycle summaries are also
+# appended as JSON lines to METRICS_SUMMARY_PATH ("" disables).
+METRICS_PORT = 0
+METRICS_SUMMARY_PATH = "runtime/cycle_summaries.jsonl"
+
+# Discovery-cycle profiling (also settable via finder.py --profile / --profile-budget):
+#   PROFILE_MODE "off", "cprofile" (deterministic) or "sample" profiles every cycle;
+#   `kill -USR1 <pid>` profiles the next cycle; cycles longer than PROFILE_BUDGET_SECONDS
+#   (0 disables) keep a sampling profile. Dumps and top-N summaries go to PROFILE_DIR.
+PROFILE_MODE = "off"
+PROFILE_BUDGET_SECONDS = 0
+PROFILE_DIR = "runtime/profiles"
+PROFILE_TOP_N = 25
+
+# Memory: MEMORY_TRACKING adds per-stage RSS deltas and tracemalloc allocation peaks to
+# the cycle summary (tracemalloc slows Python allocations). With MEMORY_BUDGET_MB > 0 the
+# bot halves encode/search batches and drops the mutual-filter reverse pass above 80% of
+# the budget, and skips discovery cycles while RSS stays above it (0 disables). It needs
+# the current RSS from /proc; where only the peak is known (macOS, Windows) it is off.
+MEMORY_TRACKING = False
+MEMORY_BUDGET_MB = 0
+
+# Error log records: "json" (one structured object per line) or "text". Identical
+# repeated errors are logged once and then summarized as a count every N seconds.
+LOG_FORMAT = "json"
+LOG_REPEAT_REPORT_SECONDS = 60
+
+# Warm restarts: after each discovery cycle the embedding cache, LLM verdict history,
+# stream token ids and the discovery schedule are checkpointed to CHECKPOINT_PATH ("" disables).
+# On startup a checkpoint younger than CHECKPOINT_MAX_AGE_SECONDS (0 = any age) is
+# restored, and the first discovery cycle waits out the rest of the previous interval.
+CHECKPOINT_PATH = "runtime/checkpoint.npz"
+CHECKPOINT_MAX_AGE_SECONDS = 3600
+
+# Ollama settings (OLLAMA_URL can be overridden from the environment, e.g. to point at
+# the local stand-in: `uv run python -m fakes.ollama`)
+OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://57.131.25.126")
 OLLAMA_MODEL = "llama3"
 OLLAMA_AUTH = "50696980f50829df8b21509bc53bc34a864b04185ef64e0eaa65ea184170e6c0"
+OLLAMA_TIMEOUT_SECONDS = 60  # per HTTP request
+# Inference hosts verification requests are balanced across (comma-separated in the
+# OLLAMA_HOSTS environment variable; defaults to OLLAMA_URL alone). Requests go to the
+# host with the lowest observed latency x (in-flight + 1); a host is ejected after
+# OLLAMA_EJECT_AFTER_FAILURES consecutive connection errors / timeouts / 5xx responses
+# and re-admitted once a probe every OLLAMA_PROBE_INTERVAL_SECONDS gets an answer.
+OLLAMA_HOSTS = [h.strip() for h in os.environ.get("OLLAMA_HOSTS", "").split(",") if h.strip()]
+OLLAMA_HOSTS = OLLAMA_HOSTS or [OLLAMA_URL]
+OLLAMA_EJECT_AFTER_FAILURES = 3
+OLLAMA_PROBE_INTERVAL_SECONDS = 30
+# Verification requests the discovery cycle keeps in flight per host (the greedy pass
+# asks up to len(OLLAMA_HOSTS) x this many candidate pairs at once)
+OLLAMA_REQUESTS_PER_HOST = 1
 # Runtime options sent to Ollama; tune for your hardware
 OLLAMA_OPTIONS = {
     "num_ctx": 512,
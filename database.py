@@ -1,19 +1,166 @@
+import json
 import sqlite3
-from typing import Dict, List
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
 from logger import error_logger
 
+# WAL lets readers run alongside the writer; synchronous=NORMAL drops the per-commit
+# fsync (the WAL is still fsynced at checkpoints, so a crash loses at most the last commits).
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA busy_timeout=5000",
+)
+
+INSERT_MATCH_SQL = """
+    INSERT OR IGNORE INTO market_matches
+    (
+        polymarket_slug,
+        polymarket_event,
+        kalshi_ticker,
+        kalshi_event,
+        confidence_score,
+        cluster_id
+    )
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+MATCH_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_matches_kalshi_ticker ON market_matches(kalshi_ticker)",
+    "CREATE INDEX IF NOT EXISTS idx_matches_polymarket_slug ON market_matches(polymarket_slug)",
+    # Range filters page on (column, id), see get_matches_page
+    "DROP INDEX IF EXISTS idx_matches_created_at",
+    "DROP INDEX IF EXISTS idx_matches_confidence",
+    "CREATE INDEX IF NOT EXISTS idx_matches_created_at_id ON market_matches(created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_matches_confidence_id ON market_matches(confidence_score, id)",
+    "CREATE INDEX IF NOT EXISTS idx_matches_cluster ON market_matches(cluster_id)",
+)
+
+# Canonical event clusters (MATCHING_MODE = "clusters"): one row per real-world event,
+# described by the market that founded it, and one member row per market on any exchange.
+# market_matches rows derived from a cluster carry its cluster_id.
+CLUSTER_TABLES = (
+    """
+    CREATE TABLE IF NOT EXISTS event_clusters (
+        id INTEGER PRIMARY KEY,
+        exchange TEXT NOT NULL,
+        market_id TEXT NOT NULL,
+        canonical_event TEXT NOT NULL,
+        canonical_description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS cluster_members (
+        exchange TEXT NOT NULL,
+        market_id TEXT NOT NULL,
+        cluster_id INTEGER NOT NULL REFERENCES event_clusters(id),
+        event TEXT,
+        description TEXT,
+        text_key TEXT,
+        confidence REAL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (exchange, market_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_cluster_members_cluster ON cluster_members(cluster_id)",
+)
+
+
+# Candidate pairs awaiting LLM verification by verifier.py workers. job_key identifies
+# the pair by content (see MarketMatcher), so a verdict is reused until either text changes.
+VERIFICATION_JOBS_SQL = """
+    CREATE TABLE IF NOT EXISTS verification_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_key TEXT NOT NULL UNIQUE,
+        poly_json TEXT,
+        kalshi_json TEXT,
+        score REAL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        available_at REAL NOT NULL DEFAULT 0,
+        lease_owner TEXT,
+        lease_expires REAL,
+        confidence REAL,
+        reason TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+# Claim up to N runnable jobs in one statement: pending ones whose retry delay has passed
+# and leased ones whose worker let the lease expire. Best-scored candidates first.
+# A job whose lease keeps expiring (e.g. it crashes every worker) is given up on once it
+# has used its attempts, instead of being leased again forever
+EXPIRE_JOBS_SQL = """
+    UPDATE verification_jobs
+    SET status = 'failed', lease_owner = NULL, reason = 'lease expired ' || attempts || ' times',
+        updated_at = CURRENT_TIMESTAMP
+    WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?
+"""
+
+LEASE_JOBS_SQL = """
+    UPDATE verification_jobs
+    SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id IN (
+        SELECT id FROM verification_jobs
+        WHERE (status = 'pending' AND available_at <= ?)
+           OR (status = 'leased' AND lease_expires < ?)
+        ORDER BY score DESC, id
+        LIMIT ?
+    )
+    RETURNING id, job_key, poly_json, kalshi_json, score, attempts
+"""
+
 
 class MatchDatabase:
+    """SQLite store for confirmed matches.
+
+    One long-lived writer connection (serialized by a lock) plus one reader
+    connection per thread, all in WAL mode.
+    """
+
     def __init__(self, db_path: str = "market_matches.db"):
         self.db_path = db_path
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._conn = self._connect()
         self._init_database()
 
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            self._readers.append(conn)
+        return conn
+
+    def close(self) -> None:
+        with self._write_lock:
+            for conn in [self._conn, *self._readers]:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._readers.clear()
+
     def _init_database(self) -> None:
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
+            with self._write_lock, self._conn:
+                self._conn.execute(
                     """
                     CREATE TABLE IF NOT EXISTS market_matches (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -28,64 +175,425 @@ class MatchDatabase:
                     )
                     """
                 )
-                conn.commit()
+                # Databases from before event clusters lack the column
+                info = self._conn.execute("PRAGMA table_info(market_matches)").fetchall()
+                columns = {row[1] for row in info}
+                if "cluster_id" not in columns:
+                    self._conn.execute("ALTER TABLE market_matches ADD COLUMN cluster_id INTEGER")
+                for statement in MATCH_INDEXES:
+                    self._conn.execute(statement)
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS markets (
+                        exchange TEXT NOT NULL,
+                        market_id TEXT NOT NULL,
+                        content_hash TEXT NOT NULL,
+                        close_time TEXT,
+                        first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (exchange, market_id)
+                    )
+                    """
+                )
+                self._conn.execute(VERIFICATION_JOBS_SQL)
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_jobs_runnable "
+                    "ON verification_jobs(status, available_at)"
+                )
+                for statement in CLUSTER_TABLES:
+                    self._conn.execute(statement)
         except sqlite3.Error as e:
-            error_logger.log_error(e, context="initializing database")
+            error_logger.log_error(e, context="initializing database", stage="db")
 
     def match_exists(self, poly_slug: str, kalshi_ticker: str) -> bool:
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT 1 FROM market_matches WHERE polymarket_slug = ? AND kalshi_ticker = ?",
-                    (poly_slug, kalshi_ticker),
-                )
-                return cursor.fetchone() is not None
+            cursor = self._reader().execute(
+                "SELECT 1 FROM market_matches WHERE polymarket_slug = ? AND kalshi_ticker = ?",
+                (poly_slug, kalshi_ticker),
+            )
+            return cursor.fetchone() is not None
         except sqlite3.Error as e:
-            error_logger.log_error(e, context="checking match existence")
+            error_logger.log_error(e, context="checking match existence", stage="db")
             return False
 
+    @staticmethod
+    def _match_row(poly_market: Dict, kalshi_market: Dict, confidence: float) -> Tuple:
+        return (
+            # We need to ensure we pass the slug/ticker.
+            # Using URL or ID if specific fields aren't in the normalized dict yet.
+            poly_market.get("market_id") or poly_market.get("url", "").split("/")[-1],
+            poly_market["event"],
+            kalshi_market.get("ticker") or kalshi_market.get("market_id", ""),
+            kalshi_market["event"],
+            confidence,
+        )
+
     def save_match(self, poly_market: Dict, kalshi_market: Dict, confidence: float) -> bool:
+        return self.save_matches([(poly_market, kalshi_market, confidence)])[0]
+
+    def save_matches(
+        self,
+        matches: Sequence[Tuple[Dict, Dict, float]],
+        cluster_ids: Optional[Sequence[Optional[int]]] = None,
+    ) -> List[bool]:
+        """Insert a cycle's matches in a single transaction.
+
+        ``cluster_ids`` (one per match) links the rows to their event cluster; a row
+        that already existed without one gets it filled in.
+
+        Returns one flag per input row: True if the row was new, False if it already
+        existed (or the transaction failed).
+        """
+        if not matches:
+            return []
+        try:
+            rows = [self._match_row(poly, kalshi, conf) for poly, kalshi, conf in matches]
+            clusters = cluster_ids if cluster_ids is not None else [None] * len(rows)
+            with self._write_lock, self._conn:
+                cursor = self._conn.cursor()
+                inserted = []
+                for row, cluster_id in zip(rows, clusters):
+                    cursor.execute(INSERT_MATCH_SQL, (*row, cluster_id))
+                    inserted.append(cursor.rowcount > 0)
+                    if cluster_id is not None and not inserted[-1]:
+                        cursor.execute(
+                            "UPDATE market_matches SET cluster_id = ? WHERE polymarket_slug = ? "
+                            "AND kalshi_ticker = ? AND cluster_id IS NULL",
+                            (cluster_id, row[0], row[2]),
+                        )
+            return inserted
+        except (sqlite3.Error, KeyError) as e:
+            error_logger.log_error(e, context="saving matches", stage="db")
+            return [False] * len(matches)
+
+    def changed_markets(
+        self, exchange: str, rows: Sequence[Tuple[str, str, Optional[str]]]
+    ) -> Set[str]:
+        """Ids among (market_id, content_hash, close_time) rows that are new or whose
+        content hash differs from the stored snapshot."""
+        try:
+            cursor = self._reader().execute(
+                "SELECT market_id, content_hash FROM markets WHERE exchange = ?", (exchange,)
+            )
+            known = dict(cursor.fetchall())
+        except sqlite3.Error as e:
+            error_logger.log_error(
+                e, context=f"reading {exchange} market snapshot", stage="db", exchange=exchange
+            )
+            return {market_id for market_id, _, _ in rows}
+        return {market_id for market_id, digest, _ in rows if known.get(market_id) != digest}
+
+    def upsert_markets(self, exchange: str, rows: Sequence[Tuple[str, str, Optional[str]]]) -> None:
+        """Record this cycle's (market_id, content_hash, close_time) snapshot in one transaction."""
+        if not rows:
+            return
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
+            with self._write_lock, self._conn:
+                self._conn.executemany(
                     """
-                    INSERT OR IGNORE INTO market_matches
-                    (
-                        polymarket_slug,
-                        polymarket_event,
-                        kalshi_ticker,
-                        kalshi_event,
-                        confidence_score
-                    )
-                    VALUES (?, ?, ?, ?, ?)
+                    INSERT INTO markets (exchange, market_id, content_hash, close_time)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(exchange, market_id) DO UPDATE SET
+                        content_hash = excluded.content_hash,
+                        close_time = excluded.close_time,
+                        last_seen = CURRENT_TIMESTAMP
                     """,
-                    (
-                        # We need to ensure we pass the slug/ticker.
-                        # Using URL or ID if specific fields aren't in the normalized dict yet.
-                        poly_market.get("url", "").split("/")[-1],
-                        poly_market["event"],
-                        kalshi_market.get("ticker", ""),
-                        kalshi_market["event"],
-                        confidence,
-                    ),
+                    [(exchange, market_id, digest, close) for market_id, digest, close in rows],
                 )
-                conn.commit()
-                return cursor.rowcount > 0
         except sqlite3.Error as e:
-            error_logger.log_error(e, context="saving match")
-            return False
+            error_logger.log_error(
+                e, context=f"saving {exchange} market snapshot", stage="db", exchange=exchange
+            )
 
     def get_verified_matches(self) -> List[Dict]:
         """Retrieve all matches that have been verified
         (or all if we treat high confidence as verified)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM market_matches ORDER BY created_at DESC")
-                return [dict(row) for row in cursor.fetchall()]
+            cursor = self._reader().execute("SELECT * FROM market_matches ORDER BY created_at DESC")
+            return [dict(row) for row in cursor.fetchall()]
         except sqlite3.Error as e:
-            error_logger.log_error(e, context="fetching matches")
+            error_logger.log_error(e, context="fetching matches", stage="db")
             return []
+
+    def get_matches_page(
+        self,
+        after: Optional[Tuple] = None,
+        limit: int = 500,
+        kalshi_ticker: Optional[str] = None,
+        polymarket_slug: Optional[str] = None,
+        since: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+    ) -> Tuple[List[Dict], Optional[Tuple]]:
+        """One page of matches, using keyset pagination.
+
+        Pass the returned cursor as ``after`` to get the next page; it is None once the
+        last page has been read. ``since`` is a "YYYY-MM-DD HH:MM:SS" UTC timestamp
+        compared against created_at. Pages are newest first (by id). Without a ticker or
+        slug, a ``since`` filter pages on (created_at, id), still newest first, and a
+        ``min_confidence`` filter alone on (confidence_score, id), most confident first.
+        That way the range walks its index instead of scanning the table by rowid.
+        """
+        clauses: List[str] = []
+        params: List = []
+        if kalshi_ticker is not None:
+            clauses.append("kalshi_ticker = ?")
+            params.append(kalshi_ticker)
+        if polymarket_slug is not None:
+            clauses.append("polymarket_slug = ?")
+            params.append(polymarket_slug)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if min_confidence is not None:
+            clauses.append("confidence_score >= ?")
+            params.append(min_confidence)
+        if kalshi_ticker is not None or polymarket_slug is not None:
+            key = ("id",)
+        elif since is not None:
+            key = ("created_at", "id")
+        elif min_confidence is not None:
+            key = ("confidence_score", "id")
+        else:
+            key = ("id",)
+        if after is not None:
+            clauses.append(f"({', '.join(key)}) < ({', '.join('?' * len(key))})")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = ", ".join(f"{column} DESC" for column in key)
+        try:
+            cursor = self._reader().execute(
+                f"SELECT * FROM market_matches {where} ORDER BY {order} LIMIT ?",
+                (*params, limit),
+            )
+            rows = [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            error_logger.log_error(e, context="fetching matches page", stage="db")
+            return [], None
+        next_cursor = tuple(rows[-1][column] for column in key) if len(rows) == limit else None
+        return rows, next_cursor
+
+    def iter_matches(self, batch_size: int = 500, **filters) -> Iterator[Dict]:
+        """Stream matches in get_matches_page order, holding at most one page in memory.
+
+        Accepts the same filters as get_matches_page (kalshi_ticker, polymarket_slug,
+        since, min_confidence).
+        """
+        after: Optional[Tuple] = None
+        while True:
+            rows, after = self.get_matches_page(after=after, limit=batch_size, **filters)
+            yield from rows
+            if after is None:
+                return
+
+    def iter_matches_by_ticker(self, kalshi_ticker: str, batch_size: int = 500) -> Iterator[Dict]:
+        return self.iter_matches(batch_size, kalshi_ticker=kalshi_ticker)
+
+    def iter_matches_by_slug(self, polymarket_slug: str, batch_size: int = 500) -> Iterator[Dict]:
+        return self.iter_matches(batch_size, polymarket_slug=polymarket_slug)
+
+    def iter_matches_since(self, since: str, batch_size: int = 500) -> Iterator[Dict]:
+        return self.iter_matches(batch_size, since=since)
+
+    def iter_matches_above_confidence(
+        self, min_confidence: float, batch_size: int = 500
+    ) -> Iterator[Dict]:
+        return self.iter_matches(batch_size, min_confidence=min_confidence)
+
+    def enqueue_verifications(self, jobs: Sequence[Tuple[str, Dict, Dict, float]]) -> int:
+        """Queue (job_key, poly_item, kalshi_item, score) jobs. Keys already queued or
+        answered are left alone; jobs that failed for good are queued again with a fresh
+        retry budget. Returns how many were added or re-queued."""
+        if not jobs:
+            return 0
+        try:
+            with self._write_lock, self._conn:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    """
+                    INSERT INTO verification_jobs (job_key, poly_json, kalshi_json, score)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(job_key) DO UPDATE SET
+                        poly_json = excluded.poly_json,
+                        kalshi_json = excluded.kalshi_json,
+                        score = excluded.score,
+                        status = 'pending',
+                        attempts = 0,
+                        available_at = 0,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE verification_jobs.status = 'failed'
+                    """,
+                    [
+                        (key, json.dumps(poly), json.dumps(kalshi), score)
+                        for key, poly, kalshi, score in jobs
+                    ],
+                )
+                return self._conn.total_changes - before
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            error_logger.log_error(e, context="queueing verification jobs", stage="db")
+            return 0
+
+    def lease_verifications(
+        self, worker: str, limit: int, lease_seconds: float, max_attempts: int
+    ) -> List[Dict]:
+        """Atomically claim up to ``limit`` runnable jobs for ``worker``. Expired leases
+        of jobs that already had ``max_attempts`` attempts are marked failed instead."""
+        now = time.time()
+        try:
+            with self._write_lock, self._conn:
+                self._conn.execute(EXPIRE_JOBS_SQL, (now, max_attempts))
+                rows = self._conn.execute(
+                    LEASE_JOBS_SQL, (worker, now + lease_seconds, now, now, limit)
+                ).fetchall()
+        except sqlite3.Error as e:
+            error_logger.log_error(e, context="leasing verification jobs", stage="db")
+            return []
+        jobs = []
+        for row in rows:
+            job = dict(row)
+            job["poly"] = json.loads(job.pop("poly_json"))
+            job["kalshi"] = json.loads(job.pop("kalshi_json"))
+            jobs.append(job)
+        return jobs
+
+    def complete_verification(
+        self, job_id: int, worker: str, confidence: float, reason: str
+    ) -> bool:
+        """Record a verdict. Only the current lease holder may write it (False otherwise,
+        e.g. when the lease expired and another worker took the job over)."""
+        try:
+            with self._write_lock, self._conn:
+                cursor = self._conn.execute(
+                    """
+                    UPDATE verification_jobs
+                    SET status = 'done', confidence = ?, reason = ?, lease_owner = NULL,
+                        poly_json = NULL, kalshi_json = NULL, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ? AND status = 'leased' AND lease_owner = ?
+                    """,
+                    (confidence, reason, job_id, worker),
+                )
+                return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            error_logger.log_error(e, context="saving verification verdict", stage="db")
+            return False
+
+    def fail_verification(
+        self, job_id: int, worker: str, reason: str, max_attempts: int, backoff_seconds: float
+    ) -> None:
+        """Put a job back with exponential backoff, or mark it failed after max_attempts."""
+        try:
+            with self._write_lock, self._conn:
+                self._conn.execute(
+                    """
+                    UPDATE verification_jobs
+                    SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                        available_at = ? * (1 << (attempts - 1)) + ?,
+                        reason = ?, lease_owner = NULL, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ? AND status = 'leased' AND lease_owner = ?
+                    """,
+                    (max_attempts, backoff_seconds, time.time(), reason, job_id, worker),
+                )
+        except sqlite3.Error as e:
+            error_logger.log_error(e, context="failing verification job", stage="db")
+
+    def verification_results(self, keys: Sequence[str]) -> Dict[str, Tuple[str, float, str]]:
+        """job_key -> (status, confidence, reason) for finished ("done" / "failed") jobs."""
+        results: Dict[str, Tuple[str, float, str]] = {}
+        try:
+            conn = self._reader()
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                cursor = conn.execute(
+                    f"""
+                    SELECT job_key, status, confidence, reason FROM verification_jobs
+                    WHERE status IN ('done', 'failed')
+                      AND job_key IN ({", ".join("?" * len(chunk))})
+                    """,
+                    chunk,
+                )
+                for key, status, confidence, reason in cursor.fetchall():
+                    results[key] = (status, confidence or 0.0, reason or "")
+        except sqlite3.Error as e:
+            error_logger.log_error(e, context="reading verification verdicts", stage="db")
+        return results
+
+    def verification_queue_counts(self) -> Dict[str, int]:
+        try:
+            cursor = self._reader().execute(
+                "SELECT status, COUNT(*) FROM verification_jobs GROUP BY status"
+            )
+            return dict(cursor.fetchall())
+        except sqlite3.Error as e:
+            error_logger.log_error(e, context="counting verification jobs", stage="db")
+            return {}
+
+    def load_clusters(self) -> Tuple[List[Dict], List[Dict]]:
+        """(event_clusters rows, cluster_members rows) for ClusterIndex.load."""
+        try:
+            conn = self._reader()
+            clusters = [dict(row) for row in conn.execute("SELECT * FROM event_clusters")]
+            members = [dict(row) for row in conn.execute("SELECT * FROM cluster_members")]
+            return clusters, members
+        except sqlite3.Error as e:
+            error_logger.log_error(e, context="loading event clusters", stage="db")
+            return [], []
+
+    def save_clusters(
+        self,
+        clusters: Sequence[Tuple[int, str, str, str, str]],
+        members: Sequence[Tuple[str, str, int, str, str, str, float]],
+        removed: Sequence[Tuple[str, str]] = (),
+    ) -> None:
+        """Persist ClusterIndex.changes() in one transaction: new (id, exchange, market_id,
+        event, description) clusters, (exchange, market_id, cluster_id, event, description,
+        text_key, confidence) memberships and removed (exchange, market_id) memberships."""
+        if not (clusters or members or removed):
+            return
+        try:
+            with self._write_lock, self._conn:
+                self._conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO event_clusters
+                    (id, exchange, market_id, canonical_event, canonical_description)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    clusters,
+                )
+                self._conn.executemany(
+                    "DELETE FROM cluster_members WHERE exchange = ? AND market_id = ?", removed
+                )
+                self._conn.executemany(
+                    """
+                    INSERT INTO cluster_members
+                    (exchange, market_id, cluster_id, event, description, text_key, confidence)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(exchange, market_id) DO UPDATE SET
+                        cluster_id = excluded.cluster_id,
+                        event = excluded.event,
+                        description = excluded.description,
+                        text_key = excluded.text_key,
+                        confidence = excluded.confidence,
+                        updated_at = CURRENT_TIMESTAMP
+                    """,
+                    members,
+                )
+        except sqlite3.Error as e:
+            error_logger.log_error(e, context="saving event clusters", stage="db")
+
+    def get_cluster(self, cluster_id: int) -> Optional[Dict]:
+        """An event cluster with its members (one dict per market, any exchange)."""
+        try:
+            conn = self._reader()
+            row = conn.execute("SELECT * FROM event_clusters WHERE id = ?", (cluster_id,))
+            cluster = row.fetchone()
+            if cluster is None:
+                return None
+            members = conn.execute(
+                "SELECT exchange, market_id, event, confidence FROM cluster_members "
+                "WHERE cluster_id = ? ORDER BY exchange, market_id",
+                (cluster_id,),
+            )
+            return {**dict(cluster), "members": [dict(m) for m in members.fetchall()]}
+        except sqlite3.Error as e:
+            error_logger.log_error(e, context="fetching event cluster", stage="db")
+            return None
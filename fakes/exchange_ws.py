@@ -0,0 +1,196 @@
+"""Local stand-in for the Kalshi and Polymarket market-data websockets.
+
+Speaks just enough of both protocols for streaming.PriceStream: ``/kalshi``
+answers ``subscribe`` commands with ``orderbook_snapshot`` + ``orderbook_delta``
+messages, ``/polymarket`` answers ``market`` subscriptions with ``book`` +
+``price_change`` events. Every subscribed market's best bid/ask random-walks
+at ``updates_per_second`` and each message carries a ``ts`` send timestamp so
+benchmarks can measure end-to-end latency.
+
+Usage:
+    uv run python -m fakes.exchange_ws --port 8765 --rate 200
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+
+class _Market:
+    def __init__(self, rng: random.Random):
+        self.bid = rng.randrange(20, 80)  # cents
+        self.spread = rng.randrange(1, 4)
+        self.size = rng.randrange(10, 500)
+
+    @property
+    def ask(self) -> int:
+        return self.bid + self.spread
+
+
+class FakeExchangeServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        updates_per_second: float = 50.0,
+        disconnect_after: Optional[int] = None,
+        seed: int = 0,
+    ):
+        self.host = host
+        self.port = port
+        self.updates_per_second = updates_per_second
+        self.disconnect_after = disconnect_after
+        self.rng = random.Random(seed)
+        self.messages_sent = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def start(self) -> str:
+        """Serve in a background thread; returns the base ws:// URL."""
+        self._thread = threading.Thread(target=self._run, name="fake-exchange-ws", daemon=True)
+        self._thread.start()
+        self._ready.wait(10)
+        return self.url
+
+    def stop(self) -> None:
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self.serve_forever())
+        self._loop.close()
+
+    async def serve_forever(self) -> None:
+        from websockets.asyncio.server import serve
+
+        self._stop = asyncio.Event()
+        async with serve(self._handler, self.host, self.port) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._stop.wait()
+
+    async def _handler(self, ws) -> None:
+        kalshi = "kalshi" in (ws.request.path or "")
+        markets: Dict[str, _Market] = {}
+        subscribed: Set[str] = set()
+
+        async def reader() -> None:
+            async for raw in ws:
+                msg = json.loads(raw)
+                if kalshi and msg.get("cmd") == "subscribe":
+                    ids = msg.get("params", {}).get("market_tickers", [])
+                elif not kalshi and msg.get("type") == "market":
+                    ids = msg.get("assets_ids", [])
+                else:
+                    continue
+                for market_id in ids:
+                    if market_id not in markets:
+                        markets[market_id] = _Market(self.rng)
+                    subscribed.add(market_id)
+                    await ws.send(json.dumps(self._snapshot(kalshi, market_id, markets[market_id])))
+
+        read_task = asyncio.create_task(reader())
+        sent = 0
+        interval = 1.0 / self.updates_per_second
+        try:
+            while not read_task.done():
+                await asyncio.sleep(interval)
+                if not subscribed:
+                    continue
+                market_id = self.rng.choice(sorted(subscribed))
+                for message in self._move(kalshi, market_id, markets[market_id]):
+                    await ws.send(json.dumps(message))
+                    sent += 1
+                    self.messages_sent += 1
+                if self.disconnect_after and sent >= self.disconnect_after:
+                    await ws.close()
+                    break
+        except Exception:
+            pass
+        finally:
+            read_task.cancel()
+
+    def _snapshot(self, kalshi: bool, market_id: str, m: _Market) -> Dict:
+        if kalshi:
+            return {
+                "type": "orderbook_snapshot",
+                "ts": time.time(),
+                "msg": {
+                    "market_ticker": market_id,
+                    "yes": [[m.bid, m.size]],
+                    "no": [[100 - m.ask, m.size]],
+                },
+            }
+        return {
+            "event_type": "book",
+            "ts": time.time(),
+            "asset_id": market_id,
+            "bids": [{"price": f"{m.bid / 100:.2f}", "size": str(m.size)}],
+            "asks": [{"price": f"{m.ask / 100:.2f}", "size": str(m.size)}],
+        }
+
+    def _move(self, kalshi: bool, market_id: str, m: _Market) -> List[Dict]:
+        old_bid, old_ask = m.bid, m.ask
+        m.bid = min(96, max(1, m.bid + self.rng.choice((-1, 1))))
+        if kalshi:
+            # Move both sides: remove the old levels, add the new ones
+            return [
+                self._kalshi_delta(market_id, "yes", old_bid, -m.size),
+                self._kalshi_delta(market_id, "yes", m.bid, m.size),
+                self._kalshi_delta(market_id, "no", 100 - old_ask, -m.size),
+                self._kalshi_delta(market_id, "no", 100 - m.ask, m.size),
+            ]
+        changes = [
+            {"asset_id": market_id, "price": f"{old_bid / 100:.2f}", "side": "BUY", "size": "0"},
+            {"asset_id": market_id, "price": f"{old_ask / 100:.2f}", "side": "SELL", "size": "0"},
+            {
+                "asset_id": market_id,
+                "price": f"{m.bid / 100:.2f}",
+                "side": "BUY",
+                "size": str(m.size),
+            },
+            {
+                "asset_id": market_id,
+                "price": f"{m.ask / 100:.2f}",
+                "side": "SELL",
+                "size": str(m.size),
+            },
+        ]
+        return [{"event_type": "price_change", "ts": time.time(), "price_changes": changes}]
+
+    @staticmethod
+    def _kalshi_delta(ticker: str, side: str, price: int, delta: int) -> Dict:
+        return {
+            "type": "orderbook_delta",
+            "ts": time.time(),
+            "msg": {"market_ticker": ticker, "price": price, "delta": delta, "side": side},
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate", type=float, default=50.0, help="updates/sec per connection")
+    parser.add_argument("--disconnect-after", type=int, default=None)
+    args = parser.parse_args()
+    server = FakeExchangeServer(args.host, args.port, args.rate, args.disconnect_after)
+    print(f"Fake exchange websocket on {server.url}/kalshi and {server.url}/polymarket")
+    asyncio.run(server.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
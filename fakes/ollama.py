@@ -0,0 +1,316 @@
+"""Local stand-in for the Ollama HTTP API used by the matcher.
+
+Answers the endpoints MarketMatcher._verify_match_with_llm and
+MarketMappingBot.test_ollama_connection call (``/v1/generate`` in its chat,
+prompt and OpenAI-style payload shapes, ``/v1/completions``) plus the native
+``/api/chat``, ``/api/generate``, ``/v1/chat/completions`` and ``/api/tags``.
+
+Verdicts are deterministic: the two market titles are pulled out of the prompt
+and called a match when their critical tokens (numbers and capitalized words,
+minus stopwords) are identical and their word overlap is high enough, so the
+same pair always gets the same answer. Latency follows a configurable
+distribution, at most ``concurrency`` requests are processed at once (the rest
+queue, as with OLLAMA_NUM_PARALLEL), and errors, hangs and malformed JSON can be
+injected at given rates. ``GET /_fake/stats`` reports request counters.
+
+Usage:
+    uv run python -m fakes.ollama --port 11434 --latency-ms 800 --concurrency 2
+    OLLAMA_URL=http://127.0.0.1:11434 uv run python finder.py
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Set, Tuple
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+STOPWORDS = {"will", "the", "a", "an", "be", "if", "by", "in", "on", "of", "to", "yes", "no"}
+
+_TITLE_A = re.compile(r"Market A.*?Title:\s*(.+?)\s*\n", re.S)
+_TITLE_B = re.compile(r"Market B.*?Title:\s*(.+?)\s*\n", re.S)
+
+
+def _words(text: str) -> Set[str]:
+    return {w for w in re.findall(r"[a-z0-9]+", text.lower()) if w not in STOPWORDS}
+
+
+def _critical(text: str) -> Set[str]:
+    tokens = re.findall(r"[A-Za-z0-9]+", text)
+    return {
+        t.lower()
+        for t in tokens
+        if (any(c.isdigit() for c in t) or t[0].isupper()) and t.lower() not in STOPWORDS
+    }
+
+
+def judge(prompt: str, min_overlap: float = 0.3) -> Dict:
+    """Deterministic stand-in for the model's JSON verdict on a comparison prompt."""
+    a, b = _TITLE_A.search(prompt), _TITLE_B.search(prompt)
+    if not a or not b:
+        return {"reason": "No market pair in prompt", "match": False, "confidence": 0.0}
+    title_a, title_b = a.group(1), b.group(1)
+    words_a, words_b = _words(title_a), _words(title_b)
+    overlap = len(words_a & words_b) / max(1, len(words_a | words_b))
+    critical_a, critical_b = _critical(title_a), _critical(title_b)
+    if critical_a and critical_a == critical_b and overlap >= min_overlap:
+        confidence = round(0.75 + 0.2 * overlap, 3)
+        reason = "Same entities, numbers and dates"
+        return {"reason": reason, "match": True, "confidence": confidence}
+    differing = sorted(critical_a ^ critical_b)[:4]
+    return {
+        "reason": f"Different details: {', '.join(differing) or 'wording'}",
+        "match": False,
+        "confidence": round(0.9 - 0.5 * overlap, 3),
+    }
+
+
+class FakeOllamaServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        latency_distribution: str = "fixed",
+        jitter_ms: float = 0.0,
+        concurrency: int = 1,
+        max_queue: Optional[int] = None,
+        error_rate: float = 0.0,
+        hang_rate: float = 0.0,
+        hang_seconds: float = 90.0,
+        invalid_json_rate: float = 0.0,
+        model: str = "llama3",
+        seed: int = 0,
+    ):
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution {latency_distribution!r}; "
+                f"expected one of {LATENCY_DISTRIBUTIONS}"
+            )
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.latency_distribution = latency_distribution
+        self.jitter_ms = jitter_ms
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.invalid_json_rate = invalid_json_rate
+        self.model = model
+        self.rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, float] = {
+            "requests": 0,
+            "verdicts": 0,
+            "errors": 0,
+            "hangs": 0,
+            "invalid_json": 0,
+            "rejected": 0,
+            "waiting": 0,
+            "in_flight": 0,
+            "max_in_flight": 0,
+            "busy_seconds": 0.0,
+        }
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> str:
+        """Serve in a background thread; returns the base http:// URL."""
+        self._server = self._make_server()
+        threading.Thread(target=self._server.serve_forever, name="fake-ollama", daemon=True).start()
+        return self.url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def serve_forever(self) -> None:
+        self._server = self._make_server()
+        self._server.serve_forever()
+
+    def _make_server(self) -> ThreadingHTTPServer:
+        server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        server.daemon_threads = True
+        self.port = server.server_address[1]
+        return server
+
+    def _count(self, name: str, value: float = 1) -> None:
+        with self._stats_lock:
+            self.stats[name] += value
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+
+    def _roll(self) -> Tuple[float, float]:
+        """(fault draw in [0, 1), latency in seconds) for one request."""
+        with self._rng_lock:
+            fault = self.rng.random()
+            mean, jitter = self.latency_ms, self.jitter_ms
+            if self.latency_distribution == "uniform":
+                ms = self.rng.uniform(max(0.0, mean - jitter), mean + jitter)
+            elif self.latency_distribution == "exponential":
+                ms = self.rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+            elif self.latency_distribution == "lognormal":
+                # Right-skewed like real generation times, with mean latency_ms and
+                # standard deviation jitter_ms
+                sigma = math.sqrt(math.log1p((jitter / mean) ** 2)) if mean > 0 else 0.0
+                ms = self.rng.lognormvariate(math.log(mean) - sigma**2 / 2, sigma) if mean else 0.0
+            else:
+                ms = mean
+        return fault, max(0.0, ms) / 1000.0
+
+    def _respond(self, path: str, payload: Dict) -> Tuple[int, Dict]:
+        """Produce (status, body) after the simulated queueing, latency and faults."""
+        if self.max_queue is not None and self.stats["waiting"] >= self.max_queue:
+            self._count("rejected")
+            return 503, {"error": "server busy"}
+        self._count("waiting")
+        with self._slots:
+            self._count("waiting", -1)
+            self._count("in_flight")
+            started = time.perf_counter()
+            try:
+                fault, latency = self._roll()
+                if fault < self.error_rate:
+                    self._count("errors")
+                    time.sleep(latency)
+                    return 500, {"error": "injected failure"}
+                fault -= self.error_rate
+                if fault < self.hang_rate:
+                    self._count("hangs")
+                    time.sleep(self.hang_seconds)
+                    return 500, {"error": "injected hang"}
+                fault -= self.hang_rate
+                time.sleep(latency)
+                if fault < self.invalid_json_rate:
+                    self._count("invalid_json")
+                    content = "Sure! The markets look similar, I think."
+                else:
+                    self._count("verdicts")
+                    content = json.dumps(judge(self._prompt_text(payload)))
+                return 200, self._wrap(path, payload, content)
+            finally:
+                self._count("busy_seconds", time.perf_counter() - started)
+                self._count("in_flight", -1)
+
+    @staticmethod
+    def _prompt_text(payload: Dict) -> str:
+        if payload.get("messages"):
+            return "\n".join(str(m.get("content", "")) for m in payload["messages"])
+        return str(payload.get("prompt", ""))
+
+    def _wrap(self, path: str, payload: Dict, content: str) -> Dict:
+        """Shape the model output like the endpoint (and payload style) that was called."""
+        created = int(time.time())
+        if path == "/v1/completions":
+            return {"object": "text_completion", "created": created, "choices": [{"text": content}]}
+        if path == "/v1/chat/completions":
+            choice = {"message": {"role": "assistant", "content": content}}
+            return {"object": "chat.completion", "created": created, "choices": [choice]}
+        if payload.get("messages"):
+            return {
+                "model": self.model,
+                "message": {"role": "assistant", "content": content},
+                "done": True,
+            }
+        return {"model": self.model, "response": content, "done": True}
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status: int, body: Dict) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                if self.path == "/api/tags":
+                    self._send(200, {"models": [{"name": fake.model, "model": fake.model}]})
+                elif self.path == "/_fake/stats":
+                    with fake._stats_lock:
+                        self._send(200, dict(fake.stats))
+                else:
+                    self._send(404, {"error": "not found"})
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._send(400, {"error": "invalid JSON body"})
+                    return
+                fake._count("requests")
+                if self.path not in (
+                    "/v1/generate",
+                    "/v1/completions",
+                    "/v1/chat/completions",
+                    "/api/chat",
+                    "/api/generate",
+                ):
+                    self._send(404, {"error": "not found"})
+                    return
+                try:
+                    self._send(*fake._respond(self.path, payload))
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client gave up (timeout) while we were "thinking"
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency-ms", type=float, default=500.0)
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--jitter-ms", type=float, default=200.0)
+    parser.add_argument("--concurrency", type=int, default=1, help="requests processed at once")
+    parser.add_argument("--max-queue", type=int, default=None, help="503 beyond this many waiting")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=90.0)
+    parser.add_argument("--invalid-json-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    server = FakeOllamaServer(
+        args.host,
+        args.port,
+        latency_ms=args.latency_ms,
+        latency_distribution=args.latency_dist,
+        jitter_ms=args.jitter_ms,
+        concurrency=args.concurrency,
+        max_queue=args.max_queue,
+        error_rate=args.error_rate,
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        invalid_json_rate=args.invalid_json_rate,
+        seed=args.seed,
+    )
+    print(f"Fake Ollama on http://{args.host}:{args.port} (stats at /_fake/stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
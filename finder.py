@@ -1,32 +1,122 @@
 # finder.py
+import argparse
 import json
 import os
+import signal
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional
-
-import requests
-
-from config import FETCH_INTERVAL_SECONDS, OLLAMA_AUTH, OLLAMA_MODEL, OLLAMA_URL
-from database import MatchDatabase
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from config import (
+    CHECKPOINT_MAX_AGE_SECONDS,
+    CHECKPOINT_PATH,
+    DISCORD_WEBHOOK_URL,
+    DISCOVERY_INTERVAL_SECONDS,
+    KALSHI_API_KEY_ID,
+    KALSHI_PRIVATE_KEY_PATH,
+    MATCHING_MODE,
+    MEMORY_BUDGET_MB,
+    MEMORY_TRACKING,
+    METRICS_PORT,
+    METRICS_SUMMARY_PATH,
+    OLLAMA_AUTH,
+    OLLAMA_MODEL,
+    OLLAMA_TIMEOUT_SECONDS,
+    PRICE_POLL_INTERVAL_SECONDS,
+    PRICE_SOURCE,
+    PROFILE_BUDGET_SECONDS,
+    PROFILE_DIR,
+    PROFILE_MODE,
+    PROFILE_TOP_N,
+    TELEGRAM_BOT_TOKEN,
+    TELEGRAM_CHAT_ID,
+)
 from logger import error_logger
-from scrapers.base import BaseMarketScraper
-from scrapers.kalshi import KalshiScraper
-from scrapers.polymarket import PolymarketScraper
+from memory import MemoryBudget
+from metrics import metrics
+from profiling import PROFILE_MODES, CycleProfiler
+
+# numpy, requests, sqlite3 and the scraper / notifier / stream packages are imported
+# where they are first used so that ``finder.py --help`` does not pay for them
+if TYPE_CHECKING:
+    from checkpoint import Checkpoint
+    from notifiers import BaseNotifier
+    from scrapers.base import BaseMarketScraper
 
 
 class MarketMappingBot:
     MIN_PREDICTIONS = 5000
 
-    def __init__(self, scrapers: List[BaseMarketScraper], interval: int = FETCH_INTERVAL_SECONDS):
-        from matcher.matcher import MarketMatcher
-
+    def __init__(
+        self,
+        scrapers: List["BaseMarketScraper"],
+        interval: int = DISCOVERY_INTERVAL_SECONDS,
+        notifiers: Optional[List["BaseNotifier"]] = None,
+        price_interval: float = PRICE_POLL_INTERVAL_SECONDS,
+        price_source: str = PRICE_SOURCE,
+        profiler: Optional[CycleProfiler] = None,
+        memory_budget_mb: float = MEMORY_BUDGET_MB,
+        checkpoint: Optional["Checkpoint"] = None,
+        matching_mode: str = MATCHING_MODE,
+    ):
+        from arbitrage.engine import SpreadEngine
+        from checkpoint import Checkpoint
+        from database import MatchDatabase
+        from matcher.matcher import MATCHING_MODES, MarketMatcher
+        from notifiers import ConsoleNotifier, NotificationDispatcher
+
+        if matching_mode not in MATCHING_MODES:
+            raise ValueError(
+                f"Unknown matching mode {matching_mode!r}; expected one of {MATCHING_MODES}"
+            )
         self.scrapers = scrapers
-        self.matcher = MarketMatcher()
-        self.interval = interval
+        self.matching_mode = matching_mode
         self.db = MatchDatabase()
+        self.matcher = MarketMatcher(market_store=self.db)
+        self.engine = SpreadEngine()
+        self.notifiers = (
+            notifiers if notifiers is not None else [NotificationDispatcher([ConsoleNotifier()])]
+        )
+        self.interval = interval
+        self.price_interval = price_interval
+        self._engine_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.price_source = price_source
+        self.profiler = profiler or CycleProfiler(
+            PROFILE_MODE, PROFILE_DIR, PROFILE_BUDGET_SECONDS, PROFILE_TOP_N
+        )
+        self.memory_budget = MemoryBudget(memory_budget_mb)
+        if checkpoint is None and CHECKPOINT_PATH:
+            checkpoint = Checkpoint(CHECKPOINT_PATH, CHECKPOINT_MAX_AGE_SECONDS)
+        self.checkpoint = checkpoint
+        self._last_discovery_at: Optional[float] = None
+        self.streams = []
+        self._ollama_probe: Optional[Future] = None
+        self._started_at: Optional[float] = None
+        if price_source == "stream":
+            from streaming import KalshiFeed, KalshiSigner, PolymarketFeed, PriceStream
+
+            signer = None
+            if KALSHI_API_KEY_ID and KALSHI_PRIVATE_KEY_PATH:
+                signer = KalshiSigner(KALSHI_API_KEY_ID, KALSHI_PRIVATE_KEY_PATH)
+            else:
+                print(
+                    "Kalshi stream: no KALSHI_API_KEY_ID / KALSHI_PRIVATE_KEY_PATH; "
+                    "the handshake will be rejected"
+                )
+            self._poly_feed = PolymarketFeed()
+            self.streams = [
+                PriceStream(KalshiFeed(signer=signer), self._on_stream_update),
+                PriceStream(self._poly_feed, self._on_stream_update),
+            ]
 
     def test_ollama_connection(self) -> None:
+        """Ask every LLM host a trivial question; failing hosts are ejected from the pool
+        (and probed for re-admission). Raises only if no host answers."""
+        import requests
+
         chat_payload = {
             "model": OLLAMA_MODEL,
             "messages": [
@@ -36,10 +126,34 @@ class MarketMappingBot:
             "stream": False,
         }
         headers = {"Authorization": f"Bearer {OLLAMA_AUTH}"}
-        chat_resp = requests.post(
-            f"{OLLAMA_URL}/v1/generate", json=chat_payload, headers=headers, timeout=60
-        )
-        chat_resp.raise_for_status()
+        pool = self.matcher.ollama_pool
+
+        def check(host) -> Optional[Exception]:
+            try:
+                chat_resp = requests.post(
+                    f"{host.url}/v1/generate",
+                    json=chat_payload,
+                    headers=headers,
+                    timeout=OLLAMA_TIMEOUT_SECONDS,
+                )
+                chat_resp.raise_for_status()
+                return None
+            except requests.RequestException as e:
+                error_logger.log_error(e, context=f"checking LLM host {host.url}", stage="startup")
+                pool.eject(host, "startup check failed")
+                return e
+
+        with ThreadPoolExecutor(max_workers=len(pool.hosts)) as executor:
+            errors = list(executor.map(check, pool.hosts))
+        if all(errors):
+            raise errors[0]
+        print(f"LLM hosts: {pool.healthy_count()}/{len(pool.hosts)} healthy")
+
+    def _warm_up(self) -> None:
+        try:
+            self.matcher.warm_up()
+        except Exception as e:
+            error_logger.log_error(e, context="warming up matcher", stage="startup")
 
     def _dump_markets_to_json(self, poly_markets: List[dict], kalshi_markets: List[dict]) -> None:
         """Dump retrieved markets to JSON files for testing purposes."""
@@ -59,12 +173,11 @@ class MarketMappingBot:
             json.dump(kalshi_markets, f, indent=2)
         print(f"  Dumped {len(kalshi_markets)} Kalshi markets to {kalshi_file}")
 
-    def _extract_polymarket_date_range(
-        self, poly_markets: List[dict]
-    ) -> tuple[Optional[int], Optional[int]]:
+    def _extract_close_range(self, markets: List[dict]) -> tuple[Optional[int], Optional[int]]:
         end_dates = []
-        for market in poly_markets:
-            events = market.get("events", [])
+        for market in markets:
+            # Polymarket dates its events; other exchanges date the market itself
+            events = market.get("events") or [{"end_date": market.get("close_time")}]
             for event in events:
                 end_date_str = event.get("end_date")
                 if end_date_str:
@@ -86,60 +199,344 @@ class MarketMappingBot:
 
         return min_close_ts, max_close_ts
 
-    def run(self) -> None:
-        print("Starting Market Mapping Bot...")
+    @staticmethod
+    def _quotes(markets: List[dict], id_field: str) -> Dict[str, Dict]:
+        from arbitrage.engine import PRICE_FIELDS
 
-        self.test_ollama_connection()
+        return {
+            m[id_field]: {field: m.get(field) for field in PRICE_FIELDS}
+            for m in markets
+            if m.get(id_field)
+        }
+
+    def _notify(self, opportunities: List[Dict]) -> None:
+        for notifier in self.notifiers:
+            for opportunity in opportunities:
+                notifier.notify_arbitrage(opportunity)
+
+    def _check_arbitrage(self, markets: Dict[str, List[dict]]) -> None:
+        id_fields = {scraper.get_name(): scraper.market_id_field for scraper in self.scrapers}
+        with self._engine_lock:
+            self.engine.load_pairs(self.db.iter_matches())
+            for name, exchange_markets in markets.items():
+                # The spread engine prices the exchanges it has a table for
+                if name in self.engine.tables:
+                    self.engine.update_prices(name, self._quotes(exchange_markets, id_fields[name]))
+            opportunities = self.engine.compute()
+        metrics.inc("opportunities_total", len(opportunities))
+        self._notify(opportunities)
+        for notifier in self.notifiers:
+            notifier.notify_summary(
+                {name: len(exchange_markets) for name, exchange_markets in markets.items()},
+                len(opportunities),
+            )
 
-        while True:
+    def _on_stream_update(self, exchange: str, quotes: Dict[str, Dict]) -> None:
+        with self._engine_lock:
+            opportunities = self.engine.compute(self.engine.update_prices(exchange, quotes))
+        metrics.inc("stream_updates_total", exchange=exchange)
+        metrics.inc("opportunities_total", len(opportunities))
+        self._notify(opportunities)
+
+    def _sync_streams(self, poly_markets: List[dict]) -> None:
+        """Point the websocket streams at the markets of the current pairs."""
+        tokens = dict(self._poly_feed.token_ids)
+        tokens.update(
+            {m["slug"]: m["clob_token_ids"][0] for m in poly_markets if m.get("clob_token_ids")}
+        )
+        with self._engine_lock:
+            wanted = {name: self.engine.market_ids(name) for name in self.engine.tables}
+        self._poly_feed.set_token_ids(
+            {slug: tokens[slug] for slug in wanted["Polymarket"] if slug in tokens}
+        )
+        for stream in self.streams:
+            stream.set_markets(wanted.get(stream.exchange, []))
+
+    def _write_summary(self, summary: Dict) -> None:
+        stages = []
+        for name, stage in summary["stages"].items():
+            peak = f" peak {stage['alloc_peak_mb']:.0f}MB" if "alloc_peak_mb" in stage else ""
+            stages.append(f"{name} {stage['seconds']:.2f}s{peak}")
+        memory = f", RSS {summary['memory']['rss_mb']:.0f}MB" if "memory" in summary else ""
+        print(f"Cycle summary: {', '.join(stages)} (total {summary['seconds']:.2f}s{memory})")
+        if not METRICS_SUMMARY_PATH:
+            return
+        os.makedirs(os.path.dirname(METRICS_SUMMARY_PATH) or ".", exist_ok=True)
+        with open(METRICS_SUMMARY_PATH, "a") as f:
+            f.write(json.dumps(summary) + "\n")
+
+    def save_checkpoint(self) -> None:
+        state, arrays = self.matcher.checkpoint_state()
+        state["last_discovery_at"] = self._last_discovery_at
+        if self.streams:
+            state["poly_token_ids"] = self._poly_feed.token_ids
+        self.checkpoint.save(state, arrays)
+
+    def restore_checkpoint(self) -> bool:
+        """Warm restart: reload matcher caches, tracked pairs and the discovery schedule."""
+        loaded = self.checkpoint.load() if self.checkpoint is not None else None
+        if loaded is None:
+            return False
+        state, arrays, age = loaded
+        self.matcher.restore_checkpoint_state(state, arrays)
+        self._last_discovery_at = state.get("last_discovery_at")
+        with self._engine_lock:
+            self.engine.load_pairs(self.db.iter_matches())
+        if self.streams:
+            self._poly_feed.set_token_ids(state.get("poly_token_ids", {}))
+            self._sync_streams([])
+        print(
+            f"Warm restart from a {age:.0f}s old checkpoint: {len(self.engine)} pairs, "
+            f"{len(arrays.get('embedding_keys', []))} embeddings, "
+            f"{len(state['verdicts'])} LLM verdicts"
+        )
+        return True
+
+    def run_discovery_cycle(self) -> None:
+        """Slow path: fetch every market, match, save and refresh the tracked pairs."""
+        level = self.memory_budget.check(self.matcher)
+        if level == MemoryBudget.CRITICAL:
+            print(
+                f"Skipping discovery: RSS over the memory budget ({self.memory_budget.summary()})"
+            )
+            metrics.inc("discovery_skipped_total", reason="memory")
+            return
+        if level == MemoryBudget.REDUCED:
+            print("Memory pressure: smaller embedding batches, mutual filter off")
+        with self.profiler.cycle("discovery"), metrics.cycle("discovery") as summary:
+            self._run_discovery_stages()
+        if self.memory_budget.budget_bytes or metrics.track_memory:
+            summary["memory"] = self.memory_budget.summary()
+        self._write_summary(summary)
+
+    def _fetch_all(self) -> Dict[str, List[dict]]:
+        """Markets of every scraper, keyed by exchange name in scraper order.
+
+        Scrapers that can narrow their fetch to a close-time window are fetched last,
+        with the window spanned by the markets of the others.
+        """
+        markets: Dict[str, List[dict]] = {}
+        ranged = [s for s in self.scrapers if s.supports_close_range]
+        for scraper in [s for s in self.scrapers if not s.supports_close_range]:
+            name = scraper.get_name()
+            with metrics.stage(f"fetch_{name.lower()}") as stage:
+                markets[name] = scraper.fetch_markets(limit=self.MIN_PREDICTIONS)
+                stage.items_out = len(markets[name])
+        min_close_ts, max_close_ts = self._extract_close_range(
+            [m for exchange_markets in markets.values() for m in exchange_markets]
+        )
+        for scraper in ranged:
+            name = scraper.get_name()
+            with metrics.stage(f"fetch_{name.lower()}") as stage:
+                markets[name] = scraper.fetch_markets(
+                    limit=self.MIN_PREDICTIONS,
+                    min_close_ts=min_close_ts,
+                    max_close_ts=max_close_ts,
+                )
+                stage.items_out = len(markets[name])
+        return {s.get_name(): markets[s.get_name()] for s in self.scrapers}
+
+    def _match_pairs(self, markets: Dict[str, List[dict]]) -> None:
+        poly_markets = markets.get("Polymarket", [])
+        kalshi_markets = markets.get("Kalshi", [])
+        total_pairs = len(poly_markets) * len(kalshi_markets)
+        print(f" Total pairs: {total_pairs:,}")
+
+        if self._ollama_probe is not None:
+            self._ollama_probe.result()
+        matches = self.matcher.find_matches(poly_markets, kalshi_markets)
+
+        with metrics.stage("save", len(matches)) as stage:
+            saved = self.db.save_matches(matches)
+            stage.items_out = sum(saved)
+        metrics.inc("matches_new_total", sum(saved))
+        for (poly, kalshi, conf), is_new in zip(matches, saved):
+            if is_new:
+                print(f"NEW MATCH: {poly['event']} ⚡ {kalshi['event']} (Confidence: {conf:.2f})")
+
+    def _match_clusters(self, markets: Dict[str, List[dict]]) -> None:
+        counts = ", ".join(f"{name} {len(m):,}" for name, m in markets.items())
+        print(f" Markets: {counts}")
+
+        if self._ollama_probe is not None:
+            self._ollama_probe.result()
+        joined = self.matcher.match_clusters(markets)
+        for cluster_id, exchange, item, conf in joined:
+            print(f"NEW CLUSTER MEMBER #{cluster_id}: {exchange} {item['event']} ({conf:.2f})")
+
+        # market_matches keeps the Polymarket / Kalshi pairs the spread engine prices, one
+        # per outcome where several markets of an exchange share a cluster
+        pairs = self.matcher.cluster_pairs(
+            "Polymarket", "Kalshi", {cluster_id for cluster_id, _, _, _ in joined}
+        )
+        with metrics.stage("save", len(pairs)) as stage:
+            saved = self.db.save_matches(
+                [(poly, kalshi, conf) for poly, kalshi, conf, _ in pairs],
+                [cluster_id for _, _, _, cluster_id in pairs],
+            )
+            stage.items_out = sum(saved)
+        metrics.inc("matches_new_total", sum(saved))
+
+    def _run_discovery_stages(self) -> None:
+        print("Fetching market data...", end="", flush=True)
+        markets = self._fetch_all()
+        if self.matching_mode == "clusters":
+            self._match_clusters(markets)
+        else:
+            self._match_pairs(markets)
+
+        with metrics.stage("arbitrage"):
+            self._check_arbitrage(markets)
+        if self.streams:
+            self._sync_streams(markets.get("Polymarket", []))
+        self._last_discovery_at = time.time()
+        if self.checkpoint is not None:
+            with metrics.stage("checkpoint"):
+                self.save_checkpoint()
+
+    def run_price_cycle(self) -> None:
+        """Fast path: re-poll prices of already-matched markets only and re-check their pairs."""
+        with self._engine_lock:
+            wanted = {name: self.engine.market_ids(name) for name in self.engine.tables}
+        if not any(wanted.values()):
+            return
+        import numpy as np
+
+        with metrics.cycle("price"):
+            with metrics.stage("price_fetch", sum(map(len, wanted.values()))) as stage:
+                quotes = {
+                    scraper.get_name(): scraper.fetch_quotes(wanted[scraper.get_name()])
+                    for scraper in self.scrapers
+                    if wanted.get(scraper.get_name())
+                }
+                stage.items_out = sum(map(len, quotes.values()))
+            with metrics.stage("price_compute") as stage, self._engine_lock:
+                touched = [np.zeros(0, dtype=np.int64)]
+                touched += [self.engine.update_prices(name, q) for name, q in quotes.items()]
+                opportunities = self.engine.compute(np.unique(np.concatenate(touched)))
+                stage.items_out = len(opportunities)
+            metrics.inc("opportunities_total", len(opportunities))
+            self._notify(opportunities)
+
+    def _discovery_loop(self) -> None:
+        if self._last_discovery_at is not None:
+            # Restored from a checkpoint: keep the previous cadence instead of a cold cycle
+            remaining = self._last_discovery_at + self.interval - time.time()
+            if remaining > 0:
+                print(
+                    "Next discovery at",
+                    time.strftime("%H:%M:%S", time.localtime(time.time() + remaining)),
+                )
+                self._started_at = None
+                self._stop.wait(remaining)
+        while not self._stop.is_set():
             try:
-                print("Fetching market data...", end="", flush=True)
-
-                poly_markets = []
-                kalshi_markets = []
-                kalshi_scraper = None
-
-                for scraper in self.scrapers:
-                    name: str = scraper.get_name()
-                    if name == "Polymarket":
-                        markets: List[dict] = scraper.fetch_markets(limit=self.MIN_PREDICTIONS)
-                        poly_markets = markets
-                    elif name == "Kalshi":
-                        kalshi_scraper = scraper
-
-                min_close_ts, max_close_ts = self._extract_polymarket_date_range(poly_markets)
-                if kalshi_scraper:
-                    kalshi_markets = kalshi_scraper.fetch_markets(
-                        limit=self.MIN_PREDICTIONS,
-                        min_close_ts=min_close_ts,
-                        max_close_ts=max_close_ts,
-                    )
-
-                total_pairs = len(poly_markets) * len(kalshi_markets)
-                print(f" Total pairs: {total_pairs:,}")
-
-                matches = self.matcher.find_matches(poly_markets, kalshi_markets)
-
-                for poly, kalshi, conf in matches:
-                    if self.db.save_match(poly, kalshi, conf):
-                        print(
-                            f"NEW MATCH: {poly['event']} ⚡ {kalshi['event']} "
-                            f"(Confidence: {conf:.2f})"
-                        )
-
-            except KeyboardInterrupt:
-                print("\nStopping bot...")
-                break
+                self.run_discovery_cycle()
             except Exception as e:
-                error_logger.log_error(e, context="main mapping loop")
+                error_logger.log_error(e, context="discovery loop", stage="discovery")
+            if self._started_at is not None:
+                elapsed = time.monotonic() - self._started_at
+                print(f"First discovery cycle finished {elapsed:.1f}s after start")
+                metrics.set_gauge("startup_to_first_cycle_seconds", elapsed)
+                self._started_at = None
             print(
-                "Next fetch at",
+                "Next discovery at",
                 time.strftime("%H:%M:%S", time.localtime(time.time() + self.interval)),
             )
-            time.sleep(self.interval)
+            self._stop.wait(self.interval)
+
+    def _price_loop(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.run_price_cycle()
+            except Exception as e:
+                error_logger.log_error(e, context="price loop", stage="price")
+            self._stop.wait(max(0.0, self.price_interval - (time.monotonic() - started)))
+
+    def run(self) -> None:
+        print("Starting Market Mapping Bot...")
+
+        self._started_at = time.monotonic()
+        if MEMORY_TRACKING:
+            metrics.enable_memory_tracking()
+        if not self.restore_checkpoint():
+            # No fresh checkpoint: still price the pairs already in the database right away
+            # instead of waiting for the first full discovery cycle
+            with self._engine_lock:
+                self.engine.load_pairs(self.db.iter_matches())
+            if self.streams:
+                self._sync_streams([])
+            print(f"Tracking {len(self.engine)} known pairs from the database")
+        # The Ollama probe, the model load / heavy imports and the first fetch are
+        # independent, so they run side by side; discovery only waits for the probe
+        # right before matching, and a Retriever waits for the model if still loading.
+        startup = ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup")
+        self._ollama_probe = startup.submit(self.test_ollama_connection)
+        startup.submit(self._warm_up)
+        startup.shutdown(wait=False)
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, lambda signum, frame: self.profiler.arm())
+            print(f"Send SIGUSR1 (kill -USR1 {os.getpid()}) to profile the next discovery cycle")
+        if METRICS_PORT:
+            metrics.serve(METRICS_PORT)
+            print(f"Metrics on http://127.0.0.1:{METRICS_PORT}/metrics")
+
+        # Discovery (scrape everything + LLM matching) runs on its own slow cadence in a
+        # background thread; the main thread polls prices of known pairs every few seconds.
+        # With PRICE_SOURCE="stream" the websocket threads replace the polling loop.
+        discovery = threading.Thread(target=self._discovery_loop, name="discovery", daemon=True)
+        discovery.start()
+        for stream in self.streams:
+            stream.start()
+        try:
+            self._ollama_probe.result()
+            if self.streams:
+                while not self._stop.wait(1.0):
+                    pass
+            else:
+                self._price_loop()
+        except KeyboardInterrupt:
+            print("\nStopping bot...")
+        finally:
+            self._stop.set()
+            for stream in self.streams:
+                stream.stop()
+            discovery.join(timeout=5)
+            for notifier in self.notifiers:
+                notifier.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Polymarket / Kalshi market mapping bot")
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        default=PROFILE_MODE,
+        help="profile every discovery cycle (cprofile = deterministic, sample = sampling)",
+    )
+    parser.add_argument(
+        "--profile-budget",
+        type=float,
+        default=PROFILE_BUDGET_SECONDS,
+        help="keep a sampling profile of any discovery cycle slower than this (seconds)",
+    )
+    parser.add_argument("--profile-dir", default=PROFILE_DIR)
+    parser.add_argument("--profile-top", type=int, default=PROFILE_TOP_N)
+    return parser.parse_args(argv)
 
 
 def main() -> None:
+    args = parse_args()
+    from notifiers import (
+        ConsoleNotifier,
+        DiscordNotifier,
+        NotificationDispatcher,
+        TelegramNotifier,
+    )
+    from scrapers.kalshi import KalshiScraper
+    from scrapers.polymarket import PolymarketScraper
+
     try:
         print("Creating scrapers...")
         scrapers = [
@@ -147,7 +544,18 @@ def main() -> None:
             KalshiScraper(),
         ]
         print("Scrapers created successfully")
-        bot = MarketMappingBot(scrapers, interval=60)
+        channels: List["BaseNotifier"] = [ConsoleNotifier()]
+        if DISCORD_WEBHOOK_URL:
+            channels.append(DiscordNotifier(DISCORD_WEBHOOK_URL))
+        if TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID:
+            channels.append(TelegramNotifier(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID))
+        # One dispatcher in front of every channel so alert delivery never blocks detection
+        profiler = CycleProfiler(
+            args.profile, args.profile_dir, args.profile_budget, args.profile_top
+        )
+        bot = MarketMappingBot(
+            scrapers, notifiers=[NotificationDispatcher(channels)], profiler=profiler
+        )
         bot.run()
     except Exception as e:
         print(f"Error in main(): {e}")
@@ -1,11 +1,22 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+import threading
+import time
 import traceback
 from datetime import datetime
 from functools import wraps
-from typing import Any, Callable, TypeVar
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from config import LOG_FORMAT, LOG_REPEAT_REPORT_SECONDS
 
 F = TypeVar("F", bound=Callable[..., Any])
 
+# Structured fields callers may attach to a record
+FIELDS = ("context", "stage", "exchange", "pair")
+
 
 class ArbitrageError(Exception):
     def __init__(self, message: str, line_number: int = None, filename: str = None):
@@ -20,52 +31,183 @@ class ArbitrageError(Exception):
         return self.message
 
 
+def _origin(error: BaseException) -> Tuple[str, int, str]:
+    """(file, line, function) where ``error`` was raised, without formatting the traceback."""
+    tb = error.__traceback__
+    if tb is None:
+        return "", 0, ""
+    while tb.tb_next is not None:
+        tb = tb.tb_next
+    code = tb.tb_frame.f_code
+    return code.co_filename, tb.tb_lineno, code.co_name
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, message, structured fields, error."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for name in (*FIELDS, "error_type", "error", "file", "line", "function", "repeats"):
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        if record.exc_info:
+            entry["traceback"] = "".join(traceback.format_tb(record.exc_info[2]))
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """The original human-readable multi-line error format."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        ts = datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S")
+        msg = f"{ts} - {record.name} - {record.levelname} - [{ts}] {record.getMessage()}"
+        fields = [
+            f"{name}={getattr(record, name)}" for name in FIELDS[1:] if getattr(record, name, None)
+        ]
+        if fields:
+            msg += f" ({', '.join(fields)})"
+        if getattr(record, "file", None):
+            msg += f"\n  File: {record.file}\n  Line: {record.line}"
+        if getattr(record, "error", None):
+            msg += f"\n  Error: {record.error_type}: {record.error}"
+        if record.exc_info:
+            msg += f"\n  Traceback:\n{''.join(traceback.format_tb(record.exc_info[2]))}"
+        return msg
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue the record as-is; message and traceback formatting happen on the listener."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
 class ErrorLogger:
-    def __init__(self, name: str = "arbitrage_finder"):
+    """Error logging that stays off the hot path.
+
+    ``log_error`` only builds a LogRecord and puts it on a queue; a QueueListener
+    thread formats (JSON or text, see LOG_FORMAT) and writes it. Repeats of an
+    identical error (same context, type, message and raise site) are suppressed and
+    reported as one "repeated N times" record every ``repeat_report_seconds`` (0 logs
+    every occurrence).
+    """
+
+    def __init__(
+        self,
+        name: str = "arbitrage_finder",
+        log_format: str = LOG_FORMAT,
+        repeat_report_seconds: float = LOG_REPEAT_REPORT_SECONDS,
+    ):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.ERROR)
+        self.logger.propagate = False
+        self.repeat_report_seconds = repeat_report_seconds
+        self._repeats: Dict[Tuple, Dict[str, Any]] = {}
+        self._repeats_lock = threading.Lock()
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._reporter: Optional[threading.Thread] = None
+        self._closed = threading.Event()
 
         if not self.logger.handlers:
             handler = logging.StreamHandler()
-            formatter = logging.Formatter(
-                "%(asctime)s - %(name)s - ERROR - %(message)s",
-                datefmt="%Y-%m-%d %H:%M:%S",
-            )
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
+            handler.setFormatter(JsonFormatter() if log_format == "json" else TextFormatter())
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            self.logger.addHandler(_DeferredQueueHandler(log_queue))
+            self._listener = logging.handlers.QueueListener(log_queue, handler)
+            self._listener.start()
+            atexit.register(self.close)
 
     def log_error(
         self,
         error: Exception,
         context: str = "",
         include_traceback: bool = True,
+        stage: Optional[str] = None,
+        exchange: Optional[str] = None,
+        pair: Optional[str] = None,
     ) -> None:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        tb = traceback.extract_tb(error.__traceback__)
-
-        if tb:
-            last_frame = tb[-1]
-            line_num = last_frame.lineno
-            filename = last_frame.filename
-            func_name = last_frame.name
-
-            error_msg = f"[{timestamp}] Error in {func_name}()"
+        file, line, function = _origin(error)
+        key = (context, type(error).__name__, str(error)[:200], file, line)
+        fields = {"context": context or None, "stage": stage, "exchange": exchange, "pair": pair}
+        now = time.monotonic()
+        if self.repeat_report_seconds > 0:
+            with self._repeats_lock:
+                seen = self._repeats.get(key)
+                if seen is not None:
+                    seen["count"] += 1
+                    seen["last"] = now
+                    return
+                self._repeats[key] = {"count": 0, "first": now, "last": now, "fields": fields}
+                if self._reporter is None:
+                    self._reporter = threading.Thread(
+                        target=self._report_loop, name="log-repeats", daemon=True
+                    )
+                    self._reporter.start()
+
+        message = f"Error in {function}()" if function else f"Error: {type(error).__name__}"
+        if context:
+            message += f" - {context}"
+        self.logger.error(
+            message,
+            exc_info=(type(error), error, error.__traceback__) if include_traceback else None,
+            extra={
+                **fields,
+                "error_type": type(error).__name__,
+                "error": str(error),
+                "file": file or None,
+                "line": line or None,
+                "function": function or None,
+            },
+        )
+
+    def _report_loop(self) -> None:
+        while not self._closed.wait(self.repeat_report_seconds):
+            self.report_repeats()
+
+    def report_repeats(self) -> None:
+        """Emit one record per suppressed error and forget errors that stopped recurring."""
+        now = time.monotonic()
+        with self._repeats_lock:
+            pending = []
+            for key, seen in list(self._repeats.items()):
+                if seen["count"]:
+                    pending.append((key, dict(seen)))
+                    seen["count"] = 0
+                    seen["first"] = now
+                elif now - seen["last"] >= self.repeat_report_seconds:
+                    del self._repeats[key]
+        for (context, error_type, error, file, line), seen in pending:
+            message = f"Repeated {seen['count']} times in the last {now - seen['first']:.0f}s"
             if context:
-                error_msg += f" - {context}"
-            error_msg += f"\n  File: {filename}"
-            error_msg += f"\n  Line: {line_num}"
-            error_msg += f"\n  Error: {type(error).__name__}: {error}"
-
-            if include_traceback and error.__traceback__:
-                tb_str = "".join(traceback.format_tb(error.__traceback__))
-                error_msg += f"\n  Traceback:\n{tb_str}"
-
-            self.logger.error(error_msg)
-        else:
-            error_msg = f"[{timestamp}] Error: {type(error).__name__}: {error}"
-            if context:
-                error_msg += f" - {context}"
-            self.logger.error(error_msg)
+                message += f" - {context}"
+            self.logger.error(
+                message,
+                extra={
+                    # pair/exchange of the first occurrence only; repeats may differ
+                    **seen["fields"],
+                    "pair": None,
+                    "error_type": error_type,
+                    "error": error,
+                    "file": file or None,
+                    "line": line or None,
+                    "repeats": seen["count"],
+                },
+            )
+
+    def close(self) -> None:
+        """Flush suppressed counts and drain the queue (registered with atexit)."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self.report_repeats()
+        if self._listener is not None:
+            self._listener.stop()
 
     def log_with_context(self, context: str = ""):
         def decorator(func: F) -> F:
@@ -0,0 +1,227 @@
+# clusters.py
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class EventCluster:
+    """One real-world event and the markets listing it, at most one text per exchange.
+
+    ``canonical`` is the normalized item of the founding market. Later markets are
+    matched against the text of every member, so a market can join through whichever
+    listing it resembles most.
+    """
+
+    def __init__(self, cluster_id: int, canonical: Dict):
+        self.id = cluster_id
+        self.canonical = canonical
+        # exchange -> {market_id: (item, confidence against the canonical text, text key)}
+        self.members: Dict[str, Dict[str, Tuple[Dict, float, str]]] = {}
+
+    def texts(self) -> List[Dict]:
+        """One member item per distinct text."""
+        by_key: Dict[str, Dict] = {}
+        for markets in self.members.values():
+            for item, _, text_key in markets.values():
+                by_key.setdefault(text_key, item)
+        return list(by_key.values())
+
+
+class ClusterIndex:
+    """Canonical event clusters shared by every exchange.
+
+    Every market belongs to at most one cluster. Changes since the last ``changes()``
+    call are tracked so the caller can persist them incrementally.
+    """
+
+    def __init__(self):
+        self.clusters: Dict[int, EventCluster] = {}
+        self._member_of: Dict[Tuple[str, str], int] = {}
+        self._next_id = 1
+        self._dirty_clusters: Set[int] = set()
+        self._dirty_members: Set[Tuple[str, str]] = set()
+        self._removed_members: Set[Tuple[str, str]] = set()
+
+    def __len__(self) -> int:
+        return len(self.clusters)
+
+    def __iter__(self):
+        return iter(self.clusters.values())
+
+    def load(self, cluster_rows: Iterable[Dict], member_rows: Iterable[Dict]) -> None:
+        """Rebuild from MatchDatabase.load_clusters rows (nothing is marked dirty)."""
+        for row in cluster_rows:
+            canonical = {
+                "event": row["canonical_event"],
+                "description": row["canonical_description"] or "",
+                "source": row["exchange"],
+                "market_id": row["market_id"],
+            }
+            self.clusters[row["id"]] = EventCluster(row["id"], canonical)
+            self._next_id = max(self._next_id, row["id"] + 1)
+        for row in member_rows:
+            cluster = self.clusters.get(row["cluster_id"])
+            if cluster is None:
+                continue
+            exchange, mid = row["exchange"], row["market_id"]
+            item = {
+                "event": row["event"] or "",
+                "description": row["description"] or "",
+                "source": exchange,
+                "market_id": mid,
+            }
+            members = cluster.members.setdefault(exchange, {})
+            members[mid] = (item, row["confidence"] or 0.0, row["text_key"] or "")
+            self._member_of[(exchange, mid)] = cluster.id
+
+    def cluster_of(self, exchange: str, market_id: str) -> Optional[EventCluster]:
+        cluster_id = self._member_of.get((exchange, market_id))
+        return self.clusters.get(cluster_id) if cluster_id is not None else None
+
+    def text_key(self, exchange: str, market_id: str) -> Optional[str]:
+        cluster = self.cluster_of(exchange, market_id)
+        if cluster is None:
+            return None
+        return cluster.members[exchange][market_id][2]
+
+    def confidence(self, exchange: str, market_id: str) -> float:
+        cluster = self.cluster_of(exchange, market_id)
+        return cluster.members[exchange][market_id][1] if cluster is not None else 0.0
+
+    def found(self, exchange: str, market_id: str, item: Dict, text_key: str) -> EventCluster:
+        """Start a new cluster with this market as its canonical member."""
+        cluster = EventCluster(self._next_id, item)
+        self._next_id += 1
+        self.clusters[cluster.id] = cluster
+        self._dirty_clusters.add(cluster.id)
+        self.join(cluster, exchange, market_id, item, 1.0, text_key)
+        return cluster
+
+    def join(
+        self,
+        cluster: EventCluster,
+        exchange: str,
+        market_id: str,
+        item: Dict,
+        confidence: float,
+        text_key: str,
+    ) -> None:
+        cluster.members.setdefault(exchange, {})[market_id] = (item, confidence, text_key)
+        self._member_of[(exchange, market_id)] = cluster.id
+        self._dirty_members.add((exchange, market_id))
+        self._removed_members.discard((exchange, market_id))
+
+    def refresh(self, exchange: str, market_id: str, item: Dict) -> None:
+        """Replace a member's stored item with this cycle's listing (same text, so nothing
+        to save); items loaded from the database lack the outcome fields."""
+        cluster = self.cluster_of(exchange, market_id)
+        if cluster is not None:
+            _, confidence, text_key = cluster.members[exchange][market_id]
+            cluster.members[exchange][market_id] = (item, confidence, text_key)
+
+    def detach(self, exchange: str, market_id: str) -> None:
+        """Take a market out of its cluster (its text changed); empty clusters go away."""
+        cluster_id = self._member_of.pop((exchange, market_id), None)
+        cluster = self.clusters.get(cluster_id) if cluster_id is not None else None
+        if cluster is None:
+            return
+        members = cluster.members.get(exchange, {})
+        members.pop(market_id, None)
+        if not members:
+            cluster.members.pop(exchange, None)
+        if not cluster.members:
+            del self.clusters[cluster.id]
+        self._dirty_members.discard((exchange, market_id))
+        self._removed_members.add((exchange, market_id))
+
+    def open_for(self, exchange: str) -> List[EventCluster]:
+        """Clusters that no market of ``exchange`` belongs to yet."""
+        return [cluster for cluster in self.clusters.values() if exchange not in cluster.members]
+
+    def prune(self, live: Set[Tuple[str, str]]) -> int:
+        """Drop clusters none of whose markets is listed anymore (kept in the database).
+        Returns how many were dropped."""
+        dead = [
+            cluster
+            for cluster in self.clusters.values()
+            if not any(
+                (exchange, mid) in live
+                for exchange, markets in cluster.members.items()
+                for mid in markets
+            )
+        ]
+        for cluster in dead:
+            for exchange, markets in cluster.members.items():
+                for mid in markets:
+                    self._member_of.pop((exchange, mid), None)
+            del self.clusters[cluster.id]
+        return len(dead)
+
+    def sides(
+        self, exchange_a: str, exchange_b: str, cluster_ids: Optional[Iterable[int]] = None
+    ) -> List[Tuple[int, List[Tuple[Dict, float]], List[Tuple[Dict, float]]]]:
+        """(cluster_id, [(item_a, confidence)], [(item_b, confidence)]) for the given
+        clusters (all by default) that have markets of both exchanges."""
+        if cluster_ids is None:
+            clusters: Iterable[EventCluster] = self.clusters.values()
+        else:
+            clusters = [self.clusters[c] for c in sorted(set(cluster_ids)) if c in self.clusters]
+        sides = []
+        for cluster in clusters:
+            side_a, side_b = (
+                [(item, conf) for item, conf, _ in cluster.members.get(exchange, {}).values()]
+                for exchange in (exchange_a, exchange_b)
+            )
+            if side_a and side_b:
+                sides.append((cluster.id, side_a, side_b))
+        return sides
+
+    def changes(self) -> Tuple[List[Tuple], List[Tuple], List[Tuple[str, str]]]:
+        """Rows for MatchDatabase.save_clusters, then forget them:
+        (id, exchange, market_id, event, description) of new clusters,
+        (exchange, market_id, cluster_id, event, description, text_key, confidence) of new
+        memberships
+        and (exchange, market_id) of removed ones."""
+        cluster_rows = []
+        for cluster_id in sorted(self._dirty_clusters):
+            cluster = self.clusters.get(cluster_id)
+            if cluster is None:
+                continue
+            canonical = cluster.canonical
+            cluster_rows.append(
+                (
+                    cluster.id,
+                    canonical.get("source", ""),
+                    canonical.get("market_id", ""),
+                    canonical.get("event", ""),
+                    canonical.get("description", ""),
+                )
+            )
+        member_rows = []
+        for exchange, mid in sorted(self._dirty_members):
+            cluster = self.cluster_of(exchange, mid)
+            if cluster is None:
+                continue
+            item, confidence, text_key = cluster.members[exchange][mid]
+            member_rows.append(
+                (
+                    exchange,
+                    mid,
+                    cluster.id,
+                    item.get("event", ""),
+                    item.get("description", ""),
+                    text_key,
+                    confidence,
+                )
+            )
+        removed = sorted(self._removed_members)
+        self._dirty_clusters.clear()
+        self._dirty_members.clear()
+        self._removed_members.clear()
+        return cluster_rows, member_rows, removed
+
+    def summary(self) -> Dict[str, int]:
+        """Cluster count and how many clusters span 1, 2, ... exchanges."""
+        spans: Dict[str, int] = {}
+        for cluster in self.clusters.values():
+            width = str(len(cluster.members))
+            spans[width] = spans.get(width, 0) + 1
+        return {"clusters": len(self.clusters), **{f"span_{k}": v for k, v in spans.items()}}
@@ -1,22 +1,98 @@
+import hashlib
 import json
+import math
 import re
 import subprocess
-from typing import Dict, List, Set, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
+import numpy as np
 import requests
 
 from config import (
     AUTO_ACCEPT_THRESHOLD,
     AUTO_REJECT_THRESHOLD,
+    CANDIDATE_FILTER,
+    CHECKPOINT_PATH,
+    CROSS_ENCODER_MODEL,
+    CROSS_ENCODER_RERANK,
+    DEDUPLICATE_TEXTS,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_CHUNK_SIZE,
+    EMBEDDING_QUANTIZATION,
+    EMBEDDING_THREADS,
+    HIERARCHICAL_MATCHING,
+    INCREMENTAL_MATCHING,
     JACCARD_MIN_FOR_AUTO_ACCEPT,
     MIN_SIMILARITY,
     OLLAMA_CLI,
     OLLAMA_MODEL,
-    OLLAMA_URL,
+    OLLAMA_REQUESTS_PER_HOST,
+    OLLAMA_TIMEOUT_SECONDS,
+    RERANK_ACCEPT_THRESHOLD,
+    RERANK_BATCH_SIZE,
+    RERANK_REJECT_THRESHOLD,
+    SEARCH_BATCH_SIZE,
     TOP_K_CANDIDATES,
+    VECTOR_BACKEND,
+    VERIFICATION_MODE,
+    VERIFY_WAIT_SECONDS,
 )
+from database import MatchDatabase
 from logger import error_logger
-from matcher.retrieval import Retriever
+from matcher.clusters import ClusterIndex
+from matcher.ollama_pool import OllamaPool
+from matcher.rerank import CrossEncoderReranker
+from matcher.retrieval import (
+    RetrievalResult,
+    Retriever,
+    _default_text_builder,
+    embedding_cache_key,
+)
+from matcher.retrieval import warm_up as warm_up_retrieval
+from metrics import metrics
+
+CANDIDATE_FILTERS = ("none", "mutual", "reciprocal_rank")
+VERIFICATION_MODES = ("inline", "queue")
+MATCHING_MODES = ("pairs", "clusters")
+
+
+def _text_key(item: Dict) -> str:
+    text = f"{item.get('event', '')} {item.get('description', '')}"
+    return hashlib.sha1(" ".join(text.lower().split()).encode("utf-8")).hexdigest()
+
+
+def market_id(item: Dict) -> str:
+    """Stable per-exchange id of a normalized item (Polymarket slug / Kalshi ticker)."""
+    return item.get("market_id") or item.get("ticker") or item.get("url", "").split("/")[-1]
+
+
+def snapshot_rows(items: List[Dict]) -> List[Tuple[str, str, Optional[str]]]:
+    """(market_id, content_hash, close_time) rows for MatchDatabase.upsert_markets."""
+    rows = []
+    for item in items:
+        digest = hashlib.sha1(f"{_text_key(item)}|{item.get('close_time') or ''}".encode("utf-8"))
+        rows.append((market_id(item), digest.hexdigest(), item.get("close_time")))
+    return rows
+
+
+def _group_by_text(items: List[Dict]) -> Tuple[List[Dict], List[List[int]]]:
+    """Collapse items with identical normalized text. Returns (representatives, members)."""
+    reps: List[Dict] = []
+    groups: List[List[int]] = []
+    slot_by_key: Dict[str, int] = {}
+    for i, item in enumerate(items):
+        key = _text_key(item)
+        slot = slot_by_key.get(key)
+        if slot is None:
+            slot_by_key[key] = len(reps)
+            reps.append(item)
+            groups.append([i])
+        else:
+            groups[slot].append(i)
+    return reps, groups
 
 
 def _normalize_poly_item(raw: Dict) -> Dict:
@@ -29,11 +105,17 @@ def _normalize_poly_item(raw: Dict) -> Dict:
 
     desc = raw.get("description", "")
     slug = raw.get("slug") or raw.get("url", "").split("/")[-1]
+    events = raw.get("events") or [{}]
     return {
         "event": title or "",
         "description": desc or "",
         "source": raw.get("source", "Polymarket"),
         "url": f"https://polymarket.com/event/{slug}" if slug else raw.get("url", ""),
+        "market_id": slug or "",
+        "close_time": events[0].get("end_date") or raw.get("close_time"),
+        "event_id": str(events[0].get("id") or ""),
+        "event_title": events[0].get("title") or raw.get("question") or "",
+        "outcome": raw.get("group_item_title") or "",
     }
 
 
@@ -49,32 +131,301 @@ def _normalize_kalshi_item(raw: Dict) -> Dict:
         "source": raw.get("source", "Kalshi"),
         "ticker": raw.get("ticker", ""),
         "url": f"https://kalshi.com/markets/{raw.get('ticker', '')}",
+        "market_id": raw.get("ticker", ""),
+        "close_time": raw.get("close_time"),
+        "event_id": raw.get("event_ticker") or "",
+        "event_title": title,
+        "outcome": raw.get("yes_sub_title") or "",
+        "strike_type": raw.get("strike_type"),
+        "floor_strike": raw.get("floor_strike"),
+        "cap_strike": raw.get("cap_strike"),
+    }
+
+
+_OUTCOME_NUMBER = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*([kmb]\b)?")
+_OUTCOME_ABOVE = re.compile(r"↑|>|\+|\b(?:above|over|more|higher|at least)\b")
+_OUTCOME_BELOW = re.compile(r"↓|<|\b(?:below|under|less|lower|at most)\b")
+_OUTCOME_SCALE = {"k": 1e3, "m": 1e6, "b": 1e9}
+_OUTCOME_STOPWORDS = {
+    "yes",
+    "no",
+    "the",
+    "or",
+    "and",
+    "of",
+    "to",
+    "by",
+    "at",
+    "least",
+    "most",
+    "above",
+    "below",
+    "over",
+    "under",
+    "more",
+    "less",
+    "than",
+    "between",
+    "higher",
+    "lower",
+}
+
+
+def outcome_strike(item: Dict) -> Optional[Tuple]:
+    """Structured outcome of a market inside a multi-market event: ("above", x),
+    ("below", x), ("between", low, high) or ("exact", x). Taken from Kalshi's strike
+    fields when present, else from the numbers in the outcome label, with the direction
+    from the label or, for a bare number ("108,000"), the event title; None without one."""
+    strike_type = item.get("strike_type")
+    try:
+        floor = float(item["floor_strike"]) if item.get("floor_strike") is not None else None
+        cap = float(item["cap_strike"]) if item.get("cap_strike") is not None else None
+    except (TypeError, ValueError):
+        floor = cap = None
+    if strike_type in ("greater", "greater_or_equal") and floor is not None:
+        return ("above", round(floor, 6))
+    if strike_type in ("less", "less_or_equal") and cap is not None:
+        return ("below", round(cap, 6))
+    if strike_type == "between" and floor is not None and cap is not None:
+        return ("between", round(floor, 6), round(cap, 6))
+
+    label = (item.get("outcome") or "").lower()
+    numbers = [
+        round(float(number.replace(",", "")) * _OUTCOME_SCALE.get(suffix, 1), 6)
+        for number, suffix in _OUTCOME_NUMBER.findall(label)
+    ]
+    if not numbers:
+        return None
+    if len(numbers) >= 2:
+        return ("between", min(numbers[:2]), max(numbers[:2]))
+    for text in (label, (item.get("event_title") or "").lower()):
+        above, below = _OUTCOME_ABOVE.search(text), _OUTCOME_BELOW.search(text)
+        if above and not below:
+            return ("above", numbers[0])
+        if below and not above:
+            return ("below", numbers[0])
+    return ("exact", numbers[0])
+
+
+def strikes_match(a: Tuple, b: Tuple) -> bool:
+    """Same outcome up to how the exchanges write it: Kalshi's "108,000 or above" has
+    floor_strike 107999.99, and a bare "exact" number fits either direction."""
+    kinds = {a[0], b[0]}
+    if len(kinds) > 1 and not ("exact" in kinds and kinds <= {"exact", "above", "below"}):
+        return False
+    if len(a) != len(b):
+        return False
+    return all(math.isclose(x, y, rel_tol=1e-4, abs_tol=0.011) for x, y in zip(a[1:], b[1:]))
+
+
+def outcome_name(item: Dict) -> frozenset:
+    """Word tokens of the outcome label (candidate, team, ...), without numbers."""
+    tokens = re.findall(r"[a-z]+", (item.get("outcome") or "").lower())
+    return frozenset(t for t in tokens if t not in _OUTCOME_STOPWORDS)
+
+
+def _group_by_event(items: List[Dict]) -> Tuple[List[Dict], List[List[int]]]:
+    """Group markets by event id. Returns (event items for retrieval, member indices)."""
+    events: List[Dict] = []
+    members: List[List[int]] = []
+    slot_by_id: Dict[str, int] = {}
+    for i, item in enumerate(items):
+        event_id = item.get("event_id") or f"market:{market_id(item)}"
+        slot = slot_by_id.get(event_id)
+        if slot is None:
+            slot_by_id[event_id] = len(events)
+            # Only the title: descriptions and rules are written per outcome market
+            title = item.get("event_title") or item.get("event", "")
+            events.append(
+                {
+                    "event": title,
+                    "description": "",
+                    "source": item.get("source", ""),
+                    "market_id": event_id,
+                    "close_time": item.get("close_time"),
+                }
+            )
+            members.append([i])
+        else:
+            members[slot].append(i)
+    return events, members
+
+
+def _match_outcomes(
+    poly_items: List[Dict], kalshi_items: List[Dict]
+) -> Tuple[List[Tuple[int, int]], List[int], List[int]]:
+    """Pair the markets of two matched events by structured outcome.
+
+    A market pairs with the single market on the other side that has a matching strike
+    (see strikes_match) or, failing strikes, an outcome name containing (or contained
+    in) its own. Returns (pairs, poly leftovers, kalshi leftovers); every market without
+    a unique structured counterpart is a leftover for the text comparison.
+    """
+    p_strikes = [outcome_strike(item) for item in poly_items]
+    k_strikes = [outcome_strike(item) for item in kalshi_items]
+    p_names = [outcome_name(item) for item in poly_items]
+    k_names = [outcome_name(item) for item in kalshi_items]
+    k_has_strikes = any(strike is not None for strike in k_strikes)
+
+    pairs: List[Tuple[int, int]] = []
+    used: Set[int] = set()
+    p_left: List[int] = []
+    for i in range(len(poly_items)):
+        name = p_names[i]
+        if p_strikes[i] is not None and k_has_strikes:
+            found = [
+                j
+                for j, strike in enumerate(k_strikes)
+                if strike is not None and strikes_match(strike, p_strikes[i])
+            ]
+        elif name:
+            # "Donald Trump" vs "Trump": one name contains the other
+            found = [
+                j for j, other in enumerate(k_names) if other and (name <= other or other <= name)
+            ]
+        else:
+            found = []
+        found = [j for j in found if j not in used]
+        if len(found) == 1:
+            pairs.append((i, found[0]))
+            used.add(found[0])
+        else:
+            p_left.append(i)  # missing, ambiguous or unstructured; the text comparison decides
+    k_left = [j for j in range(len(kalshi_items)) if j not in used]
+    return pairs, p_left, k_left
+
+
+def _outcome_view(item: Dict) -> Dict:
+    """The item with its outcome label appended to the title, so the markets of one
+    multi-outcome event get texts (and verdict keys) of their own."""
+    outcome = item.get("outcome") or ""
+    if not outcome or outcome.lower() in item.get("event", "").lower():
+        return item
+    return {**item, "event": f"{item.get('event', '')}: {outcome}"}
+
+
+def _normalize_generic_item(raw: Dict, exchange: str) -> Dict:
+    market = raw.get("ticker") or raw.get("slug") or raw.get("id") or ""
+    return {
+        "event": raw.get("title") or raw.get("question") or "",
+        "description": raw.get("description") or raw.get("rules_primary") or "",
+        "source": raw.get("source", exchange),
+        "url": raw.get("url", ""),
+        "market_id": str(market),
+        "close_time": raw.get("close_time"),
     }
 
 
+ITEM_NORMALIZERS = {
+    "Polymarket": _normalize_poly_item,
+    "Kalshi": _normalize_kalshi_item,
+}
+
+
+def normalize_item(raw: Dict, exchange: str) -> Dict:
+    """Normalized item of a raw market from any exchange (already normalized items pass)."""
+    if "event" in raw:
+        return raw
+    normalizer = ITEM_NORMALIZERS.get(exchange)
+    return normalizer(raw) if normalizer is not None else _normalize_generic_item(raw, exchange)
+
+
 class MarketMatcher:
     def __init__(
         self,
-        ollama_url: str = OLLAMA_URL,
+        ollama_url: Optional[str] = None,
         model: str = OLLAMA_MODEL,
         top_k: int = TOP_K_CANDIDATES,
         min_similarity: float = MIN_SIMILARITY,
         use_vector_retrieval: bool = True,
         greedy: bool = True,
+        embedding_quantization: str = EMBEDDING_QUANTIZATION,
+        vector_backend: str = VECTOR_BACKEND,
+        candidate_filter: str = CANDIDATE_FILTER,
+        dedup_texts: bool = DEDUPLICATE_TEXTS,
+        market_store: Optional[MatchDatabase] = None,
+        incremental: bool = INCREMENTAL_MATCHING,
+        embedder=None,
+        llm_timeout: float = OLLAMA_TIMEOUT_SECONDS,
+        cache_embeddings: bool = bool(CHECKPOINT_PATH),
+        ollama_pool: Optional[OllamaPool] = None,
+        verification_mode: str = VERIFICATION_MODE,
+        verify_wait_seconds: float = VERIFY_WAIT_SECONDS,
+        hierarchical: bool = HIERARCHICAL_MATCHING,
+        rerank: bool = CROSS_ENCODER_RERANK,
+        reranker: Optional[CrossEncoderReranker] = None,
+        llm_concurrency: Optional[int] = None,
     ):
-        self.ollama_url = ollama_url
+        if verification_mode not in VERIFICATION_MODES:
+            raise ValueError(
+                f"Unknown verification mode {verification_mode!r}; "
+                f"expected one of {VERIFICATION_MODES}"
+            )
+        if verification_mode == "queue" and market_store is None:
+            raise ValueError("verification_mode='queue' needs a market_store for the job queue")
+        # LLM hosts: an explicit pool (shareable between matchers), a single ollama_url,
+        # or OLLAMA_HOSTS from config
+        if ollama_pool is None:
+            ollama_pool = OllamaPool([ollama_url]) if ollama_url else OllamaPool()
+        self.ollama_pool = ollama_pool
+        # Candidate pairs verified at once by the greedy pass, so added hosts add throughput
+        self.llm_concurrency = llm_concurrency or len(ollama_pool.hosts) * OLLAMA_REQUESTS_PER_HOST
         self.model = model
         self.top_k = top_k
         self.min_similarity = min_similarity
         self.use_vector_retrieval = use_vector_retrieval
         self.greedy = greedy
+        self.embedding_quantization = embedding_quantization
+        self.vector_backend = vector_backend if use_vector_retrieval else "tokens"
+        self.candidate_filter = candidate_filter
+        self.dedup_texts = dedup_texts
+        # Incremental mode needs the snapshot store to know what changed since last cycle
+        self.market_store = market_store
+        self.incremental = incremental and market_store is not None
+        # Events first, then markets inside matched event pairs (find_matches)
+        self.hierarchical = hierarchical
+        # Text-hash -> vector cache; needed by incremental mode and persisted by checkpoints
+        self._embedding_cache: Optional[Dict[str, np.ndarray]] = (
+            {} if self.incremental or cache_embeddings else None
+        )
+        self._embedding_signature: Optional[str] = None
+        self._restored_embeddings: Optional[Tuple[str, Dict[str, np.ndarray]]] = None
+        # "<poly text key>|<kalshi text key>" -> (confidence, reason) of answered LLM calls;
+        # a pair is only re-asked once either market's text changes
+        self._verdicts: Dict[str, Tuple[float, str]] = {}
+        # Queue mode: verifier workers answer candidate pairs through market_store
+        self.verification_mode = verification_mode
+        self.verify_wait_seconds = verify_wait_seconds
+        self._failed_verifications: Set[str] = set()
+        # Cross-encoder between the filters and the LLM (model loaded on first use); its
+        # scores are kept per text pair like the verdicts
+        if reranker is None and rerank:
+            reranker = CrossEncoderReranker(
+                model_name=CROSS_ENCODER_MODEL, batch_size=RERANK_BATCH_SIZE
+            )
+        self.reranker = reranker
+        self._rerank_scores: Dict[str, float] = {}
+        # Canonical event clusters (match_clusters), loaded from market_store on first use
+        self.clusters: Optional[ClusterIndex] = None
+        # Sentence-embedding model shared by every Retriever (loaded on demand when None)
+        self.embedder = embedder
+        self.llm_timeout = llm_timeout
         self.llm_enabled = True
         self._llm_error_count = 0
         self._llm_error_limit = 3
-        self._last_llm_failed = False
+        # Pool re-admissions seen when the LLM was disabled; a later one re-enables it
+        self._llm_disabled_at = 0
+        self._llm_state_lock = threading.Lock()
+        # Whether the calling thread's last LLM call failed (see _last_llm_failed)
+        self._llm_call_state = threading.local()
+        self.embedding_batch_size = EMBEDDING_BATCH_SIZE
+        self.embedding_chunk_size = EMBEDDING_CHUNK_SIZE
+        self.search_batch_size = SEARCH_BATCH_SIZE
         self.auto_accept_threshold = AUTO_ACCEPT_THRESHOLD
         self.auto_reject_threshold = AUTO_REJECT_THRESHOLD
         self.jaccard_min_for_auto_accept = JACCARD_MIN_FOR_AUTO_ACCEPT
+        self.rerank_accept_threshold = RERANK_ACCEPT_THRESHOLD
+        self.rerank_reject_threshold = RERANK_REJECT_THRESHOLD
         self.ALIAS_MAP = {
             "btc": "bitcoin",
             "eth": "ethereum",
@@ -87,6 +438,38 @@ class MarketMatcher:
             "rate": "rates",
         }
 
+    @property
+    def _last_llm_failed(self) -> bool:
+        """Whether the last _verify_match_with_llm call on this thread got no usable
+        answer. Per thread, so concurrent verifications do not see each other's."""
+        return getattr(self._llm_call_state, "failed", False)
+
+    @_last_llm_failed.setter
+    def _last_llm_failed(self, failed: bool) -> None:
+        self._llm_call_state.failed = failed
+
+    def warm_up(self) -> Dict[str, float]:
+        """Load what the first retrieval needs (vector libraries, embedding model, and the
+        cross-encoder when reranking) now.
+
+        Meant to run in a background thread while the first fetch is in flight; a
+        Retriever created meanwhile waits for the model instead of loading its own.
+        """
+        timings = {} if self.embedder is not None else warm_up_retrieval(self.vector_backend)
+        if self.reranker is not None:
+            t0 = time.perf_counter()
+            try:
+                self.reranker.load()
+            except Exception:
+                pass  # reported by the first rerank
+            timings["cross_encoder_load"] = time.perf_counter() - t0
+        if timings:
+            steps = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
+            print(f"Warm-up done: {steps}")
+        for name, seconds in timings.items():
+            metrics.set_gauge("warmup_seconds", seconds, step=name)
+        return timings
+
     def _normalize_inputs(
         self, polymarket_data: List[Dict], kalshi_data: List[Dict]
     ) -> Tuple[List[Dict], List[Dict]]:
@@ -101,38 +484,198 @@ class MarketMatcher:
         ]
         return poly_norm, kalshi_norm
 
-    def find_matches(
-        self, polymarket_data: List[Dict], kalshi_data: List[Dict]
-    ) -> List[Tuple[Dict, Dict, float]]:
-        """
-        Retrieval + Field-based filtering + LLM verification pipeline.
-        Returns: List of (PolyDict, KalshiDict, Confidence)
+    def _build_candidates(
+        self,
+        forward: RetrievalResult,
+        reverse: Optional[RetrievalResult],
+        n_kalshi: int,
+        candidate_filter: str,
+    ) -> List[Tuple[float, int, int]]:
+        """Flatten retrieval results into (score, poly_idx, kalshi_idx), best first.
+
+        With a reverse (Kalshi -> Polymarket) result, "mutual" keeps only pairs that are
+        in each other's top-k and "reciprocal_rank" orders pairs by 1/rank_fwd + 1/rank_rev.
         """
-        poly_list, kalshi_list = self._normalize_inputs(polymarket_data, kalshi_data)
-        if not poly_list or not kalshi_list:
+        fwd_idx = np.asarray(forward.indices, dtype=np.int64).reshape(len(forward.indices), -1)
+        if fwd_idx.size == 0:
             return []
+        fwd_sim = np.asarray(forward.distances, dtype=np.float64).reshape(fwd_idx.shape)
+        n_poly, width = fwd_idx.shape
+        p_ids = np.repeat(np.arange(n_poly, dtype=np.int64), width)
+        k_ids = fwd_idx.ravel()
+        sims = fwd_sim.ravel()
+        fwd_rank = np.tile(np.arange(width), n_poly)
+        valid = k_ids != -1
+        priority = sims
+
+        if reverse is not None and candidate_filter != "none":
+            rev_idx = np.asarray(reverse.indices, dtype=np.int64).reshape(len(reverse.indices), -1)
+            rev_p = rev_idx.ravel()
+            rev_k = np.repeat(np.arange(rev_idx.shape[0], dtype=np.int64), rev_idx.shape[1])
+            rev_rank = np.tile(np.arange(rev_idx.shape[1]), rev_idx.shape[0])
+            rv = rev_p != -1
+            rev_codes = rev_p[rv] * n_kalshi + rev_k[rv]
+            rev_rank = rev_rank[rv]
+            order = np.argsort(rev_codes)
+            rev_codes, rev_rank = rev_codes[order], rev_rank[order]
+
+            codes = p_ids * n_kalshi + k_ids
+            pos = np.minimum(np.searchsorted(rev_codes, codes), max(len(rev_codes) - 1, 0))
+            found = valid & (rev_codes[pos] == codes) if len(rev_codes) else valid & False
+            if candidate_filter == "mutual":
+                kept = int(found.sum())
+                print(f"Mutual top-{width} filter kept {kept}/{int(valid.sum())} candidates.")
+                valid = found
+            else:
+                rr = np.where(found, 1.0 / (rev_rank[pos] + 1.0), 0.0) if len(rev_codes) else 0.0
+                priority = 1.0 / (fwd_rank + 1.0) + rr
+
+        order = np.lexsort((-sims[valid], -priority[valid]))
+        return list(
+            zip(
+                sims[valid][order].tolist(),
+                p_ids[valid][order].tolist(),
+                k_ids[valid][order].tolist(),
+            )
+        )
+
+    def _new_retriever(self) -> Retriever:
+        retriever = Retriever(
+            top_k=self.top_k,
+            quantization=self.embedding_quantization,
+            batch_size=self.embedding_batch_size,
+            chunk_size=self.embedding_chunk_size,
+            search_batch_size=self.search_batch_size,
+            num_threads=EMBEDDING_THREADS,
+            backend=self.vector_backend,
+            embedder=self.embedder,
+            embedding_cache=self._embedding_cache,
+        )
+        signature = retriever.embedding_signature()
+        if signature is not None:
+            self._embedding_signature = signature
+            self._merge_restored_embeddings(signature)
+        return retriever
 
-        retriever = Retriever(top_k=self.top_k)
-        retriever.index(kalshi_list)
-        retrieval = retriever.search(poly_list, k=self.top_k)
+    def _merge_restored_embeddings(self, signature: str) -> None:
+        """Adopt checkpointed vectors once the model in use is known to match them."""
+        if self._restored_embeddings is None or self._embedding_cache is None:
+            return
+        saved_signature, vectors = self._restored_embeddings
+        self._restored_embeddings = None
+        if saved_signature != signature:
+            print("Checkpointed embeddings are from another model; re-encoding")
+            return
+        for key, vec in vectors.items():
+            self._embedding_cache.setdefault(key, vec)
 
+    def checkpoint_state(self) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        """Embedding cache and verdict history for checkpoint.Checkpoint.save."""
+        state: Dict = {"verdicts": self._verdicts, "embedding_signature": None}
+        arrays: Dict[str, np.ndarray] = {}
+        if self._embedding_cache and self._embedding_signature:
+            keys = list(self._embedding_cache)
+            state["embedding_signature"] = self._embedding_signature
+            arrays["embedding_keys"] = np.array(keys)
+            arrays["embedding_vectors"] = np.stack([self._embedding_cache[k] for k in keys])
+        return state, arrays
+
+    def restore_checkpoint_state(self, state: Dict, arrays: Dict[str, np.ndarray]) -> None:
+        self._verdicts.update(
+            {key: (float(conf), str(reason)) for key, (conf, reason) in state["verdicts"].items()}
+        )
+        if state.get("embedding_signature") and "embedding_keys" in arrays:
+            vectors = dict(zip(arrays["embedding_keys"].tolist(), arrays["embedding_vectors"]))
+            # Merged into the cache by the first Retriever whose model matches
+            self._restored_embeddings = (state["embedding_signature"], vectors)
+
+    def _retrieve_candidates(
+        self, poly_list: List[Dict], kalshi_list: List[Dict], candidate_filter: str
+    ) -> List[Tuple[float, int, int]]:
+        retriever = self._new_retriever()
+        with metrics.stage("index", len(kalshi_list)):
+            retriever.index(kalshi_list)
+        with metrics.stage("search", len(poly_list)):
+            if candidate_filter == "none":
+                retrieval, reverse = retriever.search(poly_list, k=self.top_k), None
+            else:
+                retrieval, reverse = retriever.search_mutual(poly_list, k=self.top_k)
+        return self._build_candidates(retrieval, reverse, len(kalshi_list), candidate_filter)
+
+    def _retrieve_incremental_candidates(
+        self,
+        poly_list: List[Dict],
+        kalshi_list: List[Dict],
+        poly_changed: List[bool],
+        kalshi_changed: List[bool],
+    ) -> List[Tuple[float, int, int]]:
+        """Candidates involving at least one new/changed market.
+
+        New/changed Polymarket markets are searched against every Kalshi market;
+        new/changed Kalshi markets are searched against the unchanged Polymarket
+        markets. Pairs of two unchanged markets were already checked in an earlier cycle.
+        """
+        changed_p = [i for i, changed in enumerate(poly_changed) if changed]
+        unchanged_p = [i for i, changed in enumerate(poly_changed) if not changed]
+        changed_k = [i for i, changed in enumerate(kalshi_changed) if changed]
         candidates: List[Tuple[float, int, int]] = []
-        for p_idx in range(len(poly_list)):
-            for rank in range(self.top_k):
-                k_idx = retrieval.indices[p_idx][rank]
-                if k_idx != -1:
-                    candidates.append((float(retrieval.distances[p_idx][rank]), p_idx, int(k_idx)))
+
+        if changed_p:
+            retriever = self._new_retriever()
+            with metrics.stage("index", len(kalshi_list)):
+                retriever.index(kalshi_list)
+            with metrics.stage("search", len(changed_p)):
+                result = retriever.search([poly_list[i] for i in changed_p], k=self.top_k)
+            for row, p_idx in enumerate(changed_p):
+                for dist, k_idx in zip(result.distances[row], result.indices[row]):
+                    if k_idx != -1:
+                        candidates.append((float(dist), p_idx, int(k_idx)))
+
+        if changed_k and unchanged_p:
+            retriever = self._new_retriever()
+            with metrics.stage("index", len(unchanged_p)):
+                retriever.index([poly_list[i] for i in unchanged_p])
+            with metrics.stage("search", len(changed_k)):
+                result = retriever.search([kalshi_list[i] for i in changed_k], k=self.top_k)
+            for row, k_idx in enumerate(changed_k):
+                for dist, p_pos in zip(result.distances[row], result.indices[row]):
+                    if p_pos != -1:
+                        candidates.append((float(dist), unchanged_p[int(p_pos)], k_idx))
 
         candidates.sort(key=lambda x: x[0], reverse=True)
+        return candidates
+
+    def _select_matches(
+        self,
+        candidates: List[Tuple[float, int, int]],
+        poly_list: List[Dict],
+        kalshi_list: List[Dict],
+        pending_poly: Optional[Set[int]] = None,
+        unverified: Optional[Set[Tuple[int, int]]] = None,
+    ) -> List[Tuple[int, int, float]]:
+        """Greedy filter / auto-accept / LLM pass. Returns (poly_idx, kalshi_idx, confidence).
 
+        In queue mode, ``pending_poly`` collects the poly indices with a candidate still
+        waiting for a verdict. ``unverified`` collects the (poly_idx, kalshi_idx) candidates
+        left without a real verdict: still queued, or the LLM failed / is disabled and they
+        were only cheap-verified.
+        """
+        if self.reranker is not None:
+            self._rerank_candidates(candidates, poly_list, kalshi_list)
+        if self.verification_mode == "queue":
+            self._collect_queued_verdicts(candidates, poly_list, kalshi_list)
         seen_poly: set[int] = set()
         seen_kalshi: set[int] = set()
-        matches: List[Tuple[Dict, Dict, float]] = []
+        matches: List[Tuple[int, int, float]] = []
         saved_calls = 0
+        pending = 0
+        # verdict key -> (confidence, reason, failed) of LLM calls made ahead in a batch
+        answers: Dict[str, Tuple[float, str, bool]] = {}
 
-        for score, p_idx, k_idx in candidates:
+        for position, (score, p_idx, k_idx) in enumerate(candidates):
             if p_idx in seen_poly or k_idx in seen_kalshi:
                 saved_calls += 1
+                metrics.inc("llm_skipped_total", reason="already_matched")
                 continue
 
             poly_item = poly_list[p_idx]
@@ -140,31 +683,606 @@ class MarketMatcher:
 
             if not self._should_consider_match(poly_item, kalshi_item, score):
                 saved_calls += 1
+                metrics.inc("llm_skipped_total", reason="filtered")
                 continue
 
             if self._can_auto_accept(poly_item, kalshi_item, score):
-                matches.append((poly_item, kalshi_item, score))
+                matches.append((p_idx, k_idx, score))
                 seen_poly.add(p_idx)
                 seen_kalshi.add(k_idx)
                 saved_calls += 1
+                metrics.inc("llm_skipped_total", reason="auto_accept")
+                metrics.inc("auto_accepts_total")
                 continue
 
-            confidence, reason = self._verify_match_with_llm(poly_item, kalshi_item)
-            if (not self.llm_enabled or self._last_llm_failed) and confidence < 0.7:
-                f_conf, f_reason = self._cheap_verify(poly_item, kalshi_item, score)
-                if f_conf >= 0.7:
-                    confidence, reason = f_conf, f_reason
+            verdict_key = f"{_text_key(poly_item)}|{_text_key(kalshi_item)}"
+            cached = self._verdicts.get(verdict_key)
+            decision = (
+                self._rerank_decision(verdict_key, poly_item, kalshi_item)
+                if cached is None
+                else None
+            )
+            if decision is not None:
+                saved_calls += 1
+                if not decision:
+                    metrics.inc("llm_skipped_total", reason="rerank_reject")
+                    continue
+                metrics.inc("llm_skipped_total", reason="rerank_accept")
+                metrics.inc("rerank_accepts_total")
+                matches.append((p_idx, k_idx, self._rerank_scores[verdict_key]))
+                seen_poly.add(p_idx)
+                seen_kalshi.add(k_idx)
+                continue
+            if cached is not None:
+                confidence, reason = cached
+                saved_calls += 1
+                metrics.inc("llm_skipped_total", reason="verdict_history")
+            elif self.verification_mode == "queue":
+                if verdict_key not in self._failed_verifications:
+                    # Still with the verifier workers; decided in a later cycle
+                    pending += 1
+                    if pending_poly is not None:
+                        pending_poly.add(p_idx)
+                    if unverified is not None:
+                        unverified.add((p_idx, k_idx))
+                    metrics.inc("llm_skipped_total", reason="queued")
+                    continue
+                confidence, reason = self._cheap_verify(poly_item, kalshi_item, score)
+                if unverified is not None:
+                    unverified.add((p_idx, k_idx))
+            else:
+                if verdict_key not in answers:
+                    batch = self._llm_batch(
+                        candidates, position, poly_list, kalshi_list, seen_poly, seen_kalshi
+                    )
+                    batch = {key: pair for key, pair in batch.items() if key not in answers}
+                    answers.update(self._ask_llm_many(batch))
+                confidence, reason, failed = answers.pop(verdict_key)
+                if not failed:
+                    self._verdicts[verdict_key] = (confidence, reason)
+                elif unverified is not None:
+                    unverified.add((p_idx, k_idx))
+                if failed and confidence < 0.7:
+                    f_conf, f_reason = self._cheap_verify(poly_item, kalshi_item, score)
+                    if f_conf >= 0.7:
+                        confidence, reason = f_conf, f_reason
             print(reason)
             if confidence >= 0.7:
-                matches.append((poly_item, kalshi_item, confidence))
+                metrics.inc("llm_accepts_total")
+                matches.append((p_idx, k_idx, confidence))
                 seen_poly.add(p_idx)
                 seen_kalshi.add(k_idx)
 
         if saved_calls:
             print(f"Skipped {saved_calls} LLM calls via filtering.")
+        if pending:
+            print(f"{pending} candidate pairs still awaiting a verdict from the verifiers.")
+
+        return matches
+
+    def _llm_batch(
+        self,
+        candidates: List[Tuple[float, int, int]],
+        start: int,
+        poly_list: List[Dict],
+        kalshi_list: List[Dict],
+        seen_poly: Set[int],
+        seen_kalshi: Set[int],
+    ) -> Dict[str, Tuple[Dict, Dict]]:
+        """The LLM-bound candidate at ``start`` plus the next ones the greedy pass will
+        want a verdict for, up to llm_concurrency, so they can be asked together.
+
+        A candidate sharing a market with an earlier one in the batch is left for later:
+        it is only needed if that one is rejected.
+        """
+        batch: Dict[str, Tuple[Dict, Dict]] = {}
+        batch_poly: Set[int] = set()
+        batch_kalshi: Set[int] = set()
+        for score, p_idx, k_idx in candidates[start:]:
+            if len(batch) >= self.llm_concurrency:
+                break
+            if p_idx in seen_poly or p_idx in batch_poly:
+                continue
+            if k_idx in seen_kalshi or k_idx in batch_kalshi:
+                continue
+            poly_item, kalshi_item = poly_list[p_idx], kalshi_list[k_idx]
+            key = f"{_text_key(poly_item)}|{_text_key(kalshi_item)}"
+            if key in batch or key in self._verdicts:
+                continue
+            if not self._should_consider_match(poly_item, kalshi_item, score):
+                continue
+            if self._can_auto_accept(poly_item, kalshi_item, score, verbose=False):
+                continue
+            if self._rerank_decision(key, poly_item, kalshi_item) is not None:
+                continue
+            batch[key] = (poly_item, kalshi_item)
+            batch_poly.add(p_idx)
+            batch_kalshi.add(k_idx)
+        return batch
+
+    def _ask_llm(self, poly: Dict, kalshi: Dict) -> Tuple[float, str, bool]:
+        """One LLM verification: (confidence, reason, failed)."""
+        confidence, reason = self._verify_match_with_llm(poly, kalshi)
+        metrics.inc("llm_calls_total")
+        return confidence, reason, self._last_llm_failed
+
+    def _ask_llm_many(
+        self, batch: Dict[str, Tuple[Dict, Dict]]
+    ) -> Dict[str, Tuple[float, str, bool]]:
+        """Verify every pair of the batch, concurrently across the pool's hosts."""
+        if len(batch) <= 1:
+            return {key: self._ask_llm(*pair) for key, pair in batch.items()}
+        with ThreadPoolExecutor(max_workers=len(batch), thread_name_prefix="llm") as executor:
+            results = list(executor.map(lambda pair: self._ask_llm(*pair), batch.values()))
+        return dict(zip(batch, results))
+
+    def _rerank_candidates(
+        self,
+        candidates: List[Tuple[float, int, int]],
+        poly_list: List[Dict],
+        kalshi_list: List[Dict],
+    ) -> None:
+        """Cross-encoder scores for every candidate the LLM would otherwise see, in one
+        batched pass. A reranker that cannot load is dropped for good (LLM only)."""
+        pairs: Dict[str, Tuple[Dict, Dict]] = {}
+        for score, p_idx, k_idx in candidates:
+            poly_item, kalshi_item = poly_list[p_idx], kalshi_list[k_idx]
+            key = f"{_text_key(poly_item)}|{_text_key(kalshi_item)}"
+            if key in self._verdicts or key in self._rerank_scores or key in pairs:
+                continue
+            if not self._should_consider_match(poly_item, kalshi_item, score):
+                continue
+            if self._can_auto_accept(poly_item, kalshi_item, score, verbose=False):
+                continue
+            pairs[key] = (poly_item, kalshi_item)
+        if not pairs:
+            return
+
+        with metrics.stage("rerank", len(pairs)) as stage:
+            try:
+                scores = self.reranker.score(list(pairs.values()))
+            except Exception as e:
+                error_logger.log_error(e, context="cross-encoder rerank", stage="rerank")
+                print(f"Cross-encoder unavailable ({e}); verifying with the LLM only")
+                self.reranker = None
+                return
+            self._rerank_scores.update(zip(pairs, (float(s) for s in scores)))
+            uncertain = sum(
+                self.rerank_reject_threshold <= s < self.rerank_accept_threshold for s in scores
+            )
+            stage.items_out = uncertain
+        metrics.inc("rerank_pairs_total", len(pairs))
+        print(f"Cross-encoder: {len(pairs)} pairs scored, {uncertain} left for the LLM")
+
+    def _rerank_decision(self, key: str, poly: Dict, kalshi: Dict) -> Optional[bool]:
+        """True / False when the cross-encoder score settles the pair, None otherwise.
+
+        Paraphrase cross-encoders barely notice numbers ("above 100k" vs "above 110k"), so
+        a high score only accepts when the titles' numbers and word overlap agree as well;
+        otherwise the LLM decides."""
+        if self.reranker is None:
+            return None
+        score = self._rerank_scores.get(key)
+        if score is None or self.rerank_reject_threshold <= score < self.rerank_accept_threshold:
+            return None
+        if score < self.rerank_reject_threshold:
+            return False
+        p_txt = f"{poly.get('event', '')} {poly.get('description', '')}"
+        k_txt = f"{kalshi.get('event', '')} {kalshi.get('description', '')}"
+        if self._calculate_jaccard(p_txt, k_txt) < self.jaccard_min_for_auto_accept:
+            return None
+        if not self._numbers_agree(poly, kalshi):
+            return None
+        return True
+
+    def _collect_queued_verdicts(
+        self,
+        candidates: List[Tuple[float, int, int]],
+        poly_list: List[Dict],
+        kalshi_list: List[Dict],
+    ) -> None:
+        """Queue mode: hand every candidate that would need the LLM to the verification
+        queue, wait up to verify_wait_seconds for the workers, and load the verdicts into
+        the verdict history used by the greedy pass.
+
+        Unlike inline mode this also queues pairs the greedy pass may end up skipping
+        (because one side was matched first), trading some extra LLM calls for letting
+        the workers answer them all in parallel.
+        """
+        jobs: Dict[str, Tuple[str, Dict, Dict, float]] = {}
+        for score, p_idx, k_idx in candidates:
+            poly_item, kalshi_item = poly_list[p_idx], kalshi_list[k_idx]
+            key = f"{_text_key(poly_item)}|{_text_key(kalshi_item)}"
+            if key in self._verdicts or key in jobs:
+                continue
+            if self._rerank_decision(key, poly_item, kalshi_item) is not None:
+                continue
+            if not self._should_consider_match(poly_item, kalshi_item, score):
+                continue
+            if self._can_auto_accept(poly_item, kalshi_item, score, verbose=False):
+                continue
+            jobs[key] = (key, poly_item, kalshi_item, score)
+        if not jobs:
+            return
+
+        store = self.market_store
+        results = store.verification_results(list(jobs))
+        queued = store.enqueue_verifications(
+            [job for key, job in jobs.items() if results.get(key, ("",))[0] != "done"]
+        )
+        metrics.inc("verification_jobs_queued_total", queued)
+        waiting = [key for key in jobs if results.get(key, ("",))[0] != "done"]
+        print(f"Verification queue: {len(jobs) - len(waiting)} answered, {len(waiting)} waiting")
+        deadline = time.monotonic() + self.verify_wait_seconds
+        while waiting:
+            finished = store.verification_results(waiting)
+            results.update(finished)
+            waiting = [key for key in waiting if key not in finished]
+            if not waiting or time.monotonic() >= deadline:
+                break
+            time.sleep(min(1.0, max(0.0, deadline - time.monotonic())))
+
+        self._failed_verifications = set()
+        for key, (status, confidence, reason) in results.items():
+            if status == "done":
+                self._verdicts[key] = (confidence, reason)
+            else:
+                self._failed_verifications.add(key)
+
+    def find_matches(
+        self,
+        polymarket_data: List[Dict],
+        kalshi_data: List[Dict],
+        candidate_filter: Optional[str] = None,
+    ) -> List[Tuple[Dict, Dict, float]]:
+        """
+        Retrieval + Field-based filtering + LLM verification pipeline.
+        candidate_filter overrides the instance setting ("none", "mutual", "reciprocal_rank").
+        Returns: List of (PolyDict, KalshiDict, Confidence)
+        """
+        candidate_filter = candidate_filter or self.candidate_filter
+        if candidate_filter not in CANDIDATE_FILTERS:
+            raise ValueError(
+                f"Unknown candidate filter {candidate_filter!r}; "
+                f"expected one of {CANDIDATE_FILTERS}"
+            )
+        with metrics.stage("normalize", len(polymarket_data) + len(kalshi_data)) as stage:
+            poly_list, kalshi_list = self._normalize_inputs(polymarket_data, kalshi_data)
+            stage.items_out = len(poly_list) + len(kalshi_list)
+        if not poly_list or not kalshi_list:
+            return []
+        if self.hierarchical:
+            return self._find_event_matches(poly_list, kalshi_list)
+
+        if self.incremental:
+            poly_rows = snapshot_rows(poly_list)
+            kalshi_rows = snapshot_rows(kalshi_list)
+            poly_new = self.market_store.changed_markets("Polymarket", poly_rows)
+            kalshi_new = self.market_store.changed_markets("Kalshi", kalshi_rows)
+            print(
+                f"Incremental: {len(poly_new)}/{len(poly_list)} Polymarket and "
+                f"{len(kalshi_new)}/{len(kalshi_list)} Kalshi markets new or changed"
+            )
+
+        # Markets sharing a retrieval text (e.g. every outcome of a multi-outcome Polymarket
+        # event) are retrieved and verified once; see the fan-out below.
+        if self.dedup_texts:
+            with metrics.stage("dedup", len(poly_list) + len(kalshi_list)) as stage:
+                poly_reps, poly_groups = _group_by_text(poly_list)
+                kalshi_reps, kalshi_groups = _group_by_text(kalshi_list)
+                stage.items_out = len(poly_reps) + len(kalshi_reps)
+            print(
+                f"Deduplicated texts: Polymarket {len(poly_list)} -> {len(poly_reps)}, "
+                f"Kalshi {len(kalshi_list)} -> {len(kalshi_reps)}"
+            )
+        else:
+            poly_reps, poly_groups = poly_list, [[i] for i in range(len(poly_list))]
+            kalshi_reps, kalshi_groups = kalshi_list, [[i] for i in range(len(kalshi_list))]
+
+        with metrics.stage("retrieval", len(poly_reps) + len(kalshi_reps)) as stage:
+            if self.incremental:
+                # Mutual / reciprocal-rank filtering needs the full query set, so it only
+                # applies to full cycles.
+                candidates = self._retrieve_incremental_candidates(
+                    poly_reps,
+                    kalshi_reps,
+                    [any(market_id(poly_list[i]) in poly_new for i in g) for g in poly_groups],
+                    [
+                        any(market_id(kalshi_list[i]) in kalshi_new for i in g)
+                        for g in kalshi_groups
+                    ],
+                )
+            else:
+                candidates = self._retrieve_candidates(poly_reps, kalshi_reps, candidate_filter)
+            stage.items_out = len(candidates)
+        unverified: Set[Tuple[int, int]] = set()
+        with metrics.stage("verify", len(candidates)) as stage:
+            rep_matches = self._select_matches(
+                candidates, poly_reps, kalshi_reps, unverified=unverified
+            )
+            stage.items_out = len(rep_matches)
+
+        matches: List[Tuple[Dict, Dict, float]] = []
+        live_poly: List[Dict] = list(poly_reps)
+        live_kalshi: List[Dict] = list(kalshi_reps)
+        for p_rep, k_rep, conf in rep_matches:
+            p_items = [poly_list[i] for i in poly_groups[p_rep]]
+            k_items = [kalshi_list[i] for i in kalshi_groups[k_rep]]
+            if len(p_items) == 1 or len(k_items) == 1:
+                # Repeated listings of one market: the verdict holds for each of them
+                matches.extend((p, k, conf) for p in p_items for k in k_items)
+                continue
+            # Several outcomes behind one text on both sides: pair them one-to-one
+            pairs, _, p_views, k_views = self._pair_members(p_items, k_items, conf)
+            matches.extend(pairs)
+            live_poly.extend(p_views)
+            live_kalshi.extend(k_views)
+
+        if self.incremental:
+            # Only record the snapshot once the cycle's candidates have been checked. Markets
+            # with a candidate still lacking a verdict stay "new", so the next cycle
+            # retrieves them again and applies the verdict once it exists.
+            held_poly = {market_id(poly_list[i]) for p, _ in unverified for i in poly_groups[p]}
+            held_kalshi = {
+                market_id(kalshi_list[i]) for _, k in unverified for i in kalshi_groups[k]
+            }
+            self.market_store.upsert_markets(
+                "Polymarket", [row for row in poly_rows if row[0] not in held_poly]
+            )
+            self.market_store.upsert_markets(
+                "Kalshi", [row for row in kalshi_rows if row[0] not in held_kalshi]
+            )
+        self._prune_caches(live_poly, live_kalshi)
+        return matches
 
+    def _pair_members(
+        self, p_items: List[Dict], k_items: List[Dict], confidence: float
+    ) -> Tuple[List[Tuple[Dict, Dict, float]], int, List[Dict], List[Dict]]:
+        """Pair the markets behind one verified pair of groups (an event pair, or several
+        outcomes sharing a text) one-to-one.
+
+        Markets are paired by structured outcome (_match_outcomes) at ``confidence``; the
+        rest go through retrieval + verification of their outcome-specific texts. Returns
+        (matches, structured pair count, poly texts verified, kalshi texts verified).
+        """
+        pairs, p_left, k_left = _match_outcomes(p_items, k_items)
+        matches = [(p_items[i], k_items[j], confidence) for i, j in pairs]
+        if not p_left or not k_left:
+            return matches, len(pairs), [], []
+        p_rest = [p_items[i] for i in p_left]
+        k_rest = [k_items[j] for j in k_left]
+        p_views = [_outcome_view(item) for item in p_rest]
+        k_views = [_outcome_view(item) for item in k_rest]
+        inner = self._retrieve_candidates(p_views, k_views, "none")
+        for p_idx, k_idx, conf in self._select_matches(inner, p_views, k_views):
+            matches.append((p_rest[p_idx], k_rest[k_idx], conf))
+        return matches, len(pairs), p_views, k_views
+
+    def _find_event_matches(
+        self, poly_list: List[Dict], kalshi_list: List[Dict]
+    ) -> List[Tuple[Dict, Dict, float]]:
+        """Two-level matching: events against events, then markets inside event pairs.
+
+        Markets are grouped by event (Polymarket event id / Kalshi event ticker; a market
+        without one is its own event). Event titles go through retrieval and the usual
+        verification, so a 30-outcome election costs one event comparison instead of 30
+        market searches. Inside a matched event pair markets are paired by structured
+        outcome (equal strikes, or outcome names where one contains the other) at the
+        event pair's confidence. Only markets whose outcome settles nothing go through
+        retrieval + verification against the other event's remaining markets.
+        """
+        poly_events, poly_members = _group_by_event(poly_list)
+        kalshi_events, kalshi_members = _group_by_event(kalshi_list)
+        print(
+            f"Events: Polymarket {len(poly_list)} markets in {len(poly_events)} events, "
+            f"Kalshi {len(kalshi_list)} markets in {len(kalshi_events)} events"
+        )
+        with metrics.stage("event_retrieval", len(poly_events) + len(kalshi_events)) as stage:
+            candidates = self._retrieve_candidates(
+                poly_events, kalshi_events, self.candidate_filter
+            )
+            stage.items_out = len(candidates)
+        with metrics.stage("event_verify", len(candidates)) as stage:
+            event_pairs = self._select_matches(candidates, poly_events, kalshi_events)
+            stage.items_out = len(event_pairs)
+
+        matches: List[Tuple[Dict, Dict, float]] = []
+        live_poly: List[Dict] = list(poly_events)
+        live_kalshi: List[Dict] = list(kalshi_events)
+        structured = 0
+        with metrics.stage("outcome_match", len(event_pairs)) as stage:
+            for p_event, k_event, event_conf in event_pairs:
+                p_items = [poly_list[i] for i in poly_members[p_event]]
+                k_items = [kalshi_list[i] for i in kalshi_members[k_event]]
+                if len(p_items) == 1 and len(k_items) == 1:
+                    # Single-market events: the event verdict is the market verdict
+                    matches.append((p_items[0], k_items[0], event_conf))
+                    continue
+                pairs, paired, p_views, k_views = self._pair_members(p_items, k_items, event_conf)
+                structured += paired
+                matches.extend(pairs)
+                live_poly.extend(p_views)
+                live_kalshi.extend(k_views)
+            stage.items_out = len(matches)
+        metrics.inc("llm_skipped_total", structured, reason="structured_outcome")
+        print(
+            f"Matched {len(event_pairs)} event pairs -> {len(matches)} market pairs "
+            f"({structured} by outcome / strike)"
+        )
+        self._prune_caches(live_poly, live_kalshi)
         return matches
 
+    def _cluster_index(self) -> ClusterIndex:
+        if self.clusters is None:
+            self.clusters = ClusterIndex()
+            if self.market_store is not None:
+                self.clusters.load(*self.market_store.load_clusters())
+                if self.clusters:
+                    print(f"Loaded {len(self.clusters)} event clusters")
+        return self.clusters
+
+    def match_clusters(
+        self, markets_by_exchange: Dict[str, List[Dict]]
+    ) -> List[Tuple[int, str, Dict, float]]:
+        """Assign the markets of any number of exchanges to canonical event clusters.
+
+        Exchanges are processed in order. A market already in a cluster with the same
+        text keeps it. The others are searched against the canonical texts of the
+        clusters that have no market from their exchange yet, verified like pairs in
+        find_matches, and join the best cluster or found a new one. Each market is
+        compared with the clusters once, so work grows with the number of markets, not
+        with the number of exchange pairs. Cluster changes are saved to market_store.
+
+        Returns this cycle's new memberships as (cluster_id, exchange, item, confidence),
+        not counting markets that founded a cluster.
+        """
+        clusters = self._cluster_index()
+        joined: List[Tuple[int, str, Dict, float]] = []
+        live_reps: List[Dict] = []
+        live: Set[Tuple[str, str]] = set()
+        founded = 0
+        for exchange, raw_markets in markets_by_exchange.items():
+            with metrics.stage("normalize", len(raw_markets)) as stage:
+                items = [normalize_item(raw, exchange) for raw in raw_markets]
+                stage.items_out = len(items)
+            if self.dedup_texts:
+                reps, groups = _group_by_text(items)
+            else:
+                reps, groups = items, [[i] for i in range(len(items))]
+            live_reps.extend(reps)
+
+            # Markets whose text is already placed keep (or share) that cluster
+            new_reps: List[Dict] = []
+            new_groups: List[List[int]] = []
+            for rep, group in zip(reps, groups):
+                key = _text_key(rep)
+                home, home_conf, unplaced = None, 0.0, []
+                for i in group:
+                    mid = market_id(items[i])
+                    live.add((exchange, mid))
+                    if clusters.text_key(exchange, mid) == key:
+                        clusters.refresh(exchange, mid, items[i])
+                        home = clusters.cluster_of(exchange, mid)
+                        home_conf = clusters.confidence(exchange, mid)
+                        continue
+                    if clusters.cluster_of(exchange, mid) is not None:
+                        clusters.detach(exchange, mid)
+                    unplaced.append(i)
+                if home is not None:
+                    for i in unplaced:
+                        clusters.join(home, exchange, market_id(items[i]), items[i], home_conf, key)
+                        joined.append((home.id, exchange, items[i], home_conf))
+                elif unplaced:
+                    new_reps.append(rep)
+                    new_groups.append(unplaced)
+            if not new_reps:
+                continue
+
+            # Each open cluster is represented by every distinct text of its members
+            open_clusters = clusters.open_for(exchange)
+            entries: List[Dict] = []
+            owners: List[int] = []
+            for c, cluster in enumerate(open_clusters):
+                for item in cluster.texts():
+                    entries.append(item)
+                    owners.append(c)
+            rep_matches: List[Tuple[int, int, float]] = []
+            pending: Set[int] = set()
+            if entries:
+                with metrics.stage("retrieval", len(new_reps) + len(entries)) as stage:
+                    candidates = self._retrieve_candidates(new_reps, entries, self.candidate_filter)
+                    # Keep each (market, cluster) candidate once, via its most similar text
+                    best: Dict[Tuple[int, int], int] = {}
+                    candidates = [
+                        (score, g, e)
+                        for score, g, e in candidates
+                        if best.setdefault((g, owners[e]), e) == e
+                    ]
+                    stage.items_out = len(candidates)
+                with metrics.stage("verify", len(candidates)) as stage:
+                    rep_matches = self._select_matches(candidates, new_reps, entries, pending)
+                    stage.items_out = len(rep_matches)
+
+            matched: Set[int] = set()
+            taken: Set[int] = set()
+            for g, e, conf in rep_matches:
+                if owners[e] in taken:
+                    continue  # one text per exchange and cluster; the other founds its own
+                matched.add(g)
+                taken.add(owners[e])
+                cluster = open_clusters[owners[e]]
+                for i in new_groups[g]:
+                    clusters.join(
+                        cluster, exchange, market_id(items[i]), items[i], conf, _text_key(items[i])
+                    )
+                    joined.append((cluster.id, exchange, items[i], conf))
+            for g, group in enumerate(new_groups):
+                # Queued pairs wait for their verdict instead of founding a duplicate cluster
+                if g in matched or g in pending:
+                    continue
+                first = items[group[0]]
+                cluster = clusters.found(exchange, market_id(first), first, _text_key(first))
+                for i in group[1:]:
+                    clusters.join(
+                        cluster, exchange, market_id(items[i]), items[i], 1.0, _text_key(items[i])
+                    )
+                founded += 1
+            print(
+                f"{exchange}: {len(new_reps)}/{len(reps)} texts to place, "
+                f"{len(matched)} joined a cluster, {len(pending)} awaiting a verdict"
+            )
+
+        dropped = clusters.prune(live)
+        print(
+            f"Event clusters: {len(clusters)} live ({founded} new, {dropped} no longer listed), "
+            f"{len(joined)} markets joined"
+        )
+        for name, value in clusters.summary().items():
+            metrics.set_gauge("event_clusters", value, kind=name)
+        if self.market_store is not None:
+            self.market_store.save_clusters(*clusters.changes())
+        self._prune_caches(live_reps, [item for cluster in clusters for item in cluster.texts()])
+        return joined
+
+    def cluster_pairs(
+        self, exchange_a: str, exchange_b: str, cluster_ids: Optional[Iterable[int]] = None
+    ) -> List[Tuple[Dict, Dict, float, int]]:
+        """(item_a, item_b, confidence, cluster_id) for the markets of two exchanges inside
+        the given clusters (all by default), paired as find_matches pairs two text groups:
+        every combination when one side has a single market, else one-to-one by outcome
+        (_pair_members). Confidence is the weakest of the two memberships and the verdict."""
+        pairs: List[Tuple[Dict, Dict, float, int]] = []
+        for cluster_id, side_a, side_b in self._cluster_index().sides(
+            exchange_a, exchange_b, cluster_ids
+        ):
+            weight = {id(item): conf for item, conf in side_a + side_b}
+            a_items = [item for item, _ in side_a]
+            b_items = [item for item, _ in side_b]
+            if len(a_items) == 1 or len(b_items) == 1:
+                matched = [(a, b, 1.0) for a in a_items for b in b_items]
+            else:
+                matched, _, _, _ = self._pair_members(a_items, b_items, 1.0)
+            pairs.extend(
+                (a, b, min(conf, weight[id(a)], weight[id(b)]), cluster_id)
+                for a, b, conf in matched
+            )
+        return pairs
+
+    def _prune_caches(self, poly_reps: List[Dict], kalshi_reps: List[Dict]) -> None:
+        """Forget vectors, verdicts and rerank scores of texts that are no longer listed."""
+        if self._embedding_cache is not None:
+            live = {embedding_cache_key(_default_text_builder(it)) for it in poly_reps}
+            live.update(embedding_cache_key(_default_text_builder(it)) for it in kalshi_reps)
+            for key in self._embedding_cache.keys() - live:
+                del self._embedding_cache[key]
+        poly_keys = {_text_key(it) for it in poly_reps}
+        kalshi_keys = {_text_key(it) for it in kalshi_reps}
+        for cache in (self._verdicts, self._rerank_scores):
+            for key in list(cache):
+                poly_key, kalshi_key = key.split("|")
+                if poly_key not in poly_keys or kalshi_key not in kalshi_keys:
+                    del cache[key]
+
     def _should_consider_match(self, poly: Dict, kalshi: Dict, score: float) -> bool:
         """Fast field-based filtering to reject obvious non-matches."""
         if score < self.auto_reject_threshold:
@@ -195,7 +1313,9 @@ class MarketMatcher:
 
         return True
 
-    def _can_auto_accept(self, poly: Dict, kalshi: Dict, score: float) -> bool:
+    def _can_auto_accept(
+        self, poly: Dict, kalshi: Dict, score: float, verbose: bool = True
+    ) -> bool:
         """Check if match is strong enough to accept without LLM."""
         if score < self.auto_accept_threshold:
             return False
@@ -205,6 +1325,8 @@ class MarketMatcher:
         jacc = self._calculate_jaccard(p_txt, k_txt)
 
         if jacc >= self.jaccard_min_for_auto_accept:
+            if not verbose:
+                return True
             print(
                 f"Auto-accept: {poly.get('event','')[:50]} (Score: {score:.2f}, Jacc: {jacc:.2f})"
             )
@@ -212,24 +1334,33 @@ class MarketMatcher:
 
         return False
 
+    def verify_pair(self, poly: Dict, kalshi: Dict) -> Optional[Tuple[float, str]]:
+        """LLM verdict (confidence, reason) for one normalized pair, None if no LLM
+        endpoint gave a usable answer. Used by the verifier workers."""
+        confidence, reason, failed = self._ask_llm(poly, kalshi)
+        return None if failed else (confidence, reason)
+
     def _verify_match_with_llm(self, poly: Dict, kalshi: Dict) -> Tuple[float, str]:
         """
         Ask Ollama if these two markets represent the same event.
         """
-        if not self.llm_enabled:
+        if not self._llm_available():
             self._last_llm_failed = True
             return 0.0, "LLM disabled"
+        pair = f"{market_id(poly)}|{market_id(kalshi)}"
         poly_text = f"Title: {poly.get('event','')}\nDescription: {poly.get('description', 'N/A')}"
         kalshi_text = f"Title: {kalshi.get('event','')}\nRules: {kalshi.get('description', 'N/A')}"
+        poly_source = poly.get("source") or "Polymarket"
+        kalshi_source = kalshi.get("source") or "Kalshi"
 
         user_prompt = f"""
         Compare these two prediction market events. Your goal is to determine if they
         are the EXACT SAME betting market.
 
-        === Market A (Polymarket) ===
+        === Market A ({poly_source}) ===
         {poly_text}
 
-        === Market B (Kalshi) ===
+        === Market B ({kalshi_source}) ===
         {kalshi_text}
 
         CRITERIA FOR MATCH:
@@ -268,11 +1399,11 @@ class MarketMatcher:
                 "format": "json",
                 "stream": False,
             }
-            chat_resp = requests.post(
-                f"{self.ollama_url}/v1/generate", json=chat_payload, timeout=60
-            )
-
-            chat_resp.raise_for_status()
+            with self.ollama_pool.request() as host:
+                chat_resp = requests.post(
+                    f"{host.url}/v1/generate", json=chat_payload, timeout=self.llm_timeout
+                )
+                chat_resp.raise_for_status()
             chat_data = chat_resp.json()
 
             content_str = (
@@ -292,7 +1423,9 @@ class MarketMatcher:
             return 0.0, reason
         except Exception as e1:
             # Try generate endpoint as fallback
-            error_logger.log_error(e1, context="LLM verification (/api/chat)")
+            error_logger.log_error(
+                e1, context="LLM verification (/api/chat)", stage="verify", pair=pair
+            )
             try:
                 gen_payload = {
                     "model": self.model,
@@ -300,10 +1433,11 @@ class MarketMatcher:
                     "format": "json",
                     "stream": False,
                 }
-                gen_resp = requests.post(
-                    f"{self.ollama_url}/v1/generate", json=gen_payload, timeout=60
-                )
-                gen_resp.raise_for_status()
+                with self.ollama_pool.request() as host:
+                    gen_resp = requests.post(
+                        f"{host.url}/v1/generate", json=gen_payload, timeout=self.llm_timeout
+                    )
+                    gen_resp.raise_for_status()
                 gen_data = gen_resp.json()
                 content_str = gen_data.get("response", "")
                 content = self._parse_llm_json(content_str)
@@ -318,7 +1452,9 @@ class MarketMatcher:
                     return confidence, reason
                 return 0.0, reason
             except Exception as e2:
-                error_logger.log_error(e2, context="LLM verification (/api/generate)")
+                error_logger.log_error(
+                    e2, context="LLM verification (/api/generate)", stage="verify", pair=pair
+                )
                 try:
                     oai_payload = {
                         "model": self.model,
@@ -327,14 +1463,17 @@ class MarketMatcher:
                             {"role": "user", "content": user_prompt},
                         ],
                     }
-                    oai_resp = requests.post(
-                        f"{self.ollama_url}/v1/generate",
-                        json=oai_payload,
-                        timeout=60,
-                    )
-                    if oai_resp.status_code == 404:
-                        raise RuntimeError("/v1/chat/completions not found; trying /v1/completions")
-                    oai_resp.raise_for_status()
+                    with self.ollama_pool.request() as host:
+                        oai_resp = requests.post(
+                            f"{host.url}/v1/generate",
+                            json=oai_payload,
+                            timeout=self.llm_timeout,
+                        )
+                        if oai_resp.status_code == 404:
+                            raise RuntimeError(
+                                "/v1/chat/completions not found; trying /v1/completions"
+                            )
+                        oai_resp.raise_for_status()
                     oai_data = oai_resp.json()
                     msg = (oai_data.get("choices") or [{}])[0].get("message") or {}
                     content_str = msg.get("content", "")
@@ -350,18 +1489,24 @@ class MarketMatcher:
                         return confidence, reason
                     return 0.0, reason
                 except Exception as e3:
-                    error_logger.log_error(e3, context="LLM verification (/v1/chat/completions)")
+                    error_logger.log_error(
+                        e3,
+                        context="LLM verification (/v1/chat/completions)",
+                        stage="verify",
+                        pair=pair,
+                    )
                     try:
                         comp_payload = {
                             "model": self.model,
                             "prompt": f"{system_prompt}\n\n{user_prompt}",
                         }
-                        comp_resp = requests.post(
-                            f"{self.ollama_url}/v1/completions",
-                            json=comp_payload,
-                            timeout=60,
-                        )
-                        comp_resp.raise_for_status()
+                        with self.ollama_pool.request() as host:
+                            comp_resp = requests.post(
+                                f"{host.url}/v1/completions",
+                                json=comp_payload,
+                                timeout=self.llm_timeout,
+                            )
+                            comp_resp.raise_for_status()
                         comp_data = comp_resp.json()
                         content_str = comp_data.get("choices", [{}])[0].get("text", "")
                         content = self._parse_llm_json(content_str)
@@ -376,7 +1521,12 @@ class MarketMatcher:
                             return confidence, reason
                         return 0.0, reason
                     except Exception as e4:
-                        error_logger.log_error(e4, context="LLM verification (/v1/completions)")
+                        error_logger.log_error(
+                            e4,
+                            context="LLM verification (/v1/completions)",
+                            stage="verify",
+                            pair=pair,
+                        )
                         try:
                             base_prompt = (
                                 "You are a strict JSON judge. Respond ONLY with a JSON object."
@@ -387,7 +1537,7 @@ class MarketMatcher:
                                 input=full_prompt.encode("utf-8"),
                                 stdout=subprocess.PIPE,
                                 stderr=subprocess.PIPE,
-                                timeout=60,
+                                timeout=self.llm_timeout,
                                 check=True,
                             )
                             out = proc.stdout.decode("utf-8", errors="ignore")
@@ -400,17 +1550,41 @@ class MarketMatcher:
                                 return confidence, reason
                             return 0.0, reason
                         except Exception as e5:
-                            error_logger.log_error(e5, context="LLM verification (ollama CLI)")
-                            self._llm_error_count += 1
+                            error_logger.log_error(
+                                e5,
+                                context="LLM verification (ollama CLI)",
+                                stage="verify",
+                                pair=pair,
+                            )
                             self._last_llm_failed = True
-                            if self._llm_error_count >= self._llm_error_limit:
+                            with self._llm_state_lock:
+                                self._llm_error_count += 1
+                                disable = (
+                                    self.llm_enabled
+                                    and self._llm_error_count >= self._llm_error_limit
+                                )
+                                if disable:
+                                    self.llm_enabled = False
+                                    self._llm_disabled_at = self.ollama_pool.readmissions
+                            if disable:
                                 print(
                                     "LLM repeatedly failing (>=3 errors). "
-                                    "Disabling LLM for this run."
+                                    "Disabling LLM until a host is re-admitted."
                                 )
-                                self.llm_enabled = False
                             return 0.0, "Error verifying match with LLM"
 
+    def _llm_available(self) -> bool:
+        """False while the LLM is disabled after repeated errors. It comes back once the
+        pool re-admits an ejected host (its prober got an answer again)."""
+        if self.llm_enabled:
+            return True
+        with self._llm_state_lock:
+            if not self.llm_enabled and self.ollama_pool.readmissions > self._llm_disabled_at:
+                self.llm_enabled = True
+                self._llm_error_count = 0
+                print("LLM host re-admitted; re-enabling LLM verification")
+        return self.llm_enabled
+
     def _parse_llm_json(self, text: str) -> Dict:
         try:
             return json.loads(text)
@@ -522,6 +1696,19 @@ class MarketMatcher:
 
         return 0.0, f"Fallback rejected (jacc={jacc:.2f}, sim={sim_score:.2f})"
 
+    def _extract_numbers(self, text: str) -> Set[float]:
+        return {
+            round(float(number.replace(",", "")) * _OUTCOME_SCALE.get(suffix, 1), 6)
+            for number, suffix in _OUTCOME_NUMBER.findall(text.lower())
+        }
+
+    def _numbers_agree(self, poly: Dict, kalshi: Dict) -> bool:
+        """False when both titles carry numbers (thresholds, dates, years) and neither
+        title's numbers are all found in the other's."""
+        p_nums = self._extract_numbers(poly.get("event", ""))
+        k_nums = self._extract_numbers(kalshi.get("event", ""))
+        return not p_nums or not k_nums or p_nums <= k_nums or k_nums <= p_nums
+
     def _extract_years(self, text: str) -> Set[str]:
         return set(re.findall(r"\b(20\d{2})\b", text))
 
@@ -0,0 +1,116 @@
+# numpy_index.py
+from __future__ import annotations
+
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+
+class NumpyFlatIndex:
+    """Exact inner-product index in pure NumPy, used when faiss is not installed.
+
+    Mirrors the small part of the faiss index API the Retriever relies on
+    (``is_trained``/``train``/``add``/``search``/``ntotal``/``code_size``/``reconstruct_n``).
+    Search is a blocked matmul against the stored vectors with an ``argpartition``
+    top-k per block, so peak memory is ``n_queries * block_size`` scores plus
+    ``decode_rows`` float32 rows decoded from float16 / int8 codes at a time.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        quantization: str = "float32",
+        block_size: int = 65536,
+        decode_rows: int = 4096,
+    ):
+        self.d = dimension
+        self.quantization = quantization
+        self.block_size = block_size
+        self.decode_rows = decode_rows
+        self.ntotal = 0
+        self.code_size = dimension * {"float32": 4, "float16": 2, "int8": 1}[quantization]
+        self.is_trained = quantization != "int8"
+        self._chunks: List[np.ndarray] = []
+        self._offsets: List[int] = []  # first vector id of each chunk
+        self._vmin: np.ndarray | None = None
+        self._scale: np.ndarray | None = None
+
+    def train(self, vecs: np.ndarray) -> None:
+        # Per-dimension min/max scalar quantizer (same scheme as faiss QT_8bit)
+        self._vmin = vecs.min(axis=0).astype(np.float32)
+        span = vecs.max(axis=0).astype(np.float32) - self._vmin
+        self._scale = np.where(span > 0, span / 255.0, 1.0).astype(np.float32)
+        self.is_trained = True
+
+    def add(self, vecs: np.ndarray) -> None:
+        if self.quantization == "float16":
+            codes = vecs.astype(np.float16)
+        elif self.quantization == "int8":
+            codes = np.clip(np.rint((vecs - self._vmin) / self._scale), 0, 255).astype(np.uint8)
+        else:
+            codes = np.array(vecs, dtype=np.float32)
+        self._chunks.append(codes)
+        self._offsets.append(self.ntotal)
+        self.ntotal += len(codes)
+
+    def _iter_blocks(self) -> Iterator[Tuple[int, np.ndarray]]:
+        offset = 0
+        for chunk in self._chunks:
+            for start in range(0, len(chunk), self.block_size):
+                yield offset + start, chunk[start : start + self.block_size]
+            offset += len(chunk)
+
+    def _scores(self, queries: np.ndarray, block: np.ndarray) -> np.ndarray:
+        """(n_queries, block_len) inner products against one stored block."""
+        if self.quantization == "float32":
+            return queries @ block.T
+        if self.quantization == "int8":
+            # q . (vmin + scale * code) = q . vmin + (q * scale) . code
+            bias = (queries @ self._vmin)[:, None]
+            queries = queries * self._scale
+        scores = np.empty((len(queries), len(block)), dtype=np.float32)
+        # Decode a few rows at a time instead of a float32 copy of the whole block
+        for start in range(0, len(block), self.decode_rows):
+            rows = block[start : start + self.decode_rows].astype(np.float32)
+            scores[:, start : start + len(rows)] = queries @ rows.T
+        if self.quantization == "int8":
+            scores += bias
+        return scores
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        nq = len(queries)
+        best_d = np.full((nq, k), -np.inf, dtype=np.float32)
+        best_i = np.full((nq, k), -1, dtype=np.int64)
+        for offset, block in self._iter_blocks():
+            scores = self._scores(queries, block)
+            kb = min(k, block.shape[0])
+            if kb < block.shape[0]:
+                top = np.argpartition(-scores, kb - 1, axis=1)[:, :kb]
+            else:
+                top = np.broadcast_to(np.arange(kb), (nq, kb))
+            cand_d = np.concatenate([best_d, np.take_along_axis(scores, top, axis=1)], axis=1)
+            cand_i = np.concatenate([best_i, top + offset], axis=1)
+            keep = np.argpartition(-cand_d, k - 1, axis=1)[:, :k]
+            best_d = np.take_along_axis(cand_d, keep, axis=1)
+            best_i = np.take_along_axis(cand_i, keep, axis=1)
+
+        order = np.argsort(-best_d, axis=1, kind="stable")
+        best_d = np.take_along_axis(best_d, order, axis=1)
+        best_i = np.take_along_axis(best_i, order, axis=1)
+        best_d[best_i == -1] = 0.0
+        return best_d, best_i
+
+    def reconstruct_n(self, start: int, n: int) -> np.ndarray:
+        # Slice only the chunks overlapping [start, start + n) instead of joining them all
+        end = min(start + n, self.ntotal)
+        parts = [
+            chunk[max(start - offset, 0) : end - offset]
+            for offset, chunk in zip(self._offsets, self._chunks)
+            if offset < end and offset + len(chunk) > start
+        ]
+        if not parts:
+            return np.zeros((0, self.d), dtype=np.float32)
+        codes = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        if self.quantization == "int8":
+            return self._vmin + codes.astype(np.float32) * self._scale
+        return codes.astype(np.float32)
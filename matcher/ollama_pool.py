@@ -0,0 +1,207 @@
+# ollama_pool.py
+from __future__ import annotations
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import requests
+
+from config import (
+    OLLAMA_EJECT_AFTER_FAILURES,
+    OLLAMA_HOSTS,
+    OLLAMA_PROBE_INTERVAL_SECONDS,
+    OLLAMA_TIMEOUT_SECONDS,
+)
+from metrics import metrics
+
+
+class OllamaHost:
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.in_flight = 0
+        self.latency: Optional[float] = None  # EWMA of response time, seconds
+        self.failures = 0  # consecutive
+        self.healthy = True
+        self.requests = 0
+        self.errors = 0
+
+    def summary(self) -> Dict:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "in_flight": self.in_flight,
+            "latency": round(self.latency, 3) if self.latency is not None else None,
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
+
+def _is_host_failure(error: BaseException) -> bool:
+    """Connection errors, timeouts and 5xx mean the host is in trouble; a 4xx or a bad
+    payload is about the request and says nothing about the host's health."""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code >= 500
+    return False
+
+
+class OllamaPool:
+    """Balances LLM requests across inference hosts.
+
+    Each request goes to the healthy host with the lowest expected wait, estimated as
+    latency EWMA x (in-flight + 1). Hosts without a measurement yet are assumed as fast
+    as the fastest one, so they get tried soon without being flooded, and hosts whose
+    last request failed are passed over while any other host is fine. A failure counts
+    as ``failure_penalty`` seconds of latency; ``eject_after`` consecutive failures
+    eject the host. A background thread probes ejected and recently failed hosts every
+    ``probe_interval`` seconds and re-admits them once they answer. With every host
+    ejected, requests still go to the least loaded one rather than failing outright.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str] = OLLAMA_HOSTS,
+        eject_after: int = OLLAMA_EJECT_AFTER_FAILURES,
+        probe_interval: float = OLLAMA_PROBE_INTERVAL_SECONDS,
+        probe_timeout: float = 5.0,
+        failure_penalty: float = OLLAMA_TIMEOUT_SECONDS,
+        alpha: float = 0.3,
+    ):
+        if not urls:
+            raise ValueError("OllamaPool needs at least one host")
+        self.hosts: List[OllamaHost] = [OllamaHost(url) for url in urls]
+        self.eject_after = eject_after
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.failure_penalty = failure_penalty
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        # Ejected hosts brought back by the prober so far (callers watch it to recover)
+        self.readmissions = 0
+        self._prober: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        for host in self.hosts:
+            self._export(host)
+
+    def _expected_wait(self, host: OllamaHost, default: float) -> float:
+        latency = host.latency if host.latency is not None else default
+        return latency * (host.in_flight + 1)
+
+    def acquire(self) -> OllamaHost:
+        """Pick a host and count the request as in flight (pair with ``release``)."""
+        with self._lock:
+            candidates = [h for h in self.hosts if h.healthy] or self.hosts
+            # A host that just failed is only used while every other host is failing too
+            fewest = min(h.failures for h in candidates)
+            candidates = [h for h in candidates if h.failures == fewest]
+            measured = [h.latency for h in self.hosts if h.latency is not None]
+            default = min(measured) if measured else 1.0
+            best = min(self._expected_wait(h, default) for h in candidates)
+            host = random.choice([h for h in candidates if self._expected_wait(h, default) == best])
+            host.in_flight += 1
+            host.requests += 1
+        metrics.set_gauge("llm_host_in_flight", host.in_flight, host=host.url)
+        metrics.inc("llm_host_requests_total", host=host.url)
+        return host
+
+    def release(self, host: OllamaHost, seconds: float, ok: bool) -> None:
+        ejected = False
+        with self._lock:
+            host.in_flight -= 1
+            sample = seconds if ok else max(seconds, self.failure_penalty)
+            if host.latency is None:
+                host.latency = sample
+            else:
+                host.latency += self.alpha * (sample - host.latency)
+            if ok:
+                host.failures = 0
+            else:
+                host.errors += 1
+                host.failures += 1
+                if host.healthy and host.failures >= self.eject_after:
+                    host.healthy = False
+                    ejected = True
+        if ejected:
+            self._on_eject(host, f"{host.failures} consecutive failures")
+        elif not ok:
+            self._start_prober()
+        self._export(host)
+
+    @contextmanager
+    def request(self) -> Iterator[OllamaHost]:
+        """``with pool.request() as host:`` - send one request to ``host.url``."""
+        host = self.acquire()
+        start = time.perf_counter()
+        ok = True
+        try:
+            yield host
+        except BaseException as e:
+            ok = not _is_host_failure(e)
+            raise
+        finally:
+            self.release(host, time.perf_counter() - start, ok)
+
+    def eject(self, host: OllamaHost, reason: str = "failed check") -> None:
+        with self._lock:
+            if not host.healthy:
+                return
+            host.healthy = False
+        self._on_eject(host, reason)
+        self._export(host)
+
+    def _on_eject(self, host: OllamaHost, reason: str) -> None:
+        print(f"LLM host {host.url} ejected ({reason})")
+        metrics.inc("llm_host_ejections_total", host=host.url)
+        self._start_prober()
+
+    def _start_prober(self) -> None:
+        with self._lock:
+            if self._prober is None:
+                self._prober = threading.Thread(
+                    target=self._probe_loop, name="ollama-probe", daemon=True
+                )
+                self._prober.start()
+
+    def probe(self, host: OllamaHost) -> bool:
+        """True if the host answers at all (any non-5xx status)."""
+        try:
+            resp = requests.get(f"{host.url}/api/tags", timeout=self.probe_timeout)
+            return resp.status_code < 500
+        except requests.RequestException:
+            return False
+
+    def _probe_loop(self) -> None:
+        while not self._stop.wait(self.probe_interval):
+            # Ejected hosts, and hosts passed over since their last request failed
+            for host in [h for h in self.hosts if not h.healthy or h.failures]:
+                if self.probe(host):
+                    with self._lock:
+                        readmitted = not host.healthy
+                        if readmitted:
+                            self.readmissions += 1
+                        host.healthy = True
+                        host.failures = 0
+                        # Old measurements predate the outage; start measuring afresh
+                        host.latency = None
+                    if readmitted:
+                        print(f"LLM host {host.url} re-admitted")
+                    self._export(host)
+
+    def _export(self, host: OllamaHost) -> None:
+        metrics.set_gauge("llm_host_healthy", int(host.healthy), host=host.url)
+        if host.latency is not None:
+            metrics.set_gauge("llm_host_latency_seconds", host.latency, host=host.url)
+
+    def healthy_count(self) -> int:
+        return sum(1 for h in self.hosts if h.healthy)
+
+    def summary(self) -> List[Dict]:
+        with self._lock:
+            return [host.summary() for host in self.hosts]
+
+    def close(self) -> None:
+        self._stop.set()
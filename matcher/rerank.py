@@ -0,0 +1,99 @@
+# rerank.py
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from matcher.retrieval import _default_text_builder
+
+CROSS_ENCODER_MODEL_CANDIDATES = [
+    "cross-encoder/quora-distilroberta-base",
+    "cross-encoder/stsb-distilroberta-base",
+]
+
+
+def load_cross_encoder(name: str = ""):
+    from sentence_transformers import CrossEncoder
+
+    last_err: Optional[Exception] = None
+    for candidate in [name] if name else CROSS_ENCODER_MODEL_CANDIDATES:
+        try:
+            return CrossEncoder(candidate, max_length=256, device="cpu")
+        except Exception as e:
+            last_err = e
+    raise last_err or RuntimeError("No cross-encoder model available")
+
+
+def outputs_probabilities(model) -> Optional[bool]:
+    """Whether ``model.predict`` already ends in a sigmoid / softmax (True) or returns raw
+    logits (False), from the CrossEncoder's activation; None when the model does not say."""
+    activation = getattr(model, "activation_fn", None)
+    if activation is None:
+        # sentence-transformers < 3.1
+        activation = getattr(model, "default_activation_function", None)
+    if activation is None:
+        return None
+    return type(activation).__name__ in ("Sigmoid", "Softmax")
+
+
+_shared_cross_encoder = None
+_shared_cross_encoder_lock = threading.Lock()
+
+
+def get_cross_encoder(name: str = ""):
+    """Process-wide cross-encoder, loaded once (failures are not cached)."""
+    global _shared_cross_encoder
+    with _shared_cross_encoder_lock:
+        if _shared_cross_encoder is None:
+            _shared_cross_encoder = load_cross_encoder(name)
+        return _shared_cross_encoder
+
+
+class CrossEncoderReranker:
+    """Scores (poly, kalshi) pairs jointly with a cross-encoder, in batches on the CPU.
+
+    Slower per pair than the bi-encoder retrieval but far cheaper than an LLM call, so
+    it sits between the two: pairs it is sure about skip the LLM.
+    """
+
+    def __init__(self, model=None, model_name: str = "", batch_size: int = 64):
+        # Loaded on the first score() call when not given (see get_cross_encoder)
+        self._model = model
+        self.model_name = model_name
+        self.batch_size = batch_size
+        # Decided once per model so every batch (and cached score) is on the same scale
+        self._apply_sigmoid: Optional[bool] = None
+        self.pairs_scored = 0
+        self.seconds = 0.0
+
+    def load(self):
+        if self._model is None:
+            self._model = get_cross_encoder(self.model_name)
+        return self._model
+
+    def score(self, pairs: Sequence[Tuple[Dict, Dict]]) -> np.ndarray:
+        """Match probability in [0, 1] for every (poly item, kalshi item) pair."""
+        if not pairs:
+            return np.zeros(0, dtype=np.float32)
+        model = self.load()
+        t0 = time.perf_counter()
+        texts: List[List[str]] = [
+            [_default_text_builder(poly), _default_text_builder(kalshi)] for poly, kalshi in pairs
+        ]
+        scores = np.asarray(
+            model.predict(texts, batch_size=self.batch_size, show_progress_bar=False),
+            dtype=np.float32,
+        ).reshape(-1)
+        if self._apply_sigmoid is None:
+            # Models without a sigmoid head return logits. Without an activation to read,
+            # the first batch decides: any value outside [0, 1] must be a logit.
+            probabilities = outputs_probabilities(model)
+            if probabilities is None:
+                probabilities = bool(scores.min() >= 0.0 and scores.max() <= 1.0)
+            self._apply_sigmoid = not probabilities
+        if self._apply_sigmoid:
+            scores = 1.0 / (1.0 + np.exp(-scores))
+        self.pairs_scored += len(pairs)
+        self.seconds += time.perf_counter() - t0
+        return scores
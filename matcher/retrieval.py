@@ -1,11 +1,19 @@
 # retrieval.py
 from __future__ import annotations
 
+import hashlib
 import math
 import re
+import threading
+import time
 from dataclasses import dataclass
 from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
+
+from matcher.numpy_index import NumpyFlatIndex
+from metrics import metrics
+
 
 def _default_text_builder(item: Dict) -> str:
     parts: List[str] = []
@@ -20,63 +28,255 @@ def _tokenize(text: str) -> List[str]:
     return re.findall(r"[a-z0-9]+", text.lower())
 
 
+def embedding_cache_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+QUANTIZATION_MODES = ("float32", "float16", "int8")
+VECTOR_BACKENDS = ("auto", "faiss", "numpy", "tokens")
+
+EMBEDDING_MODEL_CANDIDATES = [
+    "all-mpnet-base-v2",
+    "all-MiniLM-L6-v2",
+]
+
+
+def load_embedder():
+    from sentence_transformers import SentenceTransformer
+
+    last_err: Optional[Exception] = None
+    for name in EMBEDDING_MODEL_CANDIDATES:
+        try:
+            return SentenceTransformer(name)
+        except Exception as e:
+            last_err = e
+    raise last_err or RuntimeError("No embedding model available")
+
+
+_shared_embedder = None
+_shared_embedder_lock = threading.Lock()
+
+
+def get_embedder():
+    """Process-wide embedding model, loaded once.
+
+    Callers that arrive while another thread (e.g. ``warm_up``) is loading the model
+    wait for that load instead of starting a second one. Failures are not cached.
+    """
+    global _shared_embedder
+    with _shared_embedder_lock:
+        if _shared_embedder is None:
+            _shared_embedder = load_embedder()
+        return _shared_embedder
+
+
+def warm_up(backend: str = "auto") -> Dict[str, float]:
+    """Import the vector libraries and load the shared embedder ahead of the first search.
+
+    Returns seconds spent per step; a missing library is skipped, as Retriever would.
+    """
+    timings: Dict[str, float] = {}
+    if backend == "tokens":
+        return timings
+    if backend in ("auto", "faiss"):
+        t0 = time.perf_counter()
+        try:
+            import faiss  # noqa: F401
+        except ImportError:
+            pass
+        timings["faiss_import"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    try:
+        get_embedder()
+    except Exception:
+        pass
+    timings["embedder_load"] = time.perf_counter() - t0
+    return timings
+
+
+def set_num_threads(num_threads: int) -> None:
+    """Cap torch / faiss / BLAS thread pools. Each library is optional."""
+    if num_threads <= 0:
+        return
+    try:
+        import torch
+
+        torch.set_num_threads(num_threads)
+    except Exception:
+        pass
+    try:
+        import faiss
+
+        faiss.omp_set_num_threads(num_threads)
+    except Exception:
+        pass
+    try:
+        from threadpoolctl import threadpool_limits
+
+        threadpool_limits(limits=num_threads)
+    except Exception:
+        pass
+
+
 @dataclass
 class RetrievalResult:
     distances: List[List[float]]
     indices: List[List[int]]
 
 
+@dataclass
+class EncodeStats:
+    texts: int = 0
+    seconds: float = 0.0
+    cache_hits: int = 0
+
+    @property
+    def texts_per_sec(self) -> float:
+        return self.texts / self.seconds if self.seconds > 0 else 0.0
+
+
 class Retriever:
     def __init__(
         self,
         text_builder: Callable[[Dict], str] | None = None,
         top_k: int = 5,
+        quantization: str = "float32",
+        embedder=None,
+        batch_size: int = 64,
+        chunk_size: int = 4096,
+        search_batch_size: int = 1024,
+        num_threads: int = 0,
+        backend: str = "auto",
+        embedding_cache: Optional[Dict[str, np.ndarray]] = None,
     ) -> None:
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(
+                f"Unknown quantization {quantization!r}; expected one of {QUANTIZATION_MODES}"
+            )
+        if backend not in VECTOR_BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}; expected one of {VECTOR_BACKENDS}")
         self.text_builder = text_builder or _default_text_builder
         self.top_k = top_k
+        self.quantization = quantization
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.search_batch_size = search_batch_size
+        self.last_encode_stats = EncodeStats()
+        # Optional text-hash -> normalized vector cache shared across Retrievers, so
+        # unchanged markets are not re-encoded every cycle (see MarketMatcher incremental mode)
+        self.embedding_cache = embedding_cache
 
         self._embedder = None
         self._faiss = None
-        self._faiss_index = None
+        self._vector_index = None
         self._dimension = None
         self._use_embeddings = False
+        self.backend = "tokens"
 
-        try:
-            import faiss
-            from sentence_transformers import SentenceTransformer
-            
-            model_candidates = [
-                "all-mpnet-base-v2",
-                "all-MiniLM-L6-v2",
-            ]
-            last_err: Optional[Exception] = None
-            for name in model_candidates:
-                try:
-                    self._embedder = SentenceTransformer(name)
-                    break
-                except Exception as e:
-                    last_err = e
-                    self._embedder = None
-            if self._embedder is None and last_err:
-                raise last_err
-
-            self._faiss = faiss
-            self._use_embeddings = True
-        except Exception:
-            self._use_embeddings = False
+        # "auto" prefers faiss and falls back to the NumPy index when only
+        # sentence-transformers is installed; anything missing drops to token search.
+        if backend != "tokens":
+            try:
+                if backend in ("auto", "faiss"):
+                    try:
+                        import faiss
+
+                        self._faiss = faiss
+                    except ImportError:
+                        if backend == "faiss":
+                            raise
+                self._embedder = embedder if embedder is not None else get_embedder()
+                self._use_embeddings = True
+                self.backend = "faiss" if self._faiss is not None else "numpy"
+                set_num_threads(num_threads)
+            except Exception:
+                self._embedder = None
+                self._faiss = None
+                self._use_embeddings = False
 
+        self._corpus_items: Sequence[Dict] = []
         self._inv_index: Dict[str, List[int]] = {}
         self._tok_docs: List[Dict[str, int]] = []
         self._doc_norms: List[float] = []
 
+    def embedding_signature(self) -> Optional[str]:
+        """Identifies the embedding model, so persisted vectors are only reused with it."""
+        if self._embedder is None:
+            return None
+        embedder = self._embedder
+        name = getattr(getattr(embedder, "tokenizer", None), "name_or_path", "")
+        dimension = getattr(embedder, "get_sentence_embedding_dimension", lambda: None)()
+        return f"{type(embedder).__name__}:{name}:{dimension}"
+
+    def _new_vector_index(self, dimension: int):
+        if self._faiss is None:
+            return NumpyFlatIndex(dimension, self.quantization)
+        faiss = self._faiss
+        if self.quantization == "float32":
+            return faiss.IndexFlatIP(dimension)
+        # Scalar quantizers store one fp16 / uint8 code per dimension instead of a float32
+        qtype = (
+            faiss.ScalarQuantizer.QT_fp16
+            if self.quantization == "float16"
+            else faiss.ScalarQuantizer.QT_8bit
+        )
+        return faiss.IndexScalarQuantizer(dimension, qtype, faiss.METRIC_INNER_PRODUCT)
+
+    def _encode_texts(self, texts: Sequence[str]) -> np.ndarray:
+        t0 = time.perf_counter()
+        vecs = self._embedder.encode(
+            list(texts),
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        self.last_encode_stats.texts += len(texts)
+        self.last_encode_stats.seconds += time.perf_counter() - t0
+        vecs = np.asarray(vecs, dtype=np.float32)
+        norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+        vecs /= np.maximum(norms, 1e-12)
+        return vecs
+
+    def _encode(self, texts: Sequence[str]) -> np.ndarray:
+        cache = self.embedding_cache
+        if cache is None or not texts:
+            return self._encode_texts(texts)
+        keys = [embedding_cache_key(t) for t in texts]
+        missing = [i for i, key in enumerate(keys) if key not in cache]
+        if missing:
+            # Cached copies are stored at the index precision to keep the cache small
+            dtype = np.float32 if self.quantization == "float32" else np.float16
+            for i, vec in zip(missing, self._encode_texts([texts[i] for i in missing])):
+                cache[keys[i]] = vec.astype(dtype)
+        self.last_encode_stats.cache_hits += len(texts) - len(missing)
+        return np.stack([cache[key] for key in keys]).astype(np.float32)
+
+    def _report_encode(self, label: str) -> None:
+        stats = self.last_encode_stats
+        cached = f", {stats.cache_hits:,} cached" if stats.cache_hits else ""
+        print(
+            f"  Encoded {stats.texts:,} {label} texts in {stats.seconds:.2f}s "
+            f"({stats.texts_per_sec:,.0f} texts/sec{cached})"
+        )
+        metrics.inc("embeddings_encoded_total", stats.texts, kind=label)
+        metrics.inc("embedding_cache_hits_total", stats.cache_hits, kind=label)
+        metrics.inc("embedding_encode_seconds_total", stats.seconds, kind=label)
+
     def _build_embedding_index(self, corpus_texts: Sequence[str]) -> None:
-        assert self._embedder is not None and self._faiss is not None
-        vecs = self._embedder.encode(list(corpus_texts))  # (N, d)
-        self._dimension = vecs.shape[1]
-        self._faiss.normalize_L2(vecs)
-        self._faiss_index = self._faiss.IndexFlatIP(self._dimension)
-        self._faiss_index.add(vecs)
-        self._corpus_vecs = vecs
+        assert self._embedder is not None
+        self.last_encode_stats = EncodeStats()
+        self._vector_index = None
+        # Encode and add in chunks so only one chunk of float32 vectors is alive at a time.
+        # The first chunk doubles as the int8 quantizer's training sample.
+        for start in range(0, len(corpus_texts), self.chunk_size):
+            vecs = self._encode(corpus_texts[start : start + self.chunk_size])  # (n, d)
+            if self._vector_index is None:
+                self._dimension = vecs.shape[1]
+                self._vector_index = self._new_vector_index(self._dimension)
+                if not self._vector_index.is_trained:
+                    self._vector_index.train(vecs)
+            self._vector_index.add(vecs)
+        self._report_encode("corpus")
 
     def _build_token_index(self, corpus_texts: Sequence[str]) -> None:
         inv: Dict[str, List[int]] = {}
@@ -97,25 +297,56 @@ class Retriever:
         self._doc_norms = norms
 
     def index(self, corpus_items: Sequence[Dict]) -> None:
+        self._corpus_items = corpus_items
         texts = [self.text_builder(it) for it in corpus_items]
         if self._use_embeddings:
             self._build_embedding_index(texts)
         else:
             self._build_token_index(texts)
 
-    def _search_embeddings(self, query_items: Sequence[Dict], k: int) -> RetrievalResult:
-        assert (
-            self._embedder is not None and self._faiss is not None and self._faiss_index is not None
-        )
+    def _search_embeddings(
+        self, query_items: Sequence[Dict], k: int, reverse_k: int = 0
+    ) -> Tuple[RetrievalResult, Optional[RetrievalResult]]:
+        assert self._embedder is not None
         q_texts = [self.text_builder(it) for it in query_items]
-        q_vecs = self._embedder.encode(q_texts)
-        self._faiss.normalize_L2(q_vecs)
-        distances, indices = self._faiss_index.search(q_vecs, k)
-        # Convert to lists
-        return RetrievalResult(
-            distances=[list(row) for row in distances],
-            indices=[list(map(int, row)) for row in indices],
-        )
+        if self._vector_index is None or self._vector_index.ntotal == 0:
+            empty = RetrievalResult(
+                distances=[[0.0] * k for _ in q_texts], indices=[[-1] * k for _ in q_texts]
+            )
+            return empty, (RetrievalResult([], []) if reverse_k else None)
+
+        self.last_encode_stats = EncodeStats()
+        result = RetrievalResult(distances=[], indices=[])
+        query_index = None
+        for start in range(0, len(q_texts), self.search_batch_size):
+            q_vecs = self._encode(q_texts[start : start + self.search_batch_size])
+            distances, indices = self._vector_index.search(q_vecs, k)
+            result.distances.extend(list(row) for row in distances)
+            result.indices.extend(list(map(int, row)) for row in indices)
+            if reverse_k:
+                if query_index is None:
+                    query_index = self._new_vector_index(self._dimension)
+                    if not query_index.is_trained:
+                        query_index.train(q_vecs)
+                query_index.add(q_vecs)
+        self._report_encode("query")
+
+        if not reverse_k or query_index is None:
+            return result, None
+
+        # Reverse pass reuses the stored corpus vectors; nothing is re-encoded.
+        reverse = RetrievalResult(distances=[], indices=[])
+        ntotal = self._vector_index.ntotal
+        for start in range(0, ntotal, self.search_batch_size):
+            c_vecs = self._vector_index.reconstruct_n(
+                start, min(self.search_batch_size, ntotal - start)
+            )
+            distances, indices = query_index.search(
+                np.ascontiguousarray(c_vecs, dtype=np.float32), reverse_k
+            )
+            reverse.distances.extend(list(row) for row in distances)
+            reverse.indices.extend(list(map(int, row)) for row in indices)
+        return result, reverse
 
     def _search_tokens(self, query_items: Sequence[Dict], k: int) -> RetrievalResult:
         # Candidate generation via inverted index union, then cosine over counts
@@ -159,8 +390,32 @@ class Retriever:
 
         return RetrievalResult(distances=results_distances, indices=results_indices)
 
+    def memory_bytes(self) -> int:
+        """Bytes held by the stored corpus vectors (0 for the token index)."""
+        if self._vector_index is None:
+            return 0
+        return int(self._vector_index.code_size) * int(self._vector_index.ntotal)
+
     def search(self, query_items: Sequence[Dict], k: Optional[int] = None) -> RetrievalResult:
         k = k or self.top_k
         if self._use_embeddings:
-            return self._search_embeddings(query_items, k)
+            return self._search_embeddings(query_items, k)[0]
         return self._search_tokens(query_items, k)
+
+    def search_mutual(
+        self, query_items: Sequence[Dict], k: Optional[int] = None
+    ) -> Tuple[RetrievalResult, RetrievalResult]:
+        """Forward (query -> corpus) and reverse (corpus -> query) top-k.
+
+        The reverse result has one row per indexed corpus item with indices into
+        ``query_items``. Query texts are encoded once and the reverse pass searches
+        the already-stored corpus vectors against them.
+        """
+        k = k or self.top_k
+        if self._use_embeddings:
+            forward, reverse = self._search_embeddings(query_items, k, reverse_k=k)
+            return forward, reverse
+        forward = self._search_tokens(query_items, k)
+        reverse_retriever = Retriever(text_builder=self.text_builder, top_k=k, backend="tokens")
+        reverse_retriever.index(query_items)
+        return forward, reverse_retriever._search_tokens(self._corpus_items, k)
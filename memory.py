@@ -0,0 +1,101 @@
+import gc
+import os
+import sys
+from typing import Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MB = 1024 * 1024
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Current resident set size, or None where the platform has no /proc."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where the current value is unavailable)."""
+    current = current_rss_bytes()
+    if current is not None:
+        return current
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryBudget:
+    """Keeps the discovery pipeline under ``budget_mb`` of RSS.
+
+    Checked before each discovery cycle: above ``reduce_at`` of the budget the matcher's
+    encode/search batches are halved and the optional mutual-filter reverse pass is
+    dropped; above the budget (after a gc) the cycle is skipped so the price loop keeps
+    running instead of the process being OOM-killed. Batches are halved once per level
+    reached, not on every check, and restored once RSS falls below ``restore_at`` of the
+    budget. Without a current RSS reading (only the never-falling peak) it is disabled.
+    """
+
+    OK, REDUCED, CRITICAL = "ok", "reduced", "critical"
+    _RANK = {OK: 0, REDUCED: 1, CRITICAL: 2}
+    MIN_BATCH = {"embedding_batch_size": 8, "embedding_chunk_size": 256, "search_batch_size": 64}
+
+    def __init__(self, budget_mb: float, reduce_at: float = 0.8, restore_at: float = 0.6):
+        self.budget_bytes = budget_mb * MB
+        if self.budget_bytes and current_rss_bytes() is None:
+            # A peak only grows: once over the budget every later cycle would be skipped
+            print("Memory budget disabled: current RSS is not available on this platform")
+            self.budget_bytes = 0
+        self.reduce_at = reduce_at
+        self.restore_at = restore_at
+        self.level = self.OK
+        self._saved: Dict[str, object] = {}
+        self._reductions = 0  # halvings applied since the last restore
+
+    def check(self, matcher) -> str:
+        """Adjust ``matcher`` for the current RSS and return the pressure level."""
+        if not self.budget_bytes:
+            return self.OK
+        rss = rss_bytes()
+        if rss >= self.reduce_at * self.budget_bytes:
+            gc.collect()
+            rss = rss_bytes()
+        if rss >= self.budget_bytes:
+            self.level = self.CRITICAL
+        elif rss >= self.reduce_at * self.budget_bytes:
+            self.level = self.REDUCED
+        elif rss < self.restore_at * self.budget_bytes and self._saved:
+            for name, value in self._saved.items():
+                setattr(matcher, name, value)
+            self._saved = {}
+            self._reductions = 0
+            self.level = self.OK
+        elif self.level == self.CRITICAL:
+            # Under the budget again: run cycles, but keep the batches reduced until RSS
+            # falls below restore_at
+            self.level = self.REDUCED
+        while self._reductions < self._RANK[self.level]:
+            self._reduce(matcher)
+            self._reductions += 1
+        return self.level
+
+    def _reduce(self, matcher) -> None:
+        for name in (*self.MIN_BATCH, "candidate_filter"):
+            self._saved.setdefault(name, getattr(matcher, name))
+        for name, floor in self.MIN_BATCH.items():
+            setattr(matcher, name, max(floor, getattr(matcher, name) // 2))
+        matcher.candidate_filter = "none"
+
+    def summary(self) -> Dict:
+        return {
+            "rss_mb": round(rss_bytes() / MB, 1),
+            "budget_mb": round(self.budget_bytes / MB, 1),
+            "level": self.level,
+        }
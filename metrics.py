@@ -0,0 +1,200 @@
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Optional, Tuple
+
+from memory import MB, rss_bytes
+
+PREFIX = "arb"
+
+
+class StageRecord:
+    def __init__(self, name: str, items_in: Optional[int]):
+        self.name = name
+        self.items_in = items_in
+        self.items_out: Optional[int] = None
+        self.seconds = 0.0
+        # Memory accounting (only with Metrics.track_memory)
+        self.rss_delta: Optional[int] = None
+        self.alloc_peak: Optional[int] = None
+        self._traced_start = 0
+        self._child_peak = 0
+
+
+class Metrics:
+    """Process-wide counters, gauges and per-stage timings.
+
+    Stages and counters recorded inside ``cycle()`` are also collected into that
+    cycle's JSON summary (per thread, so the discovery and price loops do not mix).
+    ``render_prometheus()`` exposes the cumulative values in Prometheus text format
+    and ``serve()`` publishes them on /metrics with the last summaries on /summary.
+
+    With ``enable_memory_tracking()`` each stage also records its RSS delta and the
+    peak Python allocation above its starting point (tracemalloc; process-wide, so
+    concurrent threads are included).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Tuple], float] = {}
+        self._gauges: Dict[Tuple[str, Tuple], float] = {}
+        self._local = threading.local()
+        self.last_summaries: Dict[str, Dict] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.track_memory = False
+
+    def enable_memory_tracking(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.track_memory = True
+
+    def _add(self, store: Dict, name: str, value: float, labels: Dict, replace: bool) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            store[key] = value if replace else store.get(key, 0.0) + value
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        self._add(self._counters, name, value, labels, replace=False)
+        summary = getattr(self._local, "summary", None)
+        if summary is not None:
+            label = ",".join(f"{v}" for _, v in sorted(labels.items()))
+            key = f"{name}[{label}]" if label else name
+            summary["counters"][key] = summary["counters"].get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        self._add(self._gauges, name, value, labels, replace=True)
+
+    @contextmanager
+    def stage(self, name: str, items_in: Optional[int] = None) -> Iterator[StageRecord]:
+        """Time a pipeline stage; set ``record.items_out`` inside the block."""
+        record = StageRecord(name, items_in)
+        stack = None
+        if self.track_memory:
+            stack, rss_start = self._memory_start(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            if stack is not None:
+                self._memory_end(record, stack, rss_start)
+            # Stage totals go to the registry only; the cycle summary keeps them under "stages"
+            totals = {
+                "stage_duration_seconds_sum": record.seconds,
+                "stage_duration_seconds_count": 1,
+                "stage_items_in_total": record.items_in,
+                "stage_items_out_total": record.items_out,
+            }
+            for metric, value in totals.items():
+                if value is not None:
+                    self._add(self._counters, metric, value, {"stage": name}, replace=False)
+            self.set_gauge("stage_last_duration_seconds", record.seconds, stage=name)
+            summary = getattr(self._local, "summary", None)
+            if summary is not None:
+                entry = summary["stages"].setdefault(name, {"seconds": 0.0})
+                entry["seconds"] = round(entry["seconds"] + record.seconds, 6)
+                if record.items_in is not None:
+                    entry["in"] = entry.get("in", 0) + record.items_in
+                if record.items_out is not None:
+                    entry["out"] = entry.get("out", 0) + record.items_out
+                if record.alloc_peak is not None:
+                    entry["rss_delta_mb"] = round(
+                        entry.get("rss_delta_mb", 0.0) + record.rss_delta / MB, 2
+                    )
+                    entry["alloc_peak_mb"] = max(
+                        entry.get("alloc_peak_mb", 0.0), round(record.alloc_peak / MB, 2)
+                    )
+
+    def _memory_start(self, record: StageRecord):
+        stack = getattr(self._local, "stages", None)
+        if stack is None:
+            stack = self._local.stages = []
+        current, peak = tracemalloc.get_traced_memory()
+        # Stages nest (retrieval > index); keep the parent's peak before resetting it
+        if stack:
+            stack[-1]._child_peak = max(stack[-1]._child_peak, peak)
+        tracemalloc.reset_peak()
+        record._traced_start = current
+        stack.append(record)
+        return stack, rss_bytes()
+
+    def _memory_end(self, record: StageRecord, stack, rss_start: int) -> None:
+        stack.pop()
+        peak = max(tracemalloc.get_traced_memory()[1], record._child_peak)
+        record.alloc_peak = max(0, peak - record._traced_start)
+        record.rss_delta = rss_bytes() - rss_start
+        if stack:
+            stack[-1]._child_peak = max(stack[-1]._child_peak, peak)
+        self.set_gauge("stage_alloc_peak_bytes", record.alloc_peak, stage=record.name)
+        self.set_gauge("stage_rss_delta_bytes", record.rss_delta, stage=record.name)
+
+    @contextmanager
+    def cycle(self, kind: str) -> Iterator[Dict]:
+        """Collect a JSON-serializable summary of one loop iteration."""
+        summary: Dict = {"cycle": kind, "started_at": time.time(), "stages": {}, "counters": {}}
+        previous = getattr(self._local, "summary", None)
+        self._local.summary = summary
+        start = time.perf_counter()
+        try:
+            yield summary
+        finally:
+            summary["seconds"] = round(time.perf_counter() - start, 6)
+            self._local.summary = previous
+            self.inc("cycles_total", 1, cycle=kind)
+            self.set_gauge("cycle_last_duration_seconds", summary["seconds"], cycle=kind)
+            self.set_gauge("process_rss_bytes", rss_bytes())
+            with self._lock:
+                self.last_summaries[kind] = summary
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            series = [("counter", self._counters), ("gauge", self._gauges)]
+            snapshot = [(kind, dict(store)) for kind, store in series]
+        for kind, store in snapshot:
+            declared = set()
+            for (name, labels), value in sorted(store.items()):
+                metric = f"{PREFIX}_{name}"
+                if metric not in declared:
+                    lines.append(f"# TYPE {metric} {'counter' if kind == 'counter' else 'gauge'}")
+                    declared.add(metric)
+                label_str = ",".join(f'{k}="{v}"' for k, v in labels)
+                lines.append(
+                    f"{metric}{{{label_str}}} {value}" if label_str else f"{metric} {value}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Publish /metrics (Prometheus text) and /summary (JSON) from a daemon thread."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.startswith("/metrics"):
+                    body = registry.render_prometheus().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4"
+                elif self.path.startswith("/summary"):
+                    with registry._lock:
+                        body = json.dumps(registry.last_summaries, indent=2).encode("utf-8")
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True).start()
+        return self._server
+
+
+metrics = Metrics()
@@ -1,4 +1,13 @@
 from notifiers.base import BaseNotifier
 from notifiers.console import ConsoleNotifier
+from notifiers.discord import DiscordNotifier
+from notifiers.dispatcher import NotificationDispatcher
+from notifiers.telegram import TelegramNotifier
 
-__all__ = ["BaseNotifier", "ConsoleNotifier"]
+__all__ = [
+    "BaseNotifier",
+    "ConsoleNotifier",
+    "DiscordNotifier",
+    "NotificationDispatcher",
+    "TelegramNotifier",
+]
@@ -1,11 +1,21 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from logger import error_logger
 
 
 class BaseNotifier(ABC):
+    # Channel rate limit used by NotificationDispatcher; None means unlimited
+    max_messages_per_minute: Optional[float] = None
+    # Set by NotificationDispatcher; acquired once per message actually posted
+    rate_limiter = None
+
     @abstractmethod
-    def notify_arbitrage(self, opportunity: Dict) -> None:
-        pass
+    def notify_arbitrage(self, opportunity: Dict) -> Optional[bool]:
+        """Deliver one opportunity; False if it could not be delivered."""
 
     @abstractmethod
     def notify_status(self, message: str) -> None:
@@ -14,3 +24,74 @@ class BaseNotifier(ABC):
     @abstractmethod
     def notify_summary(self, markets_checked: Dict[str, int], opportunities_found: int) -> None:
         pass
+
+    def notify_batch(self, opportunities: List[Dict]) -> Optional[bool]:
+        """Deliver several opportunities; channels that can should send one message.
+        False if any of them could not be delivered."""
+        results = [self.notify_arbitrage(opportunity) for opportunity in opportunities]
+        return False not in results
+
+    def close(self) -> None:
+        pass
+
+    def _wait_turn(self) -> None:
+        """Wait for the channel's rate limit before posting one message (or message part)."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+
+def buy_sell_legs(opportunity: Dict) -> Tuple[Tuple[str, float, str], Tuple[str, float, str]]:
+    """((buy_source, buy_price, buy_url), (sell_source, sell_price, sell_url))."""
+    source1, price1 = opportunity["source1"], opportunity["price1"]
+    source2, price2 = opportunity["source2"], opportunity["price2"]
+    url1 = opportunity.get("url1", "")
+    url2 = opportunity.get("url2", "")
+    if price1 < price2:
+        return (source1, price1, url1), (source2, price2, url2)
+    return (source2, price2, url2), (source1, price1, url1)
+
+
+def split_message(message: str, limit: int) -> List[str]:
+    """Split on line boundaries so each part fits a channel's message size limit."""
+    parts: List[str] = []
+    current = ""
+    for line in message.split("\n"):
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) <= limit:
+            current = candidate
+            continue
+        if current:
+            parts.append(current)
+        current = line[:limit]
+    if current:
+        parts.append(current)
+    return parts
+
+
+def post_json(
+    session: requests.Session, url: str, payload: Dict, timeout: float = 5, context: str = ""
+) -> bool:
+    """POST with one retry when the API answers 429 with a retry-after hint. Failures are
+    logged (under ``context``, never the URL, which may hold a token) and return False."""
+    for attempt in range(2):
+        try:
+            response = session.post(url, json=payload, timeout=timeout)
+        except requests.RequestException as e:
+            error_logger.log_error(e, context=context, include_traceback=False, stage="notify")
+            return False
+        if response.status_code != 429 or attempt:
+            if not response.ok:
+                error = requests.HTTPError(
+                    f"HTTP {response.status_code}: {response.text[:200]}", response=response
+                )
+                error_logger.log_error(
+                    error, context=context, include_traceback=False, stage="notify"
+                )
+            return response.ok
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        retry_after = body.get("retry_after") or (body.get("parameters") or {}).get("retry_after")
+        time.sleep(min(float(retry_after or 1.0), 30.0))
+    return False
@@ -1,33 +1,15 @@
 from typing import Dict
 
-from notifiers.base import BaseNotifier
+from notifiers.base import BaseNotifier, buy_sell_legs
 
 
 class ConsoleNotifier(BaseNotifier):
     def notify_arbitrage(self, opportunity: Dict) -> None:
         event = opportunity["event"]
-        source1 = opportunity["source1"]
-        price1 = opportunity["price1"]
-        source2 = opportunity["source2"]
-        price2 = opportunity["price2"]
         spread_pct = opportunity["spread"] * 100
-
-        if price1 < price2:
-            buy_source = source1
-            buy_price = price1
-            sell_source = source2
-            sell_price = price2
-        else:
-            buy_source = source2
-            buy_price = price2
-            sell_source = source1
-            sell_price = price1
-
-        url1 = opportunity.get("url1", "")
-        url2 = opportunity.get("url2", "")
-
-        buy_url = url1 if buy_source == opportunity["source1"] else url2
-        sell_url = url2 if sell_source == opportunity["source2"] else url1
+        (buy_source, buy_price, buy_url), (sell_source, sell_price, sell_url) = buy_sell_legs(
+            opportunity
+        )
 
         print(f"\n🚨 Arbitrage detected: {event}")
         print(f"Buy on {buy_source} at {buy_price:.2f}")
@@ -1,38 +1,26 @@
-from typing import Dict
+from typing import Dict, List, Optional
 
 import requests
 
-from notifiers.base import BaseNotifier
+from notifiers.base import BaseNotifier, buy_sell_legs, post_json, split_message
+
+DISCORD_MESSAGE_LIMIT = 2000
 
 
 class DiscordNotifier(BaseNotifier):
-    def __init__(self, webhook_url: str):
+    # Discord webhooks allow 30 messages per minute per channel
+    max_messages_per_minute = 30
+
+    def __init__(self, webhook_url: str, session: Optional[requests.Session] = None):
         self.webhook_url = webhook_url
+        self.session = session or requests.Session()
 
-    def notify_arbitrage(self, opportunity: Dict) -> None:
+    def format_arbitrage(self, opportunity: Dict) -> str:
         event = opportunity["event"]
-        source1 = opportunity["source1"]
-        price1 = opportunity["price1"]
-        source2 = opportunity["source2"]
-        price2 = opportunity["price2"]
         spread_pct = opportunity["spread"] * 100
-
-        if price1 < price2:
-            buy_source = source1
-            buy_price = price1
-            sell_source = source2
-            sell_price = price2
-        else:
-            buy_source = source2
-            buy_price = price2
-            sell_source = source1
-            sell_price = price1
-
-        url1 = opportunity.get("url1", "")
-        url2 = opportunity.get("url2", "")
-
-        buy_url = url1 if buy_source == opportunity["source1"] else url2
-        sell_url = url2 if sell_source == opportunity["source2"] else url1
+        (buy_source, buy_price, buy_url), (sell_source, sell_price, sell_url) = buy_sell_legs(
+            opportunity
+        )
 
         _message = (
             f"🚨 **Arbitrage Detected**\n\n"
@@ -47,17 +35,31 @@ class DiscordNotifier(BaseNotifier):
             _message += f"\n{sell_url}"
 
         _message += f"\n**Spread:** {spread_pct:.2f}%"
-        try:
-            requests.post(self.webhook_url, json={"content": _message}, timeout=5)
-        except Exception:
-            pass
+        return _message
+
+    def _send(self, message: str) -> bool:
+        """True if every part was posted."""
+        delivered = True
+        for part in split_message(message, DISCORD_MESSAGE_LIMIT):
+            self._wait_turn()
+            if not post_json(
+                self.session, self.webhook_url, {"content": part}, context="Discord send"
+            ):
+                delivered = False
+        return delivered
+
+    def notify_arbitrage(self, opportunity: Dict) -> bool:
+        return self._send(self.format_arbitrage(opportunity))
+
+    def notify_batch(self, opportunities: List[Dict]) -> bool:
+        if len(opportunities) == 1:
+            return self.notify_arbitrage(opportunities[0])
+        return self._send("\n\n".join(self.format_arbitrage(o) for o in opportunities))
 
     def notify_status(self, message: str) -> None:
-        try:
-            requests.post(self.webhook_url, json={"content": message}, timeout=5)
-        except Exception:
-            pass
+        self._send(message)
 
     def notify_summary(self, markets_checked: Dict[str, int], opportunities_found: int) -> None:
-        "To refactor : too much logging it's flooding the Discord channel"
-        pass
+        # Only safe behind NotificationDispatcher, which coalesces and rate-limits summaries
+        market_counts = ", ".join(f"{count} {name}" for name, count in markets_checked.items())
+        self._send(f"Checked {market_counts} markets: {opportunities_found} opportunities")
@@ -0,0 +1,241 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import (
+    NOTIFY_COALESCE_SECONDS,
+    NOTIFY_COOLDOWN_SECONDS,
+    NOTIFY_MIN_SPREAD_IMPROVEMENT,
+    NOTIFY_QUEUE_SIZE,
+)
+from logger import error_logger
+from notifiers.base import BaseNotifier
+
+_STOP = object()
+
+
+class _Alert:
+    """One opportunity handed to every channel; settled once each has tried it."""
+
+    def __init__(self, key: Tuple, opportunity: Dict, channels: int):
+        self.key = key
+        self.opportunity = opportunity
+        self.remaining = channels
+        self.delivered = False
+
+
+class _RateLimiter:
+    """Token bucket: ``per_minute`` sends per minute with bursts up to ``burst``."""
+
+    def __init__(self, per_minute: Optional[float], burst: int = 5):
+        self.rate = per_minute / 60.0 if per_minute else None
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def acquire(self) -> None:
+        if self.rate is None:
+            return
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            time.sleep((1 - self.tokens) / self.rate)
+
+
+class _Channel:
+    """Background worker that delivers to one notifier."""
+
+    def __init__(
+        self,
+        notifier: BaseNotifier,
+        coalesce_seconds: float,
+        queue_size: int,
+        on_settled: Callable[[_Alert, bool], None],
+    ):
+        self.notifier = notifier
+        self.on_settled = on_settled
+        self.coalesce_seconds = coalesce_seconds
+        self.queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.limiter = _RateLimiter(notifier.max_messages_per_minute)
+        # The notifier acquires it per message it posts, so split messages count per part
+        notifier.rate_limiter = self.limiter
+        self.dropped = 0
+        self.thread = threading.Thread(
+            target=self._run, name=f"notify-{type(notifier).__name__}", daemon=True
+        )
+        self.thread.start()
+
+    def put(self, item: Tuple) -> None:
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            if item[0] == "arbitrage":
+                self.on_settled(item[1], False)
+
+    def _drain(self, first: Tuple) -> Tuple[List[Tuple], bool]:
+        """Collect everything that arrives within the coalescing window."""
+        items = [first]
+        deadline = time.monotonic() + self.coalesce_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return items, False
+            try:
+                item = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                return items, False
+            if item is _STOP:
+                return items, True
+            items.append(item)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self.queue.get()
+            if first is _STOP:
+                break
+            items, stopping = self._drain(first)
+            alerts = [payload for kind, payload in items if kind == "arbitrage"]
+            statuses = [payload for kind, payload in items if kind == "status"]
+            summaries = [payload for kind, payload in items if kind == "summary"]
+            if alerts:
+                delivered = False
+                try:
+                    delivered = (
+                        self.notifier.notify_batch([alert.opportunity for alert in alerts])
+                        is not False
+                    )
+                except Exception as e:
+                    error_logger.log_error(
+                        e, context=f"{type(self.notifier).__name__} delivery", stage="notify"
+                    )
+                for alert in alerts:
+                    self.on_settled(alert, delivered)
+            try:
+                if statuses:
+                    self.notifier.notify_status("\n".join(statuses))
+                if summaries:
+                    # Only the latest summary of a burst is worth sending
+                    self.notifier.notify_summary(*summaries[-1])
+            except Exception as e:
+                error_logger.log_error(
+                    e, context=f"{type(self.notifier).__name__} delivery", stage="notify"
+                )
+
+    def close(self, timeout: float) -> None:
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self.thread.join(timeout=timeout)
+        self.notifier.close()
+
+
+class NotificationDispatcher(BaseNotifier):
+    """Non-blocking front for a set of notifiers.
+
+    Calls only enqueue, so the detection loop never waits on a webhook. Each
+    channel has its own worker thread that coalesces bursts into one batched
+    message (``coalesce_seconds``) and respects the notifier's
+    ``max_messages_per_minute``. An opportunity for a pair already alerted within
+    ``cooldown_seconds`` (or still on its way to the channels) is dropped unless its
+    spread improved by at least ``min_spread_improvement``. The cooldown starts only
+    once at least one notifier delivered the alert, so a dropped or failed alert is
+    sent again at the next occurrence.
+    """
+
+    def __init__(
+        self,
+        notifiers: List[BaseNotifier],
+        coalesce_seconds: float = NOTIFY_COALESCE_SECONDS,
+        cooldown_seconds: float = NOTIFY_COOLDOWN_SECONDS,
+        min_spread_improvement: float = NOTIFY_MIN_SPREAD_IMPROVEMENT,
+        queue_size: int = NOTIFY_QUEUE_SIZE,
+    ):
+        self.cooldown_seconds = cooldown_seconds
+        self.min_spread_improvement = min_spread_improvement
+        self._last_sent: Dict[Tuple, Tuple[float, float]] = {}
+        # Alerts handed to the channels and not yet settled by all of them
+        self._in_flight: Dict[Tuple, _Alert] = {}
+        self._lock = threading.Lock()
+        self.suppressed = 0
+        self.channels = [_Channel(n, coalesce_seconds, queue_size, self._settle) for n in notifiers]
+
+    @staticmethod
+    def _pair_key(opportunity: Dict) -> Tuple:
+        return (
+            opportunity.get("polymarket_slug") or opportunity.get("url1"),
+            opportunity.get("kalshi_ticker") or opportunity.get("url2"),
+        )
+
+    def _admit(self, opportunity: Dict) -> Optional[_Alert]:
+        """The alert to hand to the channels, or None if the pair is cooling down."""
+        key = self._pair_key(opportunity)
+        now = time.monotonic()
+        spread = opportunity["spread"]
+        with self._lock:
+            pending = self._in_flight.get(key)
+            if pending is not None:
+                if spread < pending.opportunity["spread"] + self.min_spread_improvement:
+                    self.suppressed += 1
+                    return None
+            last = self._last_sent.get(key)
+            if last is not None:
+                sent_at, sent_spread = last
+                if (
+                    now - sent_at < self.cooldown_seconds
+                    and spread < sent_spread + self.min_spread_improvement
+                ):
+                    self.suppressed += 1
+                    return None
+            alert = _Alert(key, opportunity, len(self.channels))
+            self._in_flight[key] = alert
+        return alert
+
+    def _settle(self, alert: _Alert, delivered: bool) -> None:
+        """Called by each channel once it has tried ``alert``."""
+        now = time.monotonic()
+        with self._lock:
+            if delivered and not alert.delivered:
+                alert.delivered = True
+                self._last_sent[alert.key] = (now, alert.opportunity["spread"])
+                if len(self._last_sent) > 10000:
+                    cutoff = now - self.cooldown_seconds
+                    self._last_sent = {k: v for k, v in self._last_sent.items() if v[0] >= cutoff}
+            alert.remaining -= 1
+            if alert.remaining <= 0 and self._in_flight.get(alert.key) is alert:
+                del self._in_flight[alert.key]
+
+    def _broadcast(self, item: Tuple) -> None:
+        for channel in self.channels:
+            channel.put(item)
+
+    def notify_arbitrage(self, opportunity: Dict) -> None:
+        alert = self._admit(opportunity)
+        if alert is None:
+            return
+        if not self.channels:
+            self._settle(alert, False)
+            return
+        self._broadcast(("arbitrage", alert))
+
+    def notify_batch(self, opportunities: List[Dict]) -> None:
+        for opportunity in opportunities:
+            self.notify_arbitrage(opportunity)
+
+    def notify_status(self, message: str) -> None:
+        self._broadcast(("status", message))
+
+    def notify_summary(self, markets_checked: Dict[str, int], opportunities_found: int) -> None:
+        self._broadcast(("summary", (dict(markets_checked), opportunities_found)))
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush pending messages and stop the workers."""
+        for channel in self.channels:
+            channel.close(timeout)
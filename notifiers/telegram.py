@@ -1,55 +1,73 @@
-from typing import Dict
+import html
+from typing import Dict, List, Optional
 
-from notifiers.base import BaseNotifier
+import requests
+
+from notifiers.base import BaseNotifier, buy_sell_legs, post_json, split_message
+
+TELEGRAM_API_URL = "https://api.telegram.org"
+TELEGRAM_MESSAGE_LIMIT = 4096
 
 
 class TelegramNotifier(BaseNotifier):
-    def __init__(self, bot_token: str, chat_id: str):
+    # Telegram allows about 20 messages per minute to the same group
+    max_messages_per_minute = 20
+
+    def __init__(self, bot_token: str, chat_id: str, session: Optional[requests.Session] = None):
         self.bot_token = bot_token
         self.chat_id = chat_id
+        self.session = session or requests.Session()
 
-    def notify_arbitrage(self, opportunity: Dict) -> None:
-        event = opportunity["event"]
-        source1 = opportunity["source1"]
-        price1 = opportunity["price1"]
-        source2 = opportunity["source2"]
-        price2 = opportunity["price2"]
+    def format_arbitrage(self, opportunity: Dict) -> str:
+        # HTML parse mode: titles and URLs are escaped so a stray "_" or "*" cannot make
+        # Telegram reject the whole message
+        event = html.escape(opportunity["event"])
         spread_pct = opportunity["spread"] * 100
-
-        if price1 < price2:
-            buy_source = source1
-            buy_price = price1
-            sell_source = source2
-            sell_price = price2
-        else:
-            buy_source = source2
-            buy_price = price2
-            sell_source = source1
-            sell_price = price1
-
-        url1 = opportunity.get("url1", "")
-        url2 = opportunity.get("url2", "")
-
-        buy_url = url1 if buy_source == opportunity["source1"] else url2
-        sell_url = url2 if sell_source == opportunity["source2"] else url1
+        (buy_source, buy_price, buy_url), (sell_source, sell_price, sell_url) = buy_sell_legs(
+            opportunity
+        )
 
         _message = (
-            f"🚨 *Arbitrage Detected*\n\n"
-            f"*Event:* {event}\n"
-            f"*Buy on:* {buy_source} at {buy_price:.2f}"
+            f"🚨 <b>Arbitrage Detected</b>\n\n"
+            f"<b>Event:</b> {event}\n"
+            f"<b>Buy on:</b> {html.escape(buy_source)} at {buy_price:.2f}"
         )
         if buy_url:
-            _message += f"\n{buy_url}"
+            _message += f"\n{html.escape(buy_url)}"
 
-        _message += f"\n*Sell on:* {sell_source} at {sell_price:.2f}"
+        _message += f"\n<b>Sell on:</b> {html.escape(sell_source)} at {sell_price:.2f}"
         if sell_url:
-            _message += f"\n{sell_url}"
+            _message += f"\n{html.escape(sell_url)}"
+
+        _message += f"\n<b>Spread:</b> {spread_pct:.2f}%"
+        return _message
+
+    def _send(self, message: str, formatted: bool = True) -> bool:
+        """Post ``message`` in parts; ``formatted`` messages are HTML, others plain text.
+        True if every part was posted."""
+        url = f"{TELEGRAM_API_URL}/bot{self.bot_token}/sendMessage"
+        delivered = True
+        for part in split_message(message, TELEGRAM_MESSAGE_LIMIT):
+            payload = {"chat_id": self.chat_id, "text": part, "disable_web_page_preview": True}
+            if formatted:
+                payload["parse_mode"] = "HTML"
+            self._wait_turn()
+            if not post_json(self.session, url, payload, context="Telegram send"):
+                delivered = False
+        return delivered
 
-        _message += f"\n*Spread:* {spread_pct:.2f}%"
-        # TODO: Implement Telegram API call using self.bot_token and self.chat_id
+    def notify_arbitrage(self, opportunity: Dict) -> bool:
+        return self._send(self.format_arbitrage(opportunity))
+
+    def notify_batch(self, opportunities: List[Dict]) -> bool:
+        return self._send("\n\n".join(self.format_arbitrage(o) for o in opportunities))
 
     def notify_status(self, message: str) -> None:
-        pass
+        self._send(message, formatted=False)
 
     def notify_summary(self, markets_checked: Dict[str, int], opportunities_found: int) -> None:
-        pass
+        market_counts = ", ".join(f"{count} {name}" for name, count in markets_checked.items())
+        self._send(
+            f"Checked {market_counts} markets: {opportunities_found} opportunities",
+            formatted=False,
+        )
@@ -0,0 +1,175 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from logger import error_logger
+
+PROFILE_MODES = ("off", "cprofile", "sample")
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack every ``interval`` seconds from a helper thread.
+
+    Overhead is a few percent at the default interval, so it can stay on for every
+    cycle; stacks are kept as collapsed ``outer;...;inner`` strings (flamegraph input).
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._target: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+                self.samples += 1
+
+    def top(self, n: int) -> List[Tuple[str, int, int]]:
+        """(function, self samples, total samples), hottest by total first."""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for fn in set(frames):
+                total[fn] += count
+        return [(fn, own[fn], count) for fn, count in total.most_common(n)]
+
+    def summary(self, n: int) -> str:
+        lines = [f"{self.samples} samples every {self.interval * 1000:.1f} ms"]
+        lines.append(f"{'self %':>7} {'total %':>8}  function")
+        for fn, own, total in self.top(n):
+            lines.append(
+                f"{100 * own / max(1, self.samples):>6.1f}% "
+                f"{100 * total / max(1, self.samples):>7.1f}%  {fn}"
+            )
+        return "\n".join(lines)
+
+    def write_collapsed(self, path: str) -> None:
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class CycleProfiler:
+    """Per-cycle profiling for the bot's loops.
+
+    ``mode`` profiles every cycle ("cprofile" = deterministic, "sample" = sampling).
+    ``arm()`` (bound to SIGUSR1 by finder.py) profiles the next cycle even when the
+    mode is "off". With ``budget_seconds`` set, a sampling profile is taken of every
+    cycle and kept only when the cycle ran over budget. Each capture writes a dump and
+    a top-N hot-function summary to ``out_dir``.
+    """
+
+    def __init__(
+        self,
+        mode: str = "off",
+        out_dir: str = "runtime/profiles",
+        budget_seconds: float = 0.0,
+        top_n: int = 25,
+        sample_interval: float = 0.005,
+    ):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}; expected one of {PROFILE_MODES}")
+        self.mode = mode
+        self.out_dir = out_dir
+        self.budget_seconds = budget_seconds
+        self.top_n = top_n
+        self.sample_interval = sample_interval
+        self._armed = threading.Event()
+
+    def arm(self) -> None:
+        """Profile the next cycle (safe to call from a signal handler)."""
+        self._armed.set()
+
+    @contextmanager
+    def cycle(self, name: str) -> Iterator[None]:
+        armed = self._armed.is_set()
+        self._armed.clear()
+        mode = self.mode
+        if armed and mode == "off":
+            mode = "cprofile"
+        deterministic = cProfile.Profile() if mode == "cprofile" else None
+        sampler = None
+        if mode == "sample" or (self.budget_seconds and deterministic is None):
+            sampler = SamplingProfiler(self.sample_interval)
+
+        if sampler is not None:
+            sampler.start()
+        if deterministic is not None:
+            deterministic.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if deterministic is not None:
+                deterministic.disable()
+            if sampler is not None:
+                sampler.stop()
+            over_budget = bool(self.budget_seconds) and elapsed > self.budget_seconds
+            reason = "armed" if armed else ("over_budget" if over_budget else mode)
+            if mode != "off" or over_budget:
+                try:
+                    self._write(name, reason, elapsed, deterministic, sampler)
+                except OSError as e:
+                    error_logger.log_error(e, context="writing profile")
+
+    def _write(
+        self,
+        name: str,
+        reason: str,
+        elapsed: float,
+        deterministic: Optional[cProfile.Profile],
+        sampler: Optional[SamplingProfiler],
+    ) -> None:
+        os.makedirs(self.out_dir, exist_ok=True)
+        stem = os.path.join(
+            self.out_dir, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{reason}"
+        )
+        header = f"{name} cycle took {elapsed:.2f}s ({reason})"
+        if deterministic is not None:
+            dump = f"{stem}.prof"
+            deterministic.dump_stats(dump)
+            out = io.StringIO()
+            stats = pstats.Stats(deterministic, stream=out)
+            stats.sort_stats("cumulative").print_stats(self.top_n)
+            summary = out.getvalue()
+        else:
+            dump = f"{stem}.collapsed.txt"
+            sampler.write_collapsed(dump)
+            summary = sampler.summary(self.top_n)
+        with open(f"{stem}.top.txt", "w") as f:
+            f.write(f"{header}\n\n{summary}")
+        print(f"Profile: {header}; dump {dump}, top {self.top_n} in {stem}.top.txt")
@@ -1,12 +1,45 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence
+
+import requests
+
+
+def _to_price(value) -> Optional[float]:
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return None
+    return price if 0.0 <= price <= 1.0 else None
+
+
+def make_quote(yes_bid=None, yes_ask=None, no_bid=None, no_ask=None) -> Dict:
+    """Normalized top-of-book in dollars (0-1). A missing NO side is derived from the
+    YES side (no_ask = 1 - yes_bid, no_bid = 1 - yes_ask) and vice versa."""
+    yes_bid, yes_ask = _to_price(yes_bid), _to_price(yes_ask)
+    no_bid, no_ask = _to_price(no_bid), _to_price(no_ask)
+    if no_ask is None and yes_bid is not None:
+        no_ask = round(1.0 - yes_bid, 6)
+    if no_bid is None and yes_ask is not None:
+        no_bid = round(1.0 - yes_ask, 6)
+    if yes_ask is None and no_bid is not None:
+        yes_ask = round(1.0 - no_bid, 6)
+    if yes_bid is None and no_ask is not None:
+        yes_bid = round(1.0 - no_ask, 6)
+    return {"yes_bid": yes_bid, "yes_ask": yes_ask, "no_bid": no_bid, "no_ask": no_ask}
 
 
 class BaseMarketScraper(ABC):
+    # Field of a fetched market that identifies it in quotes, pairs and clusters
+    market_id_field = "id"
+    # fetch_markets takes min_close_ts / max_close_ts to narrow the fetch to a close window
+    supports_close_range = False
+
     def __init__(self, name: str, api_url: str, timeout: int = 10):
         self.name = name
         self.api_url = api_url
         self.timeout = timeout
+        # Pooled keep-alive connections for the high-frequency price polls
+        self.session = requests.Session()
 
     @abstractmethod
     def normalize_market(self, market: Dict) -> Dict | None:
@@ -16,5 +49,13 @@ class BaseMarketScraper(ABC):
     def fetch_markets(self, limit: int = None) -> List[Dict]:
         pass
 
+    def fetch_quotes(self, market_ids: Sequence[str]) -> Dict[str, Dict]:
+        """Targeted price refresh: {market_id: make_quote(...)} for the given ids.
+
+        Scrapers without a per-market lookup return nothing, so their pairs are only
+        priced on discovery cycles.
+        """
+        return {}
+
     def get_name(self) -> str:
         return self.name
@@ -1,14 +1,30 @@
 from datetime import datetime, timezone
-from typing import Dict, List
+from typing import Dict, List, Sequence
 
 import requests
 
-from config import KALSHI_API_URL, TARGET_MARKETS_PER_EXCHANGE
+from config import KALSHI_API_URL, PRICE_POLL_BATCH_SIZE, TARGET_MARKETS_PER_EXCHANGE
 from logger import error_logger
-from scrapers.base import BaseMarketScraper
+from scrapers.base import BaseMarketScraper, make_quote
+
+
+def _kalshi_price(market: Dict, field: str):
+    # Newer API versions send "<field>_dollars" strings next to the integer cent prices.
+    # Either way 0 means an empty book side, not a free contract.
+    dollars = market.get(f"{field}_dollars")
+    if dollars not in (None, ""):
+        try:
+            return float(dollars) if float(dollars) > 0 else None
+        except (TypeError, ValueError):
+            return None
+    cents = market.get(field)
+    return cents / 100.0 if isinstance(cents, (int, float)) and cents > 0 else None
 
 
 class KalshiScraper(BaseMarketScraper):
+    market_id_field = "ticker"
+    supports_close_range = True
+
     def __init__(self):
         super().__init__("Kalshi", KALSHI_API_URL)
         self.target_markets = TARGET_MARKETS_PER_EXCHANGE
@@ -34,11 +50,28 @@ class KalshiScraper(BaseMarketScraper):
                 "slug": market.get("slug"),
                 "title": market.get("title"),
                 "ticker": market.get("ticker"),
+                # Event grouping and the structured outcome of the market within it
+                "event_ticker": market.get("event_ticker"),
+                "yes_sub_title": market.get("yes_sub_title"),
+                "strike_type": market.get("strike_type"),
+                "floor_strike": market.get("floor_strike"),
+                "cap_strike": market.get("cap_strike"),
+                **self.normalize_quote(market),
             }
         except (KeyError, ValueError, TypeError) as e:
-            error_logger.log_error(e, context=f"normalizing {self.name} market")
+            error_logger.log_error(
+                e, context=f"normalizing {self.name} market", stage="normalize", exchange=self.name
+            )
             return None
 
+    def normalize_quote(self, market: Dict) -> Dict:
+        return make_quote(
+            yes_bid=_kalshi_price(market, "yes_bid"),
+            yes_ask=_kalshi_price(market, "yes_ask"),
+            no_bid=_kalshi_price(market, "no_bid"),
+            no_ask=_kalshi_price(market, "no_ask"),
+        )
+
     def _fetch_page(
         self,
         cursor: str = None,
@@ -69,9 +102,35 @@ class KalshiScraper(BaseMarketScraper):
             next_cursor = data.get("cursor")
             return markets, next_cursor
         except (requests.RequestException, ValueError, KeyError) as e:
-            error_logger.log_error(e, context=f"fetching {self.name} markets page")
+            error_logger.log_error(
+                e, context=f"fetching {self.name} markets page", stage="fetch", exchange=self.name
+            )
             return [], None
 
+    def fetch_quotes(self, market_ids: Sequence[str]) -> Dict[str, Dict]:
+        base_url = self.api_url.split("?")[0]
+        quotes: Dict[str, Dict] = {}
+        for start in range(0, len(market_ids), PRICE_POLL_BATCH_SIZE):
+            batch = market_ids[start : start + PRICE_POLL_BATCH_SIZE]
+            try:
+                response = self.session.get(
+                    base_url,
+                    params={"tickers": ",".join(batch), "limit": len(batch)},
+                    timeout=self.timeout,
+                )
+                response.raise_for_status()
+                for market in response.json().get("markets", []):
+                    if market.get("ticker"):
+                        quotes[market["ticker"]] = self.normalize_quote(market)
+            except (requests.RequestException, ValueError) as e:
+                error_logger.log_error(
+                    e,
+                    context=f"fetching {self.name} quotes",
+                    stage="price_fetch",
+                    exchange=self.name,
+                )
+        return quotes
+
     def fetch_markets(
         self, limit: int = None, min_close_ts: int = None, max_close_ts: int = None
     ) -> List[Dict]:
@@ -91,5 +150,7 @@ class KalshiScraper(BaseMarketScraper):
                 markets.extend(new_markets)
             return markets[:target]
         except Exception as e:
-            error_logger.log_error(e, context=f"fetching {self.name} markets")
+            error_logger.log_error(
+                e, context=f"fetching {self.name} markets", stage="fetch", exchange=self.name
+            )
             return []
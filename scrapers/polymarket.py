@@ -1,16 +1,18 @@
 import json
 from datetime import datetime, timezone
-from typing import Dict, List
+from typing import Dict, List, Sequence
 
 import requests
 
-from config import POLYMARKET_API_URL, TARGET_MARKETS_PER_EXCHANGE
+from config import POLYMARKET_API_URL, PRICE_POLL_BATCH_SIZE, TARGET_MARKETS_PER_EXCHANGE
 from logger import error_logger
-from scrapers.base import BaseMarketScraper
+from scrapers.base import BaseMarketScraper, make_quote
 
 
 # Push test
 class PolymarketScraper(BaseMarketScraper):
+    market_id_field = "slug"
+
     def __init__(self):
         super().__init__("Polymarket", POLYMARKET_API_URL)
         self.target_markets = TARGET_MARKETS_PER_EXCHANGE
@@ -51,11 +53,33 @@ class PolymarketScraper(BaseMarketScraper):
                 "description": market.get("description"),
                 "slug": market.get("slug"),
                 "events": events_dict,
+                # Outcome name inside a multi-market event, e.g. a candidate or "↑ 120,000"
+                "group_item_title": market.get("groupItemTitle"),
+                "clob_token_ids": self._clob_token_ids(market),
+                **self.normalize_quote(market),
             }
         except (KeyError, ValueError, TypeError, json.JSONDecodeError) as e:
-            error_logger.log_error(e, context=f"normalizing {self.name} market")
+            error_logger.log_error(
+                e, context=f"normalizing {self.name} market", stage="normalize", exchange=self.name
+            )
             return None
 
+    @staticmethod
+    def _clob_token_ids(market: Dict) -> List[str]:
+        # [YES token, NO token]; the API sends it as a JSON-encoded string
+        token_ids = market.get("clobTokenIds") or []
+        if isinstance(token_ids, str):
+            try:
+                token_ids = json.loads(token_ids)
+            except ValueError:
+                token_ids = []
+        return [str(t) for t in token_ids]
+
+    def normalize_quote(self, market: Dict) -> Dict:
+        # No order book means nothing is executable: the displayed outcomePrices are not
+        # quotes, so the sides stay None and the market is not priced
+        return make_quote(yes_bid=market.get("bestBid"), yes_ask=market.get("bestAsk"))
+
     def _fetch_page(self, offset: int = 0, limit: int = 100) -> tuple[List[Dict], int]:
         try:
             url = f"{self.api_url}&limit={limit}&offset={offset}&order=endDateIso&ascending=false"
@@ -75,9 +99,33 @@ class PolymarketScraper(BaseMarketScraper):
 
             return markets, raw_count
         except (requests.RequestException, ValueError, KeyError) as e:
-            error_logger.log_error(e, context=f"fetching {self.name} markets page")
+            error_logger.log_error(
+                e, context=f"fetching {self.name} markets page", stage="fetch", exchange=self.name
+            )
             return [], 0
 
+    def fetch_quotes(self, market_ids: Sequence[str]) -> Dict[str, Dict]:
+        base_url = self.api_url.split("?")[0]
+        quotes: Dict[str, Dict] = {}
+        for start in range(0, len(market_ids), PRICE_POLL_BATCH_SIZE):
+            batch = market_ids[start : start + PRICE_POLL_BATCH_SIZE]
+            params = [("slug", slug) for slug in batch] + [("limit", len(batch))]
+            try:
+                response = self.session.get(base_url, params=params, timeout=self.timeout)
+                response.raise_for_status()
+                data = response.json()
+                for market in data if isinstance(data, list) else []:
+                    if market.get("slug"):
+                        quotes[market["slug"]] = self.normalize_quote(market)
+            except (requests.RequestException, ValueError) as e:
+                error_logger.log_error(
+                    e,
+                    context=f"fetching {self.name} quotes",
+                    stage="price_fetch",
+                    exchange=self.name,
+                )
+        return quotes
+
     def fetch_markets(self, limit: int = None) -> List[Dict]:
         self.current_time = datetime.now(timezone.utc)
         target = limit if limit is not None else self.target_markets
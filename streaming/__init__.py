@@ -0,0 +1,6 @@
+from streaming.auth import KalshiSigner
+from streaming.client import PriceStream
+from streaming.feeds import KalshiFeed, PolymarketFeed
+from streaming.orderbook import OrderBook
+
+__all__ = ["KalshiFeed", "KalshiSigner", "OrderBook", "PolymarketFeed", "PriceStream"]
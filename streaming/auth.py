@@ -0,0 +1,36 @@
+import base64
+import time
+from typing import Dict
+
+
+class KalshiSigner:
+    """Kalshi API-key request signing.
+
+    Every request (including the websocket handshake) carries the key id, a millisecond
+    timestamp and an RSA-PSS / SHA-256 signature of ``timestamp + method + path``.
+    Signatures embed the time, so headers are made fresh for each request.
+    """
+
+    def __init__(self, key_id: str, private_key_path: str):
+        # Only needed when streaming from Kalshi, so imported here
+        from cryptography.hazmat.primitives import serialization
+
+        with open(private_key_path, "rb") as f:
+            self._key = serialization.load_pem_private_key(f.read(), password=None)
+        self.key_id = key_id
+
+    def headers(self, method: str, path: str) -> Dict[str, str]:
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+
+        timestamp = str(int(time.time() * 1000))
+        signature = self._key.sign(
+            f"{timestamp}{method}{path}".encode(),
+            padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
+            hashes.SHA256(),
+        )
+        return {
+            "KALSHI-ACCESS-KEY": self.key_id,
+            "KALSHI-ACCESS-SIGNATURE": base64.b64encode(signature).decode(),
+            "KALSHI-ACCESS-TIMESTAMP": timestamp,
+        }
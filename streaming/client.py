@@ -0,0 +1,151 @@
+import asyncio
+import json
+import random
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+from logger import error_logger
+from streaming.orderbook import OrderBook
+
+QuoteCallback = Callable[[str, Dict[str, Dict]], None]
+
+
+class PriceStream:
+    """Websocket price ingestion for one exchange feed.
+
+    Runs its own asyncio loop in a daemon thread, keeps an OrderBook per market
+    from snapshot/delta messages and calls ``on_update(exchange, {market_id: quote})``
+    after every message that changed a book. Dropped connections are retried with
+    jittered exponential backoff and the current market set is resubscribed.
+    """
+
+    def __init__(
+        self,
+        feed,
+        on_update: QuoteCallback,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ):
+        self.feed = feed
+        self.on_update = on_update
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.books: Dict[str, OrderBook] = {}
+        self.messages = 0
+        self.reconnects = 0
+        self._markets: List[str] = []
+        self._tracked: Set[str] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    @property
+    def exchange(self) -> str:
+        return self.feed.exchange
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name=f"stream-{self.exchange.lower()}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        if self._loop is not None and self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def set_markets(self, market_ids: Sequence[str]) -> None:
+        """Replace the streamed market set; when connected, subscribes the added markets
+        and unsubscribes the removed ones immediately."""
+        markets = sorted(set(market_ids))
+        added = [m for m in markets if m not in self._tracked]
+        removed = sorted(self._tracked - set(markets))
+        self._markets, self._tracked = markets, set(markets)
+        if self._loop is not None and self._loop.is_running():
+            # The loop thread mutates the books; drop the untracked ones there too
+            self._loop.call_soon_threadsafe(self._drop_untracked_books)
+        else:
+            self._drop_untracked_books()
+        if self._loop is not None and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(
+                self._change_subscriptions(self._ws, added, removed), self._loop
+            )
+
+    def _drop_untracked_books(self) -> None:
+        for market_id in set(self.books) - set(self._markets):
+            del self.books[market_id]
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._task = self._loop.create_task(self._main())
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+    async def _subscribe(self, ws) -> None:
+        if not self._markets:
+            return
+        for message in self.feed.subscribe_messages(self._markets):
+            await ws.send(json.dumps(message))
+
+    async def _change_subscriptions(self, ws, added: List[str], removed: List[str]) -> None:
+        for message in self.feed.change_messages(self._markets, added, removed):
+            await ws.send(json.dumps(message))
+
+    async def _main(self) -> None:
+        from websockets.asyncio.client import connect
+
+        delay = self.reconnect_delay
+        while not self._stopping.is_set():
+            try:
+                async with connect(self.feed.url, additional_headers=self.feed.headers) as ws:
+                    self._ws = ws
+                    self.feed.connected()
+                    await self._subscribe(ws)
+                    delay = self.reconnect_delay
+                    async for raw in ws:
+                        self._handle(raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error_logger.log_error(
+                    e,
+                    context=f"{self.exchange} price stream",
+                    stage="stream",
+                    exchange=self.exchange,
+                )
+            finally:
+                self._ws = None
+            if self._stopping.is_set():
+                break
+            self.reconnects += 1
+            await asyncio.sleep(delay * (0.5 + random.random()))
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _handle(self, raw) -> None:
+        self.messages += 1
+        try:
+            updated = self.feed.handle(json.loads(raw), self.books)
+        except (ValueError, KeyError, TypeError) as e:
+            error_logger.log_error(
+                e,
+                context=f"parsing {self.exchange} stream message",
+                stage="stream",
+                exchange=self.exchange,
+            )
+            return
+        # Messages for markets dropped since (until the unsubscribe lands) must not
+        # bring their books back
+        for market_id in updated:
+            if market_id not in self._tracked:
+                self.books.pop(market_id, None)
+        updated = [m for m in updated if m in self._tracked]
+        if updated:
+            self.on_update(self.exchange, {m: self.books[m].quote() for m in updated})
@@ -0,0 +1,163 @@
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+from config import KALSHI_WS_URL, POLYMARKET_WS_URL
+from streaming.auth import KalshiSigner
+from streaming.orderbook import OrderBook
+
+
+class KalshiFeed:
+    """Kalshi trade-api v2 ``orderbook_delta`` channel, keyed by market ticker.
+
+    Kalshi requires signed API-key headers on the websocket handshake: with a
+    ``signer`` they are made afresh for every (re)connect, on top of ``headers``.
+    """
+
+    exchange = "Kalshi"
+
+    def __init__(
+        self,
+        url: str = KALSHI_WS_URL,
+        headers: Optional[Dict[str, str]] = None,
+        signer: Optional[KalshiSigner] = None,
+    ):
+        self.url = url
+        self.signer = signer
+        self._headers = headers or {}
+        self._next_id = 0
+        self._sids: List[int] = []  # subscriptions of the current connection
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        if self.signer is None:
+            return dict(self._headers)
+        return {**self._headers, **self.signer.headers("GET", urlparse(self.url).path)}
+
+    def connected(self) -> None:
+        """A new connection starts without subscriptions."""
+        self._sids = []
+
+    def subscribe_messages(self, market_ids: Sequence[str]) -> List[Dict]:
+        self._next_id += 1
+        return [
+            {
+                "id": self._next_id,
+                "cmd": "subscribe",
+                "params": {"channels": ["orderbook_delta"], "market_tickers": list(market_ids)},
+            }
+        ]
+
+    def change_messages(
+        self, market_ids: Sequence[str], added: Sequence[str], removed: Sequence[str]
+    ) -> List[Dict]:
+        """Move the live subscriptions to ``market_ids``: drop the removed tickers from
+        every subscription and subscribe the added ones."""
+        messages = []
+        if removed:
+            for sid in self._sids:
+                self._next_id += 1
+                messages.append(
+                    {
+                        "id": self._next_id,
+                        "cmd": "update_subscription",
+                        "params": {
+                            "sids": [sid],
+                            "market_tickers": list(removed),
+                            "action": "delete_markets",
+                        },
+                    }
+                )
+        if added:
+            messages.extend(self.subscribe_messages(added))
+        return messages
+
+    def handle(self, message: Dict, books: Dict[str, OrderBook]) -> List[str]:
+        kind = message.get("type")
+        msg = message.get("msg") or {}
+        if kind == "subscribed":
+            if msg.get("sid") is not None and msg["sid"] not in self._sids:
+                self._sids.append(msg["sid"])
+            return []
+        ticker = msg.get("market_ticker")
+        if not ticker or kind not in ("orderbook_snapshot", "orderbook_delta"):
+            return []
+        book = books.setdefault(ticker, OrderBook())
+        if kind == "orderbook_snapshot":
+            book.clear()
+            for price, qty in msg.get("yes") or []:
+                book.set_level("bid", price / 100.0, qty)
+            for price, qty in msg.get("no") or []:
+                book.set_level("ask", 1.0 - price / 100.0, qty)
+        else:
+            price = msg.get("price", 0) / 100.0
+            if msg.get("side") == "yes":
+                book.add_level("bid", price, msg.get("delta", 0))
+            else:
+                book.add_level("ask", 1.0 - price, msg.get("delta", 0))
+        return [ticker]
+
+
+class PolymarketFeed:
+    """Polymarket CLOB ``market`` channel (``book`` / ``price_change`` events).
+
+    The CLOB streams by token id, so the feed needs the YES token of every tracked
+    slug in ``token_ids`` (see PolymarketScraper's ``clob_token_ids``).
+    """
+
+    exchange = "Polymarket"
+
+    def __init__(self, url: str = POLYMARKET_WS_URL):
+        self.url = url
+        self.headers: Dict[str, str] = {}
+        self.token_ids: Dict[str, str] = {}
+        self._slug_by_token: Dict[str, str] = {}
+
+    def set_token_ids(self, token_ids: Dict[str, str]) -> None:
+        self.token_ids = dict(token_ids)
+        self._slug_by_token = {token: slug for slug, token in self.token_ids.items()}
+
+    def connected(self) -> None:
+        pass
+
+    def subscribe_messages(self, market_ids: Sequence[str]) -> List[Dict]:
+        assets = [self.token_ids[slug] for slug in market_ids if slug in self.token_ids]
+        return [{"type": "market", "assets_ids": assets}] if assets else []
+
+    def change_messages(
+        self, market_ids: Sequence[str], added: Sequence[str], removed: Sequence[str]
+    ) -> List[Dict]:
+        # The market message sets the whole asset list (token ids may also have changed)
+        return self.subscribe_messages(market_ids)
+
+    def handle(self, message, books: Dict[str, OrderBook]) -> List[str]:
+        if isinstance(message, list):
+            updated: List[str] = []
+            for item in message:
+                updated.extend(self.handle(item, books))
+            return updated
+
+        kind = message.get("event_type")
+        updated = []
+        if kind == "book":
+            slug = self._slug_by_token.get(message.get("asset_id"))
+            if slug:
+                book = books.setdefault(slug, OrderBook())
+                book.clear()
+                for level in message.get("bids") or []:
+                    book.set_level("bid", float(level["price"]), float(level["size"]))
+                for level in message.get("asks") or []:
+                    book.set_level("ask", float(level["price"]), float(level["size"]))
+                updated.append(slug)
+        elif kind == "price_change":
+            changes = message.get("price_changes") or message.get("changes") or []
+            for change in changes:
+                slug = self._slug_by_token.get(change.get("asset_id") or message.get("asset_id"))
+                if not slug:
+                    continue
+                side = "bid" if change.get("side") == "BUY" else "ask"
+                books.setdefault(slug, OrderBook()).set_level(
+                    side, float(change["price"]), float(change["size"])
+                )
+                if slug not in updated:
+                    updated.append(slug)
+        return updated
@@ -0,0 +1,37 @@
+from typing import Dict
+
+from scrapers.base import make_quote
+
+
+class OrderBook:
+    """Resting YES-side liquidity of one binary market, prices in dollars.
+
+    Both exchanges are mapped onto a YES book: a Kalshi NO bid at p is a YES ask
+    at 1 - p, and Polymarket streams the YES token's own book.
+    """
+
+    def __init__(self):
+        self.bids: Dict[float, float] = {}
+        self.asks: Dict[float, float] = {}
+
+    def clear(self) -> None:
+        self.bids.clear()
+        self.asks.clear()
+
+    def set_level(self, side: str, price: float, size: float) -> None:
+        levels = self.bids if side == "bid" else self.asks
+        price = round(price, 4)
+        if size > 0:
+            levels[price] = size
+        else:
+            levels.pop(price, None)
+
+    def add_level(self, side: str, price: float, delta: float) -> None:
+        levels = self.bids if side == "bid" else self.asks
+        self.set_level(side, price, levels.get(round(price, 4), 0.0) + delta)
+
+    def quote(self) -> Dict:
+        return make_quote(
+            yes_bid=max(self.bids) if self.bids else None,
+            yes_ask=min(self.asks) if self.asks else None,
+        )
@@ -0,0 +1,90 @@
+import threading
+import time
+
+from benchmarks.synthetic import HashingEmbedder
+from matcher.matcher import MarketMatcher, market_id
+from matcher.ollama_pool import OllamaPool
+
+ASSETS = ["Bitcoin", "Ethereum", "Solana", "Dogecoin"]
+
+
+class _SlowMatcher(MarketMatcher):
+    """LLM stub that records how many calls overlap; fails for Dogecoin."""
+
+    def __init__(self, hosts):
+        super().__init__(
+            ollama_pool=OllamaPool([f"http://llm-{i}" for i in range(hosts)]),
+            embedder=HashingEmbedder(),
+            vector_backend="numpy",
+            cache_embeddings=False,
+        )
+        self.auto_accept_threshold = 1.1
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _verify_match_with_llm(self, poly, kalshi):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+        failed = "Dogecoin" in poly["event"]
+        self._last_llm_failed = failed
+        return (0.0, "unavailable") if failed else (0.95, "same event")
+
+
+def _markets():
+    poly = [
+        {"event": f"Will {a} reach a new all-time high by June 2027?", "market_id": a.lower()}
+        for a in ASSETS
+    ]
+    kalshi = [
+        {"event": f"{a} all-time high by June 2027", "market_id": f"KX{a.upper()}"} for a in ASSETS
+    ]
+    return poly, kalshi
+
+
+def test_candidates_are_verified_concurrently_across_hosts():
+    matcher = _SlowMatcher(hosts=3)
+    poly, kalshi = _markets()
+    matches = matcher.find_matches(poly, kalshi)
+    assert matcher.max_in_flight > 1
+    pairs = {(market_id(p), market_id(k)) for p, k, _ in matches}
+    # The failed Dogecoin call falls back to the cheap text check
+    assert {("bitcoin", "KXBITCOIN"), ("ethereum", "KXETHEREUM"), ("solana", "KXSOLANA")} <= pairs
+
+
+def test_a_failed_call_does_not_leak_into_other_verdicts():
+    matcher = _SlowMatcher(hosts=3)
+    poly, kalshi = _markets()
+    matcher.find_matches(poly, kalshi)
+    # Only the failed Dogecoin pair is missing from the verdict history
+    assert len(matcher._verdicts) == 3
+
+
+def test_a_single_host_verifies_one_pair_at_a_time():
+    matcher = _SlowMatcher(hosts=1)
+    matcher.find_matches(*_markets())
+    assert matcher.max_in_flight == 1
+
+
+def test_llm_is_re_enabled_once_the_pool_re_admits_a_host():
+    pool = OllamaPool(["http://llm-0"], probe_interval=0.01)
+    pool.probe = lambda host: True
+    matcher = MarketMatcher(ollama_pool=pool, embedder=HashingEmbedder(), vector_backend="numpy")
+    matcher.llm_enabled = False
+    matcher._llm_error_count = matcher._llm_error_limit
+    assert matcher._verify_match_with_llm({"event": "a"}, {"event": "b"}) == (0.0, "LLM disabled")
+
+    pool.hosts[0].healthy = False
+    pool._start_prober()
+    try:
+        deadline = time.time() + 2.0
+        while pool.readmissions == 0 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        pool.close()
+    assert matcher._llm_available()
+    assert matcher.llm_enabled and matcher._llm_error_count == 0
@@ -0,0 +1,76 @@
+from benchmarks.synthetic import HashingEmbedder
+from matcher.matcher import MarketMatcher, market_id
+
+TITLE = "Who will win the 2028 presidential election?"
+RULES = "Resolves to the winner of the 2028 presidential election."
+
+
+class _StubMatcher(MarketMatcher):
+    def _verify_match_with_llm(self, poly, kalshi):
+        self._last_llm_failed = False
+        return 0.95, "stub: same event"
+
+
+def _matcher():
+    return _StubMatcher(embedder=HashingEmbedder(), vector_backend="numpy", cache_embeddings=False)
+
+
+def _poly(slug, outcome):
+    return {"event": TITLE, "description": RULES, "market_id": slug, "outcome": outcome}
+
+
+def _kalshi(ticker, outcome):
+    return {"event": TITLE, "description": RULES, "market_id": ticker, "outcome": outcome}
+
+
+def _pairs(matches):
+    return {(market_id(p), market_id(k)) for p, k, _ in matches}
+
+
+def test_outcomes_sharing_a_text_are_paired_one_to_one():
+    poly = [
+        _poly("trump", "Donald Trump"),
+        _poly("harris", "Kamala Harris"),
+        _poly("vance", "JD Vance"),
+    ]
+    kalshi = [
+        _kalshi("PRES-VAN", "Vance"),
+        _kalshi("PRES-TRU", "Trump"),
+        _kalshi("PRES-HAR", "Harris"),
+    ]
+    matches = _matcher().find_matches(poly, kalshi)
+    assert _pairs(matches) == {
+        ("trump", "PRES-TRU"),
+        ("harris", "PRES-HAR"),
+        ("vance", "PRES-VAN"),
+    }
+
+
+def test_repeated_listing_fans_out_against_a_single_market():
+    poly = [_poly("a", ""), _poly("b", "")]
+    kalshi = [_kalshi("PRES", "")]
+    assert _pairs(_matcher().find_matches(poly, kalshi)) == {("a", "PRES"), ("b", "PRES")}
+
+
+def test_cluster_outcomes_sharing_a_title_are_paired_one_to_one():
+    matcher = _matcher()
+    joined = matcher.match_clusters(
+        {
+            "Polymarket": [
+                _poly("trump", "Donald Trump"),
+                _poly("harris", "Kamala Harris"),
+                _poly("vance", "JD Vance"),
+            ],
+            "Kalshi": [
+                _kalshi("PRES-VAN", "Vance"),
+                _kalshi("PRES-TRU", "Trump"),
+                _kalshi("PRES-HAR", "Harris"),
+            ],
+        }
+    )
+    pairs = matcher.cluster_pairs("Polymarket", "Kalshi", {c for c, _, _, _ in joined})
+    assert {(market_id(p), market_id(k)) for p, k, _, _ in pairs} == {
+        ("trump", "PRES-TRU"),
+        ("harris", "PRES-HAR"),
+        ("vance", "PRES-VAN"),
+    }
@@ -0,0 +1,68 @@
+from benchmarks.synthetic import HashingEmbedder
+from database import MatchDatabase
+from matcher.matcher import MarketMatcher, market_id, snapshot_rows
+
+POLY = [
+    {
+        "event": "Will Bitcoin be above 120,000 on March 3, 2027?",
+        "description": "Resolves Yes if Bitcoin trades above 120,000 on March 3, 2027.",
+        "market_id": "btc-120k-mar-3",
+    }
+]
+KALSHI = [
+    {
+        "event": "Bitcoin above 120,000 on March 3, 2027",
+        "description": "If Bitcoin trades above 120,000 on March 3, 2027, Yes.",
+        "market_id": "KXBTC-120K",
+    }
+]
+
+
+def _matcher(db):
+    matcher = MarketMatcher(
+        market_store=db,
+        incremental=True,
+        verification_mode="queue",
+        verify_wait_seconds=0,
+        embedder=HashingEmbedder(),
+        vector_backend="numpy",
+    )
+    matcher.auto_accept_threshold = 1.1  # always go through the queue
+    return matcher
+
+
+def test_markets_awaiting_a_verdict_stay_new_until_it_arrives(tmp_path):
+    db = MatchDatabase(str(tmp_path / "matches.db"))
+    matcher = _matcher(db)
+
+    assert matcher.find_matches(POLY, KALSHI) == []
+    # Not snapshotted: the next cycle must retrieve the pair again
+    assert db.changed_markets("Polymarket", snapshot_rows(POLY)) == {"btc-120k-mar-3"}
+    assert db.changed_markets("Kalshi", snapshot_rows(KALSHI)) == {"KXBTC-120K"}
+
+    (job,) = db.lease_verifications("worker-1", limit=10, lease_seconds=60, max_attempts=3)
+    assert db.complete_verification(job["id"], "worker-1", 0.95, "same event")
+
+    matches = matcher.find_matches(POLY, KALSHI)
+    assert [(market_id(p), market_id(k)) for p, k, _ in matches] == [
+        ("btc-120k-mar-3", "KXBTC-120K")
+    ]
+    assert db.changed_markets("Polymarket", snapshot_rows(POLY)) == set()
+
+
+class _FailingLLMMatcher(MarketMatcher):
+    def _verify_match_with_llm(self, poly, kalshi):
+        self._last_llm_failed = True
+        return 0.0, "LLM unavailable"
+
+
+def test_markets_checked_while_the_llm_fails_are_rechecked(tmp_path):
+    db = MatchDatabase(str(tmp_path / "matches.db"))
+    matcher = _FailingLLMMatcher(
+        market_store=db, incremental=True, embedder=HashingEmbedder(), vector_backend="numpy"
+    )
+    matcher.auto_accept_threshold = 1.1
+
+    matcher.find_matches(POLY, KALSHI)
+    assert db.changed_markets("Polymarket", snapshot_rows(POLY)) == {"btc-120k-mar-3"}
+    assert db.changed_markets("Kalshi", snapshot_rows(KALSHI)) == {"KXBTC-120K"}
@@ -0,0 +1,57 @@
+import pytest
+
+from database import MatchDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = MatchDatabase(str(tmp_path / "matches.db"))
+    db.save_matches(
+        [
+            ({"market_id": f"p{i}", "event": "e"}, {"market_id": f"K{i}", "event": "e"}, i / 100)
+            for i in range(100)
+        ]
+    )
+    return db
+
+
+def _plan(db, **filters):
+    original = db._reader
+
+    class _Explain:
+        def __init__(self, conn):
+            self.conn = conn
+
+        def execute(self, sql, params):
+            return self.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+
+    db._reader = lambda: _Explain(original())
+    try:
+        rows, _ = db.get_matches_page(limit=10, **filters)
+    finally:
+        db._reader = original
+    return " ".join(str(row["detail"]) for row in rows)
+
+
+@pytest.mark.parametrize(
+    "filters, index",
+    [
+        ({"min_confidence": 0.9}, "idx_matches_confidence_id"),
+        ({"since": "2000-01-01 00:00:00"}, "idx_matches_created_at_id"),
+    ],
+)
+def test_range_filters_walk_their_index(db, filters, index):
+    plan = _plan(db, **filters)
+    assert index in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_confidence_pages_cover_every_row_once(db):
+    rows = list(db.iter_matches(batch_size=3, min_confidence=0.5))
+    assert [row["kalshi_ticker"] for row in rows] == [f"K{i}" for i in range(99, 49, -1)]
+
+
+def test_unfiltered_pages_are_newest_first(db):
+    rows = list(db.iter_matches(batch_size=7))
+    assert [row["id"] for row in rows] == sorted((row["id"] for row in rows), reverse=True)
+    assert len(rows) == 100
@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+import memory
+from memory import MB, MemoryBudget
+
+
+def _matcher():
+    return SimpleNamespace(
+        embedding_batch_size=64,
+        embedding_chunk_size=4096,
+        search_batch_size=1024,
+        candidate_filter="mutual",
+    )
+
+
+def _set_rss(monkeypatch, mb):
+    monkeypatch.setattr(memory, "current_rss_bytes", lambda: mb * MB)
+    monkeypatch.setattr(memory, "rss_bytes", lambda: mb * MB)
+
+
+def test_batches_are_halved_once_per_level(monkeypatch):
+    _set_rss(monkeypatch, 85)
+    budget, matcher = MemoryBudget(100), _matcher()
+    for _ in range(3):
+        assert budget.check(matcher) == MemoryBudget.REDUCED
+    assert matcher.search_batch_size == 512 and matcher.candidate_filter == "none"
+
+    _set_rss(monkeypatch, 120)
+    for _ in range(3):
+        assert budget.check(matcher) == MemoryBudget.CRITICAL
+    assert matcher.search_batch_size == 256
+
+    _set_rss(monkeypatch, 50)
+    assert budget.check(matcher) == MemoryBudget.OK
+    assert matcher.search_batch_size == 1024 and matcher.candidate_filter == "mutual"
+
+
+def test_budget_is_disabled_without_a_current_rss(monkeypatch):
+    monkeypatch.setattr(memory, "current_rss_bytes", lambda: None)
+    monkeypatch.setattr(memory, "rss_bytes", lambda: 500 * MB)
+    budget = MemoryBudget(100)
+    assert not budget.budget_bytes
+    assert budget.check(_matcher()) == MemoryBudget.OK
+
+
+def test_cycles_resume_once_back_under_the_budget(monkeypatch):
+    _set_rss(monkeypatch, 1100)
+    budget, matcher = MemoryBudget(1000), _matcher()
+    assert budget.check(matcher) == MemoryBudget.CRITICAL
+
+    _set_rss(monkeypatch, 700)
+    assert budget.check(matcher) == MemoryBudget.REDUCED
+    assert matcher.search_batch_size == 256  # batches stay reduced until restore_at
@@ -0,0 +1,126 @@
+import threading
+import time
+
+from notifiers import BaseNotifier, NotificationDispatcher, TelegramNotifier
+from notifiers.base import post_json
+
+
+class _Response:
+    def __init__(self, status_code=200, text="{}"):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.text = text
+
+    def json(self):
+        return {}
+
+
+class _Session:
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.payloads = []
+
+    def post(self, url, json, timeout):
+        self.payloads.append(json)
+        return _Response(self.status_code, '{"description": "Bad Request"}')
+
+
+class _CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self):
+        self.acquired += 1
+
+
+OPPORTUNITY = {
+    "event": "Will <Fed> cut_rates by *March*?",
+    "spread": 0.05,
+    "source1": "Polymarket",
+    "price1": 0.40,
+    "url1": "https://polymarket.com/event/fed_cut?a=1&b=2",
+    "source2": "Kalshi",
+    "price2": 0.55,
+    "url2": "https://kalshi.com/markets/KXFED",
+}
+
+
+def test_arbitrage_alert_is_escaped_html():
+    session = _Session()
+    TelegramNotifier("token", "chat", session=session).notify_arbitrage(OPPORTUNITY)
+    (payload,) = session.payloads
+    assert payload["parse_mode"] == "HTML"
+    assert "Will &lt;Fed&gt; cut_rates by *March*?" in payload["text"]
+    assert "fed_cut?a=1&amp;b=2" in payload["text"]
+
+
+def test_status_messages_are_plain_text():
+    session = _Session()
+    TelegramNotifier("token", "chat", session=session).notify_status("a_b *c*")
+    assert "parse_mode" not in session.payloads[0]
+
+
+def test_limiter_is_acquired_per_posted_part():
+    session = _Session()
+    notifier = TelegramNotifier("token", "chat", session=session)
+    notifier.rate_limiter = _CountingLimiter()
+    notifier.notify_batch([OPPORTUNITY] * 40)
+    assert len(session.payloads) > 1
+    assert notifier.rate_limiter.acquired == len(session.payloads)
+
+
+def test_rejected_post_is_logged(monkeypatch):
+    logged = []
+    monkeypatch.setattr(
+        "notifiers.base.error_logger.log_error", lambda e, **kw: logged.append((e, kw))
+    )
+    assert not post_json(_Session(400), "https://api/bot-secret/send", {}, context="Telegram send")
+    ((error, fields),) = logged
+    assert "HTTP 400" in str(error) and "bot-secret" not in str(error)
+    assert fields["context"] == "Telegram send"
+
+
+class _FlakyNotifier(BaseNotifier):
+    """Fails the first ``failures`` batches, then delivers."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.batches = []
+        self.tried = threading.Semaphore(0)
+
+    def notify_arbitrage(self, opportunity):
+        return self.notify_batch([opportunity])
+
+    def notify_batch(self, opportunities):
+        self.batches.append([o["kalshi_ticker"] for o in opportunities])
+        ok = len(self.batches) > self.failures
+        self.tried.release()
+        return ok
+
+    def notify_status(self, message):
+        pass
+
+    def notify_summary(self, markets_checked, opportunities_found):
+        pass
+
+
+def _alert(dispatcher, notifier):
+    dispatcher.notify_arbitrage({**OPPORTUNITY, "kalshi_ticker": "KXFED"})
+    tried = notifier.tried.acquire(timeout=0.5)
+    deadline = time.monotonic() + 1.0
+    while dispatcher._in_flight and time.monotonic() < deadline:
+        time.sleep(0.001)  # the channel settles the alert right after the notifier returns
+    return tried
+
+
+def test_cooldown_starts_only_after_a_delivery():
+    notifier = _FlakyNotifier(failures=1)
+    dispatcher = NotificationDispatcher([notifier], coalesce_seconds=0, cooldown_seconds=60)
+    try:
+        assert _alert(dispatcher, notifier)  # failed post: no cooldown
+        assert _alert(dispatcher, notifier)  # so the next occurrence goes out, and lands
+        assert not _alert(dispatcher, notifier)  # now it is cooling down
+    finally:
+        dispatcher.close()
+    assert notifier.batches == [["KXFED"], ["KXFED"]]
+    assert dispatcher.suppressed == 1
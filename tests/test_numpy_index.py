@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from matcher.numpy_index import NumpyFlatIndex
+
+
+def _index(quantization, vecs, chunk=70):
+    index = NumpyFlatIndex(vecs.shape[1], quantization, block_size=64, decode_rows=16)
+    if not index.is_trained:
+        index.train(vecs)
+    for start in range(0, len(vecs), chunk):
+        index.add(vecs[start : start + chunk])
+    return index
+
+
+@pytest.mark.parametrize("quantization", ["float32", "float16", "int8"])
+def test_search_matches_brute_force(quantization):
+    rng = np.random.default_rng(0)
+    vecs = rng.standard_normal((300, 24)).astype(np.float32)
+    queries = rng.standard_normal((5, 24)).astype(np.float32)
+    index = _index(quantization, vecs)
+    distances, indices = index.search(queries, 3)
+    # Scores agree with decoding every stored vector first
+    expected = queries @ index.reconstruct_n(0, index.ntotal).T
+    np.testing.assert_allclose(
+        distances, np.take_along_axis(expected, indices, axis=1), rtol=1e-4, atol=1e-4
+    )
+    np.testing.assert_allclose(distances[:, 0], expected.max(axis=1), rtol=1e-4, atol=1e-4)
+
+
+def test_reconstruct_n_slices_across_chunks():
+    vecs = np.arange(300 * 4, dtype=np.float32).reshape(300, 4)
+    index = _index("float32", vecs)
+    np.testing.assert_array_equal(index.reconstruct_n(0, 300), vecs)
+    np.testing.assert_array_equal(index.reconstruct_n(65, 80), vecs[65:145])
+    np.testing.assert_array_equal(index.reconstruct_n(280, 50), vecs[280:])
+    assert index.reconstruct_n(300, 10).shape == (0, 4)
@@ -0,0 +1,47 @@
+from matcher.matcher import _match_outcomes, outcome_strike, strikes_match
+
+LADDER_TITLE = "Bitcoin above ___ on October 20?"
+
+
+def _kalshi_above(floor):
+    return {"strike_type": "greater", "floor_strike": floor}
+
+
+def test_bare_number_takes_direction_from_event_title():
+    item = {"outcome": "108,000", "event_title": LADDER_TITLE}
+    assert outcome_strike(item) == ("above", 108000.0)
+
+
+def test_bare_number_without_direction_is_exact():
+    assert outcome_strike({"outcome": "108,000"}) == ("exact", 108000.0)
+
+
+def test_strikes_match_within_kalshi_cent_offset():
+    assert strikes_match(("above", 108000.0), ("above", 107999.99))
+    assert strikes_match(("exact", 108000.0), ("above", 107999.99))
+    assert not strikes_match(("above", 108000.0), ("above", 109000.0))
+    assert not strikes_match(("above", 108000.0), ("below", 108000.0))
+
+
+def test_ladder_pairs_by_strike():
+    poly = [
+        {"outcome": "108,000", "event_title": LADDER_TITLE},
+        {"outcome": "110,000", "event_title": LADDER_TITLE},
+    ]
+    kalshi = [_kalshi_above(109999.99), _kalshi_above(107999.99)]
+    assert _match_outcomes(poly, kalshi) == ([(0, 1), (1, 0)], [], [])
+
+
+def test_unmatched_markets_fall_back_to_text_comparison():
+    poly = [{"outcome": "108,000"}, {"outcome": "95,000"}]
+    kalshi = [_kalshi_above(107999.99), _kalshi_above(120000)]
+    pairs, poly_left, kalshi_left = _match_outcomes(poly, kalshi)
+    assert pairs == [(0, 0)]
+    assert poly_left == [1]
+    assert kalshi_left == [1]
+
+
+def test_outcome_names_pair_when_one_contains_the_other():
+    poly = [{"outcome": "Donald Trump"}, {"outcome": "Kamala Harris"}]
+    kalshi = [{"outcome": "Harris"}, {"outcome": "Trump"}]
+    assert _match_outcomes(poly, kalshi) == ([(0, 1), (1, 0)], [], [])
@@ -0,0 +1,19 @@
+from scrapers.kalshi import KalshiScraper
+from scrapers.polymarket import PolymarketScraper
+
+
+def test_quote_comes_from_the_order_book():
+    quote = PolymarketScraper().normalize_quote({"bestBid": "0.41", "bestAsk": 0.43})
+    assert quote == {"yes_bid": 0.41, "yes_ask": 0.43, "no_bid": 0.57, "no_ask": 0.59}
+
+
+def test_market_without_a_book_is_not_priced():
+    quote = PolymarketScraper().normalize_quote({"outcomePrices": '["0.42", "0.58"]'})
+    assert quote == {"yes_bid": None, "yes_ask": None, "no_bid": None, "no_ask": None}
+
+
+def test_empty_kalshi_book_side_is_missing_not_zero():
+    market = {"yes_bid_dollars": "0.0000", "yes_ask_dollars": "0.4300", "no_bid": 0, "no_ask": 0}
+    quote = KalshiScraper().normalize_quote(market)
+    assert quote["yes_bid"] is None and quote["no_ask"] is None
+    assert quote["yes_ask"] == 0.43
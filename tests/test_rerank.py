@@ -0,0 +1,104 @@
+import math
+
+import pytest
+
+from benchmarks.synthetic import HashingEmbedder
+from matcher.matcher import MarketMatcher, market_id
+from matcher.rerank import CrossEncoderReranker
+
+
+class _ConstantModel:
+    """Stands in for a paraphrase cross-encoder that cannot tell the numbers apart."""
+
+    def __init__(self, score):
+        self.score = score
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        return [self.score] * len(pairs)
+
+
+class _CountingMatcher(MarketMatcher):
+    def __init__(self, **kwargs):
+        super().__init__(embedder=HashingEmbedder(), vector_backend="numpy", **kwargs)
+        self.auto_accept_threshold = 1.1  # leave every decision to the reranker / LLM
+        self.llm_calls = 0
+
+    def _verify_match_with_llm(self, poly, kalshi):
+        self.llm_calls += 1
+        self._last_llm_failed = False
+        return 0.1, "stub: different threshold"
+
+
+def _item(text, mid):
+    return {"event": text, "description": "", "market_id": mid}
+
+
+def _run(score, poly_text, kalshi_text):
+    matcher = _CountingMatcher(reranker=CrossEncoderReranker(model=_ConstantModel(score)))
+    matches = matcher.find_matches([_item(poly_text, "p")], [_item(kalshi_text, "K")])
+    return [(market_id(p), market_id(k)) for p, k, _ in matches], matcher.llm_calls
+
+
+def test_confident_score_accepts_without_the_llm():
+    assert _run(
+        0.97, "Bitcoin above 100k on October 20?", "Bitcoin above 100,000 on October 20"
+    ) == (
+        [("p", "K")],
+        0,
+    )
+
+
+def test_confident_score_with_different_numbers_goes_to_the_llm():
+    matches, llm_calls = _run(
+        0.97, "Bitcoin above 100k on October 20?", "Bitcoin above 110,000 on October 20"
+    )
+    assert matches == [] and llm_calls == 1
+
+
+def test_low_score_rejects_without_the_llm():
+    assert _run(
+        0.05, "Bitcoin above 100k on October 20?", "Bitcoin above 100,000 on October 20"
+    ) == (
+        [],
+        0,
+    )
+
+
+def test_uncertain_score_goes_to_the_llm():
+    _, llm_calls = _run(
+        0.5, "Bitcoin above 100k on October 20?", "Bitcoin above 100,000 on October 20"
+    )
+    assert llm_calls == 1
+
+
+class Identity:
+    """Named like torch.nn.Identity: a CrossEncoder whose predict() returns logits."""
+
+
+class _LogitModel:
+    activation_fn = Identity()
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        return self.batches.pop(0)
+
+
+def test_sigmoid_is_decided_by_the_model_not_the_batch():
+    reranker = CrossEncoderReranker(model=_LogitModel([[0.5, 0.9], [3.0, -2.0]]))
+    pair = (_item("a", "a"), _item("b", "b"))
+    first = reranker.score([pair, pair])
+    second = reranker.score([pair, pair])
+    # In-range logits get the sigmoid too, like the batch that left [0, 1]
+    assert abs(first[0] - 1 / (1 + 2.718281828**-0.5)) < 1e-6
+    assert 0.0 < second.min() and second.max() < 1.0
+
+
+def test_first_batch_decides_when_the_model_has_no_activation():
+    reranker = CrossEncoderReranker(model=_ConstantModel(3.0))
+    pair = (_item("a", "a"), _item("b", "b"))
+    assert reranker.score([pair])[0] == pytest.approx(1 / (1 + math.exp(-3.0)))
+    # Later batches stay on the first batch's scale even when they fall inside [0, 1]
+    reranker._model = _ConstantModel(0.5)
+    assert reranker.score([pair])[0] == pytest.approx(1 / (1 + math.exp(-0.5)))
@@ -0,0 +1,23 @@
+from arbitrage.engine import SpreadEngine
+from scrapers.base import make_quote
+
+
+def _engine():
+    engine = SpreadEngine(threshold=0.04)
+    engine.load_pairs(
+        [{"polymarket_slug": "fed-cut", "kalshi_ticker": "KXFED", "polymarket_event": "Fed"}]
+    )
+    return engine
+
+
+def test_emptied_book_side_stops_the_opportunity():
+    engine = _engine()
+    engine.update_prices("Kalshi", {"KXFED": make_quote(yes_bid=0.55, yes_ask=0.57)})
+    touched = engine.update_prices(
+        "Polymarket", {"fed-cut": make_quote(yes_bid=0.38, yes_ask=0.40)}
+    )
+    assert engine.compute(touched)
+
+    # The Polymarket ask is pulled: its YES ask (and derived NO bid) must not linger
+    touched = engine.update_prices("Polymarket", {"fed-cut": make_quote(yes_bid=0.38)})
+    assert engine.compute(touched) == []
@@ -0,0 +1,95 @@
+import asyncio
+import json
+import threading
+
+from streaming import KalshiFeed, OrderBook, PriceStream
+
+
+class _FakeSigner:
+    def __init__(self):
+        self.calls = []
+
+    def headers(self, method, path):
+        self.calls.append((method, path))
+        return {"KALSHI-ACCESS-TIMESTAMP": str(len(self.calls))}
+
+
+def test_kalshi_headers_are_signed_afresh_for_every_connect():
+    signer = _FakeSigner()
+    feed = KalshiFeed(headers={"User-Agent": "bot"}, signer=signer)
+    first, second = feed.headers, feed.headers
+    assert first == {"User-Agent": "bot", "KALSHI-ACCESS-TIMESTAMP": "1"}
+    assert second["KALSHI-ACCESS-TIMESTAMP"] == "2"
+    assert signer.calls == [("GET", "/trade-api/ws/v2")] * 2
+
+
+def test_set_markets_drops_books_on_the_loop_thread():
+    stream = PriceStream(KalshiFeed(), lambda exchange, quotes: None)
+    stream.books = {"KX-A": OrderBook(), "KX-B": OrderBook()}
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        stream._loop = loop
+        dropped_on = []
+        drop = stream._drop_untracked_books
+
+        def record():
+            dropped_on.append(threading.current_thread())
+            drop()
+
+        stream._drop_untracked_books = record
+        stream.set_markets(["KX-A"])
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), loop).result(timeout=2)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=2)
+        loop.close()
+    assert dropped_on == [thread]
+    assert set(stream.books) == {"KX-A"}
+
+
+class _RecordingWs:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, raw):
+        self.sent.append(json.loads(raw))
+
+
+def test_removed_tickers_are_unsubscribed_from_every_subscription():
+    feed = KalshiFeed()
+    stream = PriceStream(feed, lambda exchange, quotes: None)
+    stream.set_markets(["KX-A", "KX-B"])
+    feed.handle({"type": "subscribed", "msg": {"channel": "orderbook_delta", "sid": 7}}, {})
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        stream._loop, stream._ws = loop, _RecordingWs()
+        stream.set_markets(["KX-A", "KX-C"])
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), loop).result(timeout=2)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=2)
+        loop.close()
+    unsubscribe, subscribe = stream._ws.sent
+    assert unsubscribe["cmd"] == "update_subscription"
+    assert unsubscribe["params"] == {
+        "sids": [7],
+        "market_tickers": ["KX-B"],
+        "action": "delete_markets",
+    }
+    assert subscribe["cmd"] == "subscribe"
+    assert subscribe["params"]["market_tickers"] == ["KX-C"]
+
+
+def test_updates_for_an_untracked_ticker_are_dropped():
+    updates = []
+    stream = PriceStream(KalshiFeed(), lambda exchange, quotes: updates.append(quotes))
+    stream.set_markets(["KX-A"])
+    for ticker in ("KX-A", "KX-B"):
+        snapshot = {"market_ticker": ticker, "yes": [[40, 10]], "no": [[55, 10]]}
+        stream._handle(json.dumps({"type": "orderbook_snapshot", "msg": snapshot}))
+    assert [set(quotes) for quotes in updates] == [{"KX-A"}]
+    assert set(stream.books) == {"KX-A"}
@@ -0,0 +1,102 @@
+import pytest
+
+import database
+from database import MatchDatabase
+
+POLY = {"event": "Bitcoin above 120,000 on March 3, 2027?", "market_id": "btc-120k"}
+KALSHI = {"event": "Bitcoin above 120,000 on March 3, 2027", "market_id": "KXBTC-120K"}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(database.time, "time", clock.time)
+    return clock
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = MatchDatabase(str(tmp_path / "queue.db"))
+    db.enqueue_verifications([("poly|kalshi", POLY, KALSHI, 0.8)])
+    return db
+
+
+def _lease(db, worker, max_attempts=3):
+    return db.lease_verifications(worker, limit=10, lease_seconds=60, max_attempts=max_attempts)
+
+
+def test_a_leased_job_is_not_handed_out_twice(db, clock):
+    (job,) = _lease(db, "w1")
+    assert job["poly"] == POLY and job["kalshi"] == KALSHI and job["attempts"] == 1
+    assert _lease(db, "w2") == []
+
+
+def test_an_expired_lease_is_taken_over(db, clock):
+    (job,) = _lease(db, "w1")
+    clock.now += 61
+    (again,) = _lease(db, "w2")
+    assert again["id"] == job["id"] and again["attempts"] == 2
+
+
+def test_only_the_current_lease_holder_can_complete(db, clock):
+    (job,) = _lease(db, "w1")
+    clock.now += 61
+    _lease(db, "w2")
+    assert not db.complete_verification(job["id"], "w1", 0.9, "late")
+    assert db.complete_verification(job["id"], "w2", 0.2, "different")
+    assert db.verification_results(["poly|kalshi"]) == {"poly|kalshi": ("done", 0.2, "different")}
+
+
+def test_failed_jobs_back_off_exponentially(db, clock):
+    (job,) = _lease(db, "w1")
+    db.fail_verification(job["id"], "w1", "timeout", max_attempts=3, backoff_seconds=30)
+    clock.now += 29
+    assert _lease(db, "w1") == []
+    clock.now += 1
+    (job,) = _lease(db, "w1")
+    db.fail_verification(job["id"], "w1", "timeout", max_attempts=3, backoff_seconds=30)
+    clock.now += 59
+    assert _lease(db, "w1") == []
+    clock.now += 1
+    (job,) = _lease(db, "w1")
+    db.fail_verification(job["id"], "w1", "timeout", max_attempts=3, backoff_seconds=30)
+    assert db.verification_results(["poly|kalshi"])["poly|kalshi"][0] == "failed"
+
+
+def test_a_job_whose_lease_keeps_expiring_fails_after_max_attempts(db, clock):
+    for _ in range(3):
+        assert len(_lease(db, "w1")) == 1
+        clock.now += 61  # the worker crashed while holding the job
+    assert _lease(db, "w1") == []
+    status, _, reason = db.verification_results(["poly|kalshi"])["poly|kalshi"]
+    assert status == "failed" and "expired" in reason
+
+
+def test_worker_runs_with_queue_mode_configured(db, monkeypatch):
+    import matcher.matcher
+    import verifier
+
+    class _QueueModeMatcher(matcher.matcher.MarketMatcher):
+        """MarketMatcher as constructed with VERIFICATION_MODE = "queue" in config."""
+
+        def __init__(self, **kwargs):
+            kwargs.setdefault("verification_mode", "queue")
+            super().__init__(**kwargs)
+
+        def verify_pair(self, poly, kalshi):
+            return 0.95, "same event"
+
+    monkeypatch.setattr(matcher.matcher, "MarketMatcher", _QueueModeMatcher)
+    db_path = db.db_path
+    db.close()
+    assert verifier.run_worker(db_path=db_path, drain=True) == 1
+    reopened = MatchDatabase(db_path)
+    assert reopened.verification_results(["poly|kalshi"])["poly|kalshi"][1] == 0.95
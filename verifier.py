@@ -0,0 +1,135 @@
+# verifier.py
+"""LLM verification workers for VERIFICATION_MODE = "queue".
+
+Each worker process leases candidate pairs from the verification_jobs table that
+the bot's discovery cycle fills, asks the LLM (balanced over OLLAMA_HOSTS) and
+writes the verdict back. A worker that dies loses only its lease, which expires
+after VERIFY_LEASE_SECONDS; failed jobs go back to the queue with backoff. Run as
+many processes as the LLM hosts can keep busy. They must run on the machine that
+holds the database: SQLite in WAL mode needs shared memory on one host and is not
+safe over NFS / SMB. Workers on other machines would need a database server or a
+message broker in place of the SQLite queue. The LLM hosts themselves can be
+anywhere (OLLAMA_HOSTS).
+
+Usage:
+    uv run python verifier.py --workers 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+from config import (
+    VERIFIER_BATCH_SIZE,
+    VERIFIER_WORKERS,
+    VERIFY_LEASE_SECONDS,
+    VERIFY_MAX_ATTEMPTS,
+    VERIFY_RETRY_BACKOFF_SECONDS,
+)
+
+
+def run_worker(
+    db_path: str = "market_matches.db",
+    batch_size: int = VERIFIER_BATCH_SIZE,
+    lease_seconds: float = VERIFY_LEASE_SECONDS,
+    poll_seconds: float = 2.0,
+    drain: bool = False,
+) -> int:
+    """Lease, verify and answer jobs until stopped (SIGTERM / Ctrl-C) or, with ``drain``,
+    until the queue has no runnable job left. Returns the number of jobs handled."""
+    from database import MatchDatabase
+    from matcher.matcher import MarketMatcher
+
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    db = MatchDatabase(db_path)
+    # The worker answers jobs itself; the configured VERIFICATION_MODE ("queue" whenever
+    # workers run) would have it queue them again and needs a market_store
+    matcher = MarketMatcher(verification_mode="inline")
+    # Keep asking after repeated failures: the queue retries and backs off per job
+    matcher._llm_error_limit = float("inf")
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+
+    handled = 0
+    print(f"Verifier {worker} started")
+    try:
+        while not stopping:
+            jobs = db.lease_verifications(worker, batch_size, lease_seconds, VERIFY_MAX_ATTEMPTS)
+            if not jobs:
+                if drain:
+                    break
+                time.sleep(poll_seconds)
+                continue
+            answered = 0
+            for job in jobs:
+                if stopping:
+                    break  # unfinished leases expire and are picked up again
+                verdict = matcher.verify_pair(job["poly"], job["kalshi"])
+                if verdict is None:
+                    db.fail_verification(
+                        job["id"],
+                        worker,
+                        "no usable LLM answer",
+                        VERIFY_MAX_ATTEMPTS,
+                        VERIFY_RETRY_BACKOFF_SECONDS,
+                    )
+                elif db.complete_verification(job["id"], worker, *verdict):
+                    answered += 1
+                handled += 1
+            print(f"Verifier {worker}: {answered}/{len(jobs)} jobs answered")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        db.close()
+    print(f"Verifier {worker} stopped after {handled} jobs")
+    return handled
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="LLM verification workers (queue mode)")
+    parser.add_argument("--workers", type=int, default=VERIFIER_WORKERS, help="processes")
+    parser.add_argument("--batch-size", type=int, default=VERIFIER_BATCH_SIZE)
+    parser.add_argument("--lease-seconds", type=float, default=VERIFY_LEASE_SECONDS)
+    parser.add_argument("--poll-seconds", type=float, default=2.0)
+    parser.add_argument("--db", default="market_matches.db")
+    parser.add_argument(
+        "--drain", action="store_true", help="exit once the queue is empty instead of polling"
+    )
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    args = parse_args()
+    kwargs = {
+        "db_path": args.db,
+        "batch_size": args.batch_size,
+        "lease_seconds": args.lease_seconds,
+        "poll_seconds": args.poll_seconds,
+        "drain": args.drain,
+    }
+    if args.workers <= 1:
+        run_worker(**kwargs)
+        return
+    # spawn: each worker starts clean instead of inheriting the parent's threads and sockets
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=run_worker, kwargs=kwargs, name=f"verifier-{i}")
+        for i in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()